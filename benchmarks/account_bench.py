@@ -0,0 +1,50 @@
+"""Benchmark point-in-time balances of a single account.
+
+The running totals kept next to each side of an account make
+`Account.balance_as_of_date` a binary search and `Account.balance` a constant
+time read, so neither should grow with the number of entries.
+
+It also compares reading 365 evenly spaced balances with
+`Account.balances_at` against calling `Account.balance_as_of_date` 365 times.
+"""
+from datetime import datetime, timedelta
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.account import Account
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.money import Money
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_entries in [100, 1000, 10000, 100000]:
+        account = Account("cash", True, "cash")
+        account.set_starting_balance(start, Money(0, usd()))
+        for k in range(num_entries):
+            entry = AccountEntry(start + timedelta(seconds=k + 1),
+                                 Money(k % 97, usd()))
+            account.add_entry(k % 3 != 0, entry)
+        middle = start + timedelta(seconds=num_entries // 2)
+        times = [start + timedelta(seconds=num_entries * k / 365)
+                 for k in range(1, 366)]
+        rows.append([
+            num_entries,
+            "{:.0f}".format(seconds_per_call(
+                lambda: account.balance_as_of_date(middle), 1000) * 1e9),
+            "{:.0f}".format(seconds_per_call(account.balance, 1000) * 1e9),
+            "{:.0f}".format(seconds_per_call(
+                lambda: [account.balance_as_of_date(time) for time in times],
+                10) * 1e6),
+            "{:.0f}".format(seconds_per_call(
+                lambda: account.balances_at(times), 10) * 1e6),
+        ])
+    print_table(["entries", "balance_as_of_date (ns)", "balance (ns)",
+                 "365 x balance_as_of_date (us)", "balances_at 365 (us)"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
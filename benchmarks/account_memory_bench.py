@@ -0,0 +1,74 @@
+"""Measure the memory used per account entry by each entry store.
+
+Every entry is posted with a freshly built Money and Currency, as happens
+when postings are read from an import. The object store keeps all of them
+alive, while the columnar store only keeps the packed numbers.
+"""
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from common import print_table
+from zeppelin_cash.accounting.account import Account
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.money import Money
+
+NUM_ENTRIES = 200000
+
+
+def build_account(start: datetime, columnar: bool) -> Account:
+    """Build an account with NUM_ENTRIES entries.
+
+    Args:
+        start: the starting time of the account
+        columnar: whether the account uses the columnar store
+
+    Returns:
+        The account.
+    """
+    account = Account("cash", True, "cash", columnar=columnar)
+    account.set_starting_balance(start, Money(0, usd()))
+    for k in range(NUM_ENTRIES):
+        entry = AccountEntry(start + timedelta(seconds=k + 1),
+                             Money(k % 97 + 0.5, usd()))
+        account.add_entry(k % 2 == 0, entry)
+    return account
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for columnar in [False, True]:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        account = build_account(start, columnar)
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del account
+        begin = perf_counter()
+        account = build_account(start, columnar)
+        elapsed = perf_counter() - begin
+        middle = start + timedelta(seconds=NUM_ENTRIES // 2)
+        begin = perf_counter()
+        for _ in range(1000):
+            account.balance_as_of_date(middle)
+        balance_elapsed = perf_counter() - begin
+        begin = perf_counter()
+        for _ in account.debits:
+            pass
+        iterate_elapsed = perf_counter() - begin
+        rows.append([
+            "columnar" if columnar else "objects",
+            "{:.1f}".format((after - before) / NUM_ENTRIES),
+            "{:.2f}".format(elapsed / NUM_ENTRIES * 1e6),
+            "{:.2f}".format(balance_elapsed / 1000 * 1e6),
+            "{:.2f}".format(iterate_elapsed / len(account.debits) * 1e6),
+        ])
+    print_table(["store", "bytes per entry", "add_entry (us)",
+                 "balance_as_of_date (us)", "iterate (us per entry)"], rows)
+
+
+if __name__ == "__main__":
+    main()
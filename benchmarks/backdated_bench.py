@@ -0,0 +1,87 @@
+"""Benchmark backdated account entries.
+
+Builds accounts of entries in time order, then adds entries dated at
+earlier times: either spread over the whole account, or clustered between
+two of its entries. Compares the cost of each backdated `add_entry`, which
+files the entry in a tree of the backdated entries, with rebuilding the
+account from the sorted entries, and the cost of `balance_as_of_date` with
+and without backdated entries, at times spread like the backdated ones.
+"""
+from datetime import datetime, timedelta
+from itertools import product
+from random import Random
+from timeit import default_timer
+from typing import List
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.account import Account
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.money import Money
+
+_NUM_BACKDATED = 1000
+
+
+def build(start: datetime, entries: List[AccountEntry]) -> Account:
+    """Build an account from entries in time order.
+
+    Args:
+        start: the start time of the account
+        entries: the entries
+
+    Returns:
+        The account.
+    """
+    account = Account("Cash", True, "cash-id")
+    account.set_starting_balance(start, Money(0, usd()))
+    for k, entry in enumerate(entries):
+        account.add_entry(k % 2 == 0, entry)
+    return account
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rng = Random(0)
+    rows = []
+    for num_entries, layout in product([1000, 10000, 100000],
+                                       ["spread", "clustered"]):
+        entries = [AccountEntry(start + timedelta(seconds=1 + k),
+                                Money(rng.randint(1, 1000), usd()))
+                   for k in range(num_entries)]
+        # clustered entries are all between the middle entry and the next
+        low, high = (1, num_entries) if layout == "spread" else \
+            (num_entries // 2 + 1, num_entries // 2 + 2)
+        backdated = [AccountEntry(
+            start + timedelta(seconds=rng.uniform(low, high)),
+            Money(rng.randint(1, 1000), usd()))
+            for _ in range(_NUM_BACKDATED)]
+        queries = [start + timedelta(seconds=rng.uniform(low, high))
+                   for _ in range(1000)]
+        account = build(start, entries)
+
+        def query() -> None:
+            for time in queries:
+                account.balance_as_of_date(time)
+
+        in_order = seconds_per_call(query, 3) / len(queries)
+        begin = default_timer()
+        for k, entry in enumerate(backdated):
+            account.add_entry(k % 2 == 0, entry)
+        insert = (default_timer() - begin) / len(backdated)
+        with_backdated = seconds_per_call(query, 3) / len(queries)
+        everything = sorted(entries + backdated, key=lambda e: e.time())
+        rebuild = seconds_per_call(lambda: build(start, everything), 1, 3)
+        rows.append([num_entries, layout,
+                     "{:.1f}".format(insert * 1e6),
+                     "{:.1f}".format(rebuild * 1e6),
+                     "{:.1f}".format(in_order * 1e6),
+                     "{:.1f}".format(with_backdated * 1e6)])
+    print_table(["entries", "backdated entries", "backdated add_entry (us)",
+                 "rebuild (us)", "balance, in order (us)",
+                 "balance, 1000 backdated (us)"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark roll-ups in a chart of accounts.
+
+Builds a root account with a number of banks, each with a number of leaf
+accounts, and compares reading the root's balance by summing every leaf
+with reading the cached roll-up, both when nothing changed since the last
+read and when one leaf was posted to in between.
+"""
+from datetime import datetime, timedelta
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.account import Account
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.ledger import Ledger
+from zeppelin_cash.accounting.money import Money
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    when = start + timedelta(days=1)
+    rows = []
+    for num_banks, leaves_per_bank in [(10, 10), (10, 100), (100, 100)]:
+        ledger = Ledger([])
+        root = Account("Cash", True, "root")
+        root.set_starting_balance(start, Money(0, usd()))
+        ledger.add_account(root)
+        leaf_ids = []
+        for bank in range(num_banks):
+            bank_id = "bank-{}".format(bank)
+            account = Account(bank_id, True, bank_id)
+            account.set_starting_balance(start, Money(0, usd()))
+            ledger.add_account(account, "root")
+            for leaf in range(leaves_per_bank):
+                leaf_id = "{}-{}".format(bank_id, leaf)
+                account = Account(leaf_id, True, leaf_id)
+                account.set_starting_balance(start, Money(1, usd()))
+                ledger.add_account(account, bank_id)
+                leaf_ids.append(leaf_id)
+        entry = AccountEntry(start, Money(1, usd()))
+
+        def sum_leaves() -> None:
+            total = Money(0, usd())
+            for account_id in leaf_ids:
+                total += ledger.balance_as_of_date(when, account_id).ok()
+
+        def post_and_read() -> None:
+            ledger.add_entry(leaf_ids[0], True, entry)
+            ledger.subtree_balances("root", when)
+
+        rows.append([
+            len(leaf_ids),
+            "{:.1f}".format(seconds_per_call(sum_leaves, 20) * 1e6),
+            "{:.1f}".format(seconds_per_call(
+                lambda: ledger.subtree_balances("root", when), 1000) * 1e6),
+            "{:.1f}".format(seconds_per_call(post_and_read, 1000) * 1e6),
+        ])
+    print_table(["leaves", "sum leaves (us)", "cached roll-up (us)",
+                 "post, then roll-up (us)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark closing periods.
+
+Builds a book, then closes the period before the last tenth of its
+transactions, handing the closed transactions to a cold archive that drops
+them. Compares the number of transactions and account entries the book
+holds, and the time of a financial statement over the open period and of
+a cash flow statement from the start of the book, before and after.
+"""
+from datetime import datetime
+from time import perf_counter
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.book import Book
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def num_entries(book: Book) -> int:
+    """Count the entries held by the ledger accounts.
+
+    Args:
+        book: the book
+
+    Returns:
+        The number of entries.
+    """
+    return sum(len(account.debits) + len(account.credits)
+               for account in book.ledger.accounts)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        book = random_book(start, num_transactions)
+        end = book.journal.transactions[-1].time()
+        cutoff = book.journal.transactions[num_transactions * 9 // 10].time()
+        row = [num_transactions]
+        timings = []
+        for closed in [False, True]:
+            if closed:
+                began = perf_counter()
+                assert book.close_period(cutoff, lambda _: None).is_ok()
+                row.append("{:.1f}".format((perf_counter() - began) * 1e3))
+            timings.append((len(book.journal.transactions), num_entries(book),
+                            seconds_per_call(
+                                lambda: book.financial_statement(cutoff, end),
+                                10) * 1e3,
+                            seconds_per_call(
+                                lambda: book.cash_flow_statement(start, end),
+                                10) * 1e3))
+        for before, after in zip(*timings):
+            row.append("{} / {}".format(
+                *("{:.2f}".format(value) if isinstance(value, float)
+                  else value for value in (before, after))))
+        rows.append(row)
+    print_table(["transactions", "close_period (ms)",
+                 "journal transactions", "account entries",
+                 "open period statement (ms)", "cash flow from start (ms)"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Helpers shared by the benchmark scripts.
+
+The scripts are run from the repository root, e.g.
+
+    PYTHONPATH=src python3 benchmarks/ledger_bench.py
+"""
+from timeit import Timer
+from typing import Callable, List, Sequence
+
+
+def seconds_per_call(func: Callable[[], object], number: int,
+                     repeat: int = 5) -> float:
+    """Time a function, keeping the best of several runs.
+
+    Args:
+        func: the function to time
+        number: the number of calls in each run
+        repeat: the number of runs
+
+    Returns:
+        The best observed time for a single call, in seconds.
+    """
+    return min(Timer(func).repeat(repeat=repeat, number=number)) / number
+
+
+def print_table(header: Sequence[str], rows: List[Sequence[object]]) -> None:
+    """Print a simple markdown table.
+
+    Args:
+        header: the column names
+        rows: the table rows
+    """
+    print("| " + " | ".join(header) + " |")
+    print("|" + "|".join("---" for _ in header) + "|")
+    for row in rows:
+        print("| " + " | ".join(str(cell) for cell in row) + " |")
@@ -0,0 +1,50 @@
+"""Benchmark shared currencies.
+
+Compares getting the shared US dollar with building a new Currency, as
+`usd()` used to, and adding money whose currencies are the same object with
+adding money whose currencies only share a code.
+"""
+import pickle
+from datetime import datetime
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def new_usd() -> Currency:
+    """Build a new US dollar, like `usd()` did before currencies were shared.
+
+    Returns:
+        A new Currency instance.
+    """
+    return Currency("US dollar", "USD", numeric_code=840,
+                    symbol="$", fraction_symbol="¢")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    shared = Money(1, usd())
+    same_code = Money(1, new_usd())
+    rows = [
+        ["usd()", "{:.0f}".format(seconds_per_call(new_usd, 100000) * 1e9),
+         "{:.0f}".format(seconds_per_call(usd, 100000) * 1e9)],
+        ["Money + Money",
+         "{:.0f}".format(seconds_per_call(
+             lambda: shared + same_code, 100000) * 1e9),
+         "{:.0f}".format(seconds_per_call(
+             lambda: shared + shared, 100000) * 1e9)],
+    ]
+    print_table(["operation", "new currency (ns)", "shared currency (ns)"],
+                rows)
+    print()
+    book = random_book(datetime(2020, 1, 1), 10000)
+    book.push()
+    print_table(["book", "pickled bytes"],
+                [["10,000 transactions", len(pickle.dumps(book))]])
+
+
+if __name__ == "__main__":
+    main()
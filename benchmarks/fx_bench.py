@@ -0,0 +1,51 @@
+"""Benchmark exchange rate lookups.
+
+Compares converting the entries of an account one `convert` call at a time
+with converting them all with `convert_all`, which walks the rates forward
+instead of searching for each one, with and without the lookup cache.
+"""
+from datetime import datetime, timedelta
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.fx_rates import FxRateTable
+from zeppelin_cash.accounting.iso4217 import currency_by_code
+from zeppelin_cash.accounting.money import Money
+
+
+def main() -> None:
+    """Run the benchmark."""
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    start = datetime(2020, 1, 1)
+    rows = []
+    for days in [365, 3650]:
+        uncached = FxRateTable()
+        cached = FxRateTable(cache_size=1024)
+        for day in range(days):
+            rate = 1.0 + (day % 50) / 100
+            for table in [uncached, cached]:
+                assert table.set_rate(eur, usd(), start + timedelta(days=day),
+                                      rate).is_ok()
+        times = [start + timedelta(hours=6 * k) for k in range(4 * days)]
+        amounts = [Money(k % 1000, eur) for k in range(len(times))]
+
+        def one_by_one(table: FxRateTable) -> None:
+            for money, time in zip(amounts, times):
+                table.convert(money, usd(), time)
+
+        rows.append([
+            len(times),
+            "{:.2f}".format(seconds_per_call(
+                lambda: one_by_one(uncached), 5) * 1e3),
+            "{:.2f}".format(seconds_per_call(
+                lambda: one_by_one(cached), 5) * 1e3),
+            "{:.2f}".format(seconds_per_call(
+                lambda: uncached.convert_all(amounts, times, usd()), 5) * 1e3),
+        ])
+    print_table(["amounts", "convert (ms)", "cached convert (ms)",
+                 "convert_all (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark loading transactions into a book.
+
+Compares adding the transactions of a random book one `add_transaction`
+call at a time, which pushes each one to the ledger separately, with one
+`add_transactions` call for the whole batch, and with `add_transaction`
+calls in lazy push mode, which leave the transactions on the journal.
+"""
+from datetime import datetime
+from timeit import default_timer
+from typing import Callable, List
+
+from common import print_table
+from zeppelin_cash.accounting.book import Book
+from zeppelin_cash.accounting.journal_transaction import JournalTransaction
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def empty_book(start: datetime) -> Book:
+    """Build a book with the accounts of `random_book` and no transactions.
+
+    Args:
+        start: the start time of the book
+
+    Returns:
+        The book.
+    """
+    book = Book(start)
+    book.add_cash_account("Savings")
+    book.add_research_and_development_account("Lab")
+    book.add_research_and_development_account("Shop")
+    return book
+
+
+def best_time(load: Callable[[Book], object], start: datetime,
+              repeat: int = 3) -> float:
+    """Time loading an empty book, keeping the best of several runs.
+
+    Args:
+        load: the function that loads the book
+        start: the start time of the book
+        repeat: the number of runs
+
+    Returns:
+        The best time, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        book = empty_book(start)
+        begin = default_timer()
+        load(book)
+        times.append(default_timer() - begin)
+    return min(times)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        transactions: List[JournalTransaction] = random_book(
+            start, num_transactions).journal.transactions
+
+        def one_by_one(book: Book) -> None:
+            for transaction in transactions:
+                book.add_transaction(transaction)
+
+        def lazily(book: Book) -> None:
+            book.enable_lazy_push()
+            one_by_one(book)
+
+        single = best_time(one_by_one, start)
+        batch = best_time(lambda book: book.add_transactions(transactions),
+                          start)
+        lazy = best_time(lazily, start)
+        rows.append([num_transactions, "{:.1f}".format(single * 1e3),
+                     "{:.1f}".format(batch * 1e3),
+                     "{:.1f}x".format(single / batch),
+                     "{:.1f}".format(lazy * 1e3)])
+    print_table(["transactions", "add_transaction (ms)",
+                 "add_transactions (ms)", "speedup",
+                 "lazy add_transaction (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark time range and per account queries on a long journal.
+
+A short cash flow statement's cash movements only need the transactions in
+its period, which `Journal.transactions_between` finds by binary search.
+`Journal.transactions_for_account` finds the transactions of one account in
+a range from a per account index. The linear scans are what these took
+before.
+"""
+from datetime import datetime, timedelta
+from typing import List
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.book import default_cash_id
+from zeppelin_cash.accounting.journal_transaction import JournalTransaction
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        book = random_book(start, num_transactions)
+        journal = book.journal
+        # the last 100 seconds of the book
+        period_end = journal.transactions[-1].time()
+        period_start = period_end - timedelta(seconds=100)
+
+        def scan() -> List[JournalTransaction]:
+            return [transaction for transaction in journal.transactions
+                    if period_start <= transaction.time() <= period_end]
+
+        def search() -> List[JournalTransaction]:
+            return journal.transactions_between(period_start, period_end)
+
+        def statement() -> None:
+            book.cash_flow_statement(period_start, period_end)
+
+        rows.append([num_transactions,
+                     "{:.1f}".format(seconds_per_call(scan, 10) * 1e6),
+                     "{:.1f}".format(seconds_per_call(search, 10) * 1e6),
+                     "{:.1f}".format(seconds_per_call(statement, 10) * 1e6)])
+    print_table(["transactions", "scan (us)", "transactions_between (us)",
+                 "cash_flow_statement (us)"], rows)
+    print()
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        book = random_book(start, num_transactions)
+        journal = book.journal
+        # the middle half of the book
+        period_start = start + timedelta(seconds=num_transactions // 4)
+        period_end = start + timedelta(seconds=3 * num_transactions // 4)
+        audit_id = default_cash_id()
+
+        def scan_account() -> List[JournalTransaction]:
+            return [transaction for transaction in journal.transactions
+                    if period_start <= transaction.time() <= period_end and any(
+                        entry.account_id() == audit_id
+                        for entry in transaction.entries())]
+
+        def index_account() -> List[JournalTransaction]:
+            return journal.transactions_for_account(
+                audit_id, period_start, period_end)
+
+        rows.append([num_transactions,
+                     "{:.1f}".format(seconds_per_call(scan_account, 5) * 1e6),
+                     "{:.1f}".format(seconds_per_call(index_account, 5) * 1e6)])
+    print_table(["transactions", "scan account (us)",
+                 "transactions_for_account (us)"], rows)
+    print()
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        journal = random_book(start, num_transactions).journal
+        rows.append([num_transactions,
+                     "{:.2f}".format(seconds_per_call(
+                         journal.is_valid, 100) * 1e6),
+                     "{:.1f}".format(seconds_per_call(
+                         lambda: journal.is_valid(audit=True), 5) * 1e6)])
+    print_table(["transactions", "is_valid (us)", "audit (us)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark account lookups in the Ledger.
+
+Every entry posted to the book is routed to its account by id, so the cost of
+`Ledger.add_entry` and `Ledger.balance_as_of_date` should not depend on how
+many accounts the ledger holds.
+"""
+from datetime import datetime, timedelta
+from random import Random
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.account import Account
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.ledger import Ledger
+from zeppelin_cash.accounting.money import Money
+
+LOOKUPS = 10000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_accounts in [10, 100, 1000, 10000, 100000]:
+        ledger = Ledger([])
+        for k in range(num_accounts):
+            account = Account(str(k), k % 2 == 0, str(k))
+            account.set_starting_balance(start, Money(0, usd()))
+            ledger.add_account(account)
+        rng = Random(num_accounts)
+        ids = [str(rng.randrange(num_accounts)) for _ in range(LOOKUPS)]
+        entry = AccountEntry(start + timedelta(seconds=1), Money(1, usd()))
+        when = start + timedelta(seconds=2)
+
+        def lookup() -> None:
+            for account_id in ids:
+                ledger.get_account(account_id)
+
+        def post() -> None:
+            for account_id in ids:
+                ledger.add_entry(account_id, True, entry)
+
+        def balance() -> None:
+            for account_id in ids:
+                ledger.balance_as_of_date(when, account_id)
+
+        # Time the balances before posting, so that every account is empty
+        # and only the lookup is measured.
+        lookup_ns = seconds_per_call(lookup, 1) / LOOKUPS * 1e9
+        balance_ns = seconds_per_call(balance, 1) / LOOKUPS * 1e9
+        post_ns = seconds_per_call(post, 1, repeat=1) / LOOKUPS * 1e9
+        rows.append([num_accounts, "{:.0f}".format(lookup_ns),
+                     "{:.0f}".format(post_ns), "{:.0f}".format(balance_ns)])
+    print_table(["accounts", "get_account (ns)", "add_entry (ns)",
+                 "balance_as_of_date (ns)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Benchmark reading the current statements with and without live totals."""
+from datetime import datetime, timedelta
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        book = random_book(start, num_transactions)
+        period_start = start + timedelta(seconds=num_transactions // 2)
+        now = book.journal.transactions[-1].time() + timedelta(seconds=1)
+        timings = []
+        for live in [False, True]:
+            if live:
+                book.enable_live_statements(period_start)
+            timings.append(seconds_per_call(
+                lambda: book.balance_sheet(now), 100) * 1e6)
+            timings.append(seconds_per_call(
+                lambda: book.income_statement(period_start, now), 100) * 1e6)
+        rows.append([num_transactions] +
+                    ["{:.1f}".format(timing) for timing in timings])
+    print_table(["transactions", "balance_sheet (us)", "income_statement (us)",
+                 "live balance_sheet (us)", "live income_statement (us)"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
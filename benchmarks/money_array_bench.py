@@ -0,0 +1,49 @@
+"""Benchmark bulk Money arithmetic with MoneyArray.
+
+Compares adding up Money instances one at a time with summing the same
+amounts in a MoneyArray, with NumPy if it is installed and with the
+`array` fallback.
+"""
+from random import Random
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting import money_array
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.money_array import MoneyArray
+
+
+def main() -> None:
+    """Run the benchmark."""
+    rng = Random(0)
+    numpy = money_array.numpy
+    if numpy is None:
+        print("NumPy is not installed, both columns use the array fallback")
+    rows = []
+    for size in [1000, 100000]:
+        amounts = [Money.from_minor_units(rng.randint(-10000, 10000), usd())
+                   for _ in range(size)]
+
+        def money_sum() -> Money:
+            total = Money(0, usd())
+            for amount in amounts:
+                total += amount
+            return total
+
+        row = [size, "{:.1f}".format(seconds_per_call(money_sum, 10) * 1e6)]
+        for backend in [None, numpy]:
+            money_array.numpy = backend
+            array = MoneyArray.from_money(amounts)
+            row.append("{:.1f}".format(seconds_per_call(
+                array.sum, 10) * 1e6))
+            row.append("{:.1f}".format(seconds_per_call(
+                array.cumsum, 10) * 1e6))
+        money_array.numpy = numpy
+        rows.append(row)
+    print_table(["amounts", "Money loop sum (us)", "array sum (us)",
+                 "array cumsum (us)", "NumPy sum (us)", "NumPy cumsum (us)"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
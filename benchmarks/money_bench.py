@@ -0,0 +1,101 @@
+"""Benchmark Money arithmetic.
+
+Compares the integer, fractional unit `Money` with the float based
+implementation it replaced, which is copied below as `FloatMoney`.
+"""
+from typing import Callable, Dict
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.money import Money
+
+
+class FloatMoney:
+    """The float based Money implementation, for comparison."""
+
+    def __init__(self, quantity: float, currency: Currency) -> None:
+        self.__quantity = quantity
+        self.__currency = currency
+
+    def currency(self) -> Currency:
+        return self.__currency
+
+    def quantity(self) -> float:
+        return self.__quantity
+
+    def scale(self, factor: float) -> 'FloatMoney':
+        return FloatMoney(factor * self.quantity(), self.currency())
+
+    def __add__(self, other: 'FloatMoney') -> 'FloatMoney':
+        if self.currency().code() != other.currency().code():
+            raise NotImplementedError()
+        return FloatMoney(self.quantity() + other.quantity(), self.currency())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FloatMoney):
+            return self.currency().code() == other.currency(
+            ).code() and self.quantity() == other.quantity()
+        return False
+
+    def __str__(self) -> str:
+        str_quant = str(int(self.quantity() * 100.0))
+        if len(str_quant) <= 2:
+            return "0." + str_quant + " " + self.currency().code()
+        cents = str_quant[-2:]
+        dollars = str_quant[:-2]
+        chars = dollars
+        ret = "." + cents + " " + self.currency().code()
+        for k in range(len(chars)):
+            char = chars[len(chars) - k - 1]
+            ret = char + ret
+            if k % 3 == 2 and k != len(chars) - 1:
+                ret = ',' + ret
+        return ret
+
+
+def operations(money_type: type) -> Dict[str, Callable[[], object]]:
+    """Get the operations to time for a Money implementation.
+
+    Args:
+        money_type: Money or FloatMoney
+
+    Returns:
+        The operations, by name.
+    """
+    dollars = money_type(1234567.89, usd())
+    cents = money_type(0.01, usd())
+    return {
+        "add": lambda: dollars + cents,
+        "scale(-1)": lambda: dollars.scale(-1.0),
+        "==": lambda: dollars == cents,
+        "str": lambda: str(dollars),
+    }
+
+
+def main() -> None:
+    """Run the benchmark."""
+    float_ops = operations(FloatMoney)
+    int_ops = operations(Money)
+    rows = []
+    for name, float_op in float_ops.items():
+        float_ns = seconds_per_call(float_op, 100000) * 1e9
+        int_ns = seconds_per_call(int_ops[name], 100000) * 1e9
+        rows.append([name, "{:.0f}".format(float_ns),
+                     "{:.0f}".format(int_ns),
+                     "{:.1f}x".format(float_ns / int_ns)])
+    print_table(["operation", "float (ns)", "minor units (ns)", "speedup"],
+                rows)
+    print()
+    float_total = FloatMoney(0, usd())
+    int_total = Money(0, usd())
+    for _ in range(1000000):
+        float_total += FloatMoney(0.1, usd())
+        int_total += Money(0.1, usd())
+    print_table(["sum of 1,000,000 x 0.10 USD", "quantity()"],
+                [["float", repr(float_total.quantity())],
+                 ["minor units", repr(int_total.quantity())]])
+
+
+if __name__ == "__main__":
+    main()
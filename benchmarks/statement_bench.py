@@ -0,0 +1,43 @@
+"""Benchmark building a full financial statement.
+
+Compares the fused StatementEngine, used by `Book.financial_statement`, with
+building the balance sheet, cash flow statement and income statement one
+after another.
+"""
+from datetime import datetime, timedelta
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.financial_statement import FinancialStatement
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        book = random_book(start, num_transactions)
+        period_start = start + timedelta(seconds=num_transactions // 4)
+        period_end = start + timedelta(seconds=num_transactions // 2)
+
+        def separate() -> FinancialStatement:
+            book.push()
+            return FinancialStatement(
+                book.balance_sheet(period_end).ok(),
+                book.cash_flow_statement(period_start, period_end).ok(),
+                book.income_statement(period_start, period_end).ok())
+
+        def fused() -> FinancialStatement:
+            return book.financial_statement(period_start, period_end).ok()
+
+        separate_ms = seconds_per_call(separate, 1) * 1e3
+        fused_ms = seconds_per_call(fused, 1) * 1e3
+        rows.append([num_transactions, "{:.2f}".format(separate_ms),
+                     "{:.2f}".format(fused_ms),
+                     "{:.1f}x".format(separate_ms / fused_ms)])
+    print_table(["transactions", "separate (ms)", "fused (ms)", "speedup"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
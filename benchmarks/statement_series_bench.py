@@ -0,0 +1,45 @@
+"""Benchmark building a monthly series of financial statements.
+
+Compares `Book.financial_statement_series` with calling
+`Book.financial_statement` once per month.
+"""
+from datetime import datetime, timedelta
+from typing import List
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.financial_statement import FinancialStatement
+from zeppelin_cash.accounting.sample_book import random_book
+from zeppelin_cash.accounting.statement_period import period_boundaries, StatementPeriod
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        # spread the transactions over two years
+        spacing = timedelta(days=730) / num_transactions
+        book = random_book(start, num_transactions, spacing=spacing)
+        end = start + timedelta(days=730)
+        boundaries = period_boundaries(start, end, StatementPeriod.Month)
+
+        def one_by_one() -> List[FinancialStatement]:
+            return [book.financial_statement(boundaries[k],
+                                             boundaries[k + 1]).ok()
+                    for k in range(len(boundaries) - 1)]
+
+        def series() -> List[FinancialStatement]:
+            return book.financial_statement_series(
+                start, end, StatementPeriod.Month).ok()
+
+        one_by_one_ms = seconds_per_call(one_by_one, 1) * 1e3
+        series_ms = seconds_per_call(series, 1) * 1e3
+        rows.append([num_transactions, "{:.2f}".format(one_by_one_ms),
+                     "{:.2f}".format(series_ms),
+                     "{:.1f}x".format(one_by_one_ms / series_ms)])
+    print_table(["transactions", "one by one (ms)", "series (ms)", "speedup"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Benchmark trial balances.
+
+Compares reading every account's balance with `Book.list_accounts` with
+`Book.trial_balance`, which also gives the debit and credit totals and the
+grand totals, at a time in the middle of the book and for the current
+totals.
+"""
+from datetime import datetime, timedelta
+
+from common import print_table, seconds_per_call
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        book = random_book(start, num_transactions)
+        middle = start + timedelta(seconds=num_transactions // 2)
+        rows.append([
+            num_transactions,
+            "{:.1f}".format(seconds_per_call(
+                lambda: book.list_accounts(middle), 100) * 1e6),
+            "{:.1f}".format(seconds_per_call(
+                lambda: book.trial_balance(middle), 100) * 1e6),
+            "{:.1f}".format(seconds_per_call(book.trial_balance, 100) * 1e6),
+        ])
+    print_table(["transactions", "list_accounts (us)",
+                 "trial_balance at a time (us)", "trial_balance now (us)"],
+                rows)
+
+
+if __name__ == "__main__":
+    main()
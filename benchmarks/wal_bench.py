@@ -0,0 +1,80 @@
+"""Benchmark saving a book with and without a write-ahead log.
+
+Adds NUM_ADDED transactions to a book of some size through an FsBookEngine,
+saving after each one. Whole-book pickling rewrites the book every time; the
+write-ahead log appends a record per transaction and writes a snapshot every
+SNAPSHOT_EVERY. Write amplification is the bytes written per byte of pickled
+transaction. Recovery loads the book after the last transaction, which for
+the log means reading the snapshot and replaying the records after it.
+"""
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from time import perf_counter
+
+from common import print_table
+from zeppelin_cash.accounting.sample_book import random_book
+from zeppelin_cash.fs_book_engine import FsBookEngine
+
+NUM_ADDED = 250
+SNAPSHOT_EVERY = 100
+
+
+def file_size(fname: str) -> int:
+    """Get the size of a file.
+
+    Args:
+        fname: the name of the file
+
+    Returns:
+        The size in bytes, 0 if the file does not exist.
+    """
+    return os.path.getsize(fname) if os.path.exists(fname) else 0
+
+
+def main() -> None:
+    """Run the benchmark."""
+    start = datetime(2020, 1, 1)
+    rows = []
+    for num_transactions in [1000, 10000, 100000]:
+        source = random_book(start, num_transactions + NUM_ADDED)
+        added = source.journal.transactions[num_transactions:]
+        payload = sum(len(pickle.dumps(transaction))
+                      for transaction in added)
+        row = [num_transactions]
+        recovery = []
+        for wal in [False, True]:
+            with tempfile.TemporaryDirectory() as dir_name:
+                fname = os.path.join(dir_name, "book.p")
+                engine = FsBookEngine(fname, wal=wal,
+                                      snapshot_every=SNAPSHOT_EVERY)
+                book = random_book(start, 0)
+                assert book.add_transactions(
+                    source.journal.transactions[:num_transactions]).is_ok()
+                assert engine.write_book(book).is_ok()
+                written = 0
+                seconds = 0.0
+                for transaction in added:
+                    log_size = file_size(engine.log_fname)
+                    began = perf_counter()
+                    assert engine.add_transaction(book, transaction).is_ok()
+                    seconds += perf_counter() - began
+                    if file_size(engine.log_fname) > log_size:
+                        written += file_size(engine.log_fname) - log_size
+                    else:
+                        written += file_size(fname)
+                row.extend(["{:.2f}".format(seconds / NUM_ADDED * 1e3),
+                            "{:.0f}x".format(written / payload)])
+                began = perf_counter()
+                assert FsBookEngine(fname, wal=wal).load_book().is_ok()
+                recovery.append("{:.1f}".format(
+                    (perf_counter() - began) * 1e3))
+        rows.append(row + recovery)
+    print_table(["transactions", "pickle add (ms)", "pickle amplification",
+                 "log add (ms)", "log amplification", "pickle recovery (ms)",
+                 "log recovery (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
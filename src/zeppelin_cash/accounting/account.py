@@ -1,35 +1,86 @@
 """The module wallet.accounting.account includes the Account implementation."""
-from typing import List
+from bisect import bisect_left
 from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from zeppelin_cash.errors import Error, ok, Result
 from zeppelin_cash.accounting.account_metadata import AccountMetadata
 from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.money_array import MoneyArray
 from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.currency import Currency
 from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.account_entry_list import AccountEntryList
+from zeppelin_cash.accounting.account_entry_store import AccountEntryStore
+from zeppelin_cash.accounting.columnar_account_entry_list import ColumnarAccountEntryList
+from zeppelin_cash.accounting.fx_rates import FxRateTable
 
 
 AccountId = str
 
 
+class _CurrencyEntries:  # pylint: disable=R0903
+    """The debits and credits of an account in one of its other currencies."""
+
+    def __init__(self, currency: Currency, columnar: bool) -> None:
+        """Create a new, empty _CurrencyEntries instance.
+
+        Args:
+            currency: the currency of the entries
+            columnar: if True, store the entries in packed arrays
+        """
+        self.currency = currency
+        self.debits = _new_store(columnar)
+        self.credits = _new_store(columnar)
+        # the balance carried over from closed periods, see Account.close
+        self.opening_balance = Money(0, currency)
+
+
 class Account:
-    """Account encapsulates a single account page in a logical ledger."""
+    """Account encapsulates a single account page in a logical ledger.
+
+    The balance of an account is kept in its currency, the currency of its
+    starting balance. Entries in other currencies are stored apart, with a
+    running total per currency, so the account holds a separate balance in
+    each currency, see `balances`. They are only converted when a balance
+    in a single currency is asked for, see `balance_in`.
 
-    def __init__(self, title: str, is_asset: bool, my_id: AccountId) -> None:
+    Closing a period, see `close`, folds the entries before a time into the
+    starting balance. The balances at the period boundaries are kept, so
+    they can still be read.
+    """
+
+    def __init__(self, title: str, is_asset: bool, my_id: AccountId,
+                 columnar: bool = False) -> None:
         """Create a new Account.
 
         Args:
             title: the name of the account, does not need to be unique
             is_assert: set to true if the balance is an assert,  otherwise it is a liability.
             my_id: some unique account ID
+            columnar: if True, store the entries in packed arrays rather than
+                as one object per entry, trading some read speed for memory
         """
-        self.credits: List[AccountEntry] = []
-        self.debits: List[AccountEntry] = []
+        self.credits = _new_store(columnar)
+        self.debits = _new_store(columnar)
         self.title = title
         self.is_asset = is_asset
         self._id = my_id
+        self._columnar = columnar
+        # the entries in currencies other than the account's, by code
+        self._other_currencies: Dict[str, _CurrencyEntries] = {}
         self.init_balance = Money(0, usd())
         self.init_datetime = datetime(2019, 1, 1, 0, 0)
+        # the balance in each currency, by code, at the boundaries of the
+        # closed periods
+        self._closed_balances: Dict[datetime, Dict[str, Money]] = {}
+        # the debit and credit totals of the entries of the closed periods,
+        # in fractional units, by currency code
+        self._closed_totals: Dict[str, Tuple[int, int]] = {}
+        # the same totals of the entries before each boundary of the closed
+        # periods
+        self._closed_entry_totals: Dict[
+            datetime, Dict[str, Tuple[int, int]]] = {}
 
     def set_starting_balance(self, start_time: datetime,
                              balance: Money) -> None:
@@ -45,40 +96,368 @@ class Account:
     def balance(self) -> Money:
         """Get the balance for a given account.
 
+        This reads the running totals of the entries, so it does not depend
+        on the number of entries in the account. Only the entries in the
+        account's currency are counted, see `balances`.
+
         Returns:
             The balance of the account.
         """
-        money = Money(0, usd())  # assuming USD here
-        debit_sign = 1.0 if self.is_asset else -1.0
-        for transaction in self.debits:
-            money += transaction.amount().scale(debit_sign)
-        for transaction in self.credits:
-            money += transaction.amount().scale(-1.0 * debit_sign)
-        money += self.init_balance
-        return money
+        return self._balance(self.debits.total(), self.credits.total())
 
     def balance_as_of_date(self, time: datetime) -> Result[Money]:
         """Get the balance as of a specific date.
 
         If the date is before the first entry of the account,
-        the function will return 0 USD.
+        the function will return 0 USD. Only the entries in the account's
+        currency are counted, see `balances_as_of_date`.
 
         Returns:
             The balance if the time is valid.
         """
         if self.init_datetime > time:
+            closed = self._closed_balances.get(time)
+            if closed is not None:
+                return Result(ok=closed[self.currency().code()])
             return Result(
                 err=Error("cannot compute balance at time before account was created"))
-        money = Money(0, usd())
-        debit_sign = 1.0 if self.is_asset else -1.0
-        for transaction in self.debits:
-            if transaction.time() < time:
-                money += transaction.amount().scale(debit_sign)
-        for transaction in self.credits:
-            if transaction.time() < time:
-                money += transaction.amount().scale(-1.0 * debit_sign)
-        money += self.init_balance
-        return Result(ok=money)
+        return Result(ok=self._balance(self.debits.total_before(time),
+                                       self.credits.total_before(time)))
+
+    def balances_at(self, times: List[datetime]) -> Result[List[Money]]:
+        """Get the balance at each of several times.
+
+        All of the balances are read in one forward pass over the entries.
+
+        Args:
+            times: the times of the balances, in ascending order
+
+        Returns:
+            The balance at each time, or an error if the times are out of
+            order or any is before the account was created.
+        """
+        result = self.balance_array(times)
+        if not result.is_ok():
+            return Result(err=result.err())
+        return Result(ok=result.ok().to_money())
+
+    def balance_array(self, times: List[datetime]) -> Result[MoneyArray]:
+        """Get the balance at each of several times as a MoneyArray.
+
+        This is `balances_at` without building a Money instance per time.
+
+        Args:
+            times: the times of the balances, in ascending order
+
+        Returns:
+            The balance at each time, or an error if the times are out of
+            order or any is before the account was created.
+        """
+        result = self.balance_arrays(times)
+        if not result.is_ok():
+            return Result(err=result.err())
+        return Result(ok=result.ok()[0])
+
+    def currencies(self) -> List[Currency]:
+        """Get the currencies the account has balances in.
+
+        Returns:
+            The account's currency, then the currencies of its other entries
+            in the order they were first added.
+        """
+        return [self.currency()] + [entries.currency for entries in
+                                    self._other_currencies.values()]
+
+    def balances(self) -> Dict[str, Money]:
+        """Get the balance of the account in each of its currencies.
+
+        Returns:
+            The balance in each currency, by currency code.
+        """
+        ret = {self.currency().code(): self.balance()}
+        for code, entries in self._other_currencies.items():
+            ret[code] = self._signed(entries.debits.total(),
+                                     entries.credits.total(),
+                                     entries.currency) + entries.opening_balance
+        return ret
+
+    def balances_as_of_date(self, time: datetime) -> Result[Dict[str, Money]]:
+        """Get the balance of the account in each of its currencies at a time.
+
+        Args:
+            time: the time of the balances
+
+        Returns:
+            The balance in each currency, by currency code, or an error if
+            the time is before the account was created.
+        """
+        if self.init_datetime > time:
+            closed = self._closed_balances.get(time)
+            if closed is not None:
+                return Result(ok=self._closed_at(closed))
+        result = self.balance_as_of_date(time)
+        if not result.is_ok():
+            return Result(err=result.err())
+        ret = {self.currency().code(): result.ok()}
+        for code, entries in self._other_currencies.items():
+            ret[code] = self._signed(entries.debits.total_before(time),
+                                     entries.credits.total_before(time),
+                                     entries.currency) + entries.opening_balance
+        return Result(ok=ret)
+
+    def balance_arrays(self,
+                       times: List[datetime]) -> Result[List[MoneyArray]]:
+        """Get the balance in each currency at each of several times.
+
+        Args:
+            times: the times of the balances, in ascending order
+
+        Returns:
+            An array of balances per currency, in the order of `currencies`,
+            or an error if the times are out of order or any is before the
+            account was created.
+        """
+        for k in range(1, len(times)):
+            if times[k] < times[k - 1]:
+                return Result(err=Error("times must be in ascending order"))
+        # the balances before the account's starting balance are only known
+        # at the boundaries of closed periods
+        num_closed = bisect_left(times, self.init_datetime)
+        closed = []
+        for time in times[:num_closed]:
+            kept = self._closed_balances.get(time)
+            if kept is None:
+                return Result(
+                    err=Error("cannot compute balance at time before account was created"))
+            closed.append(self._closed_at(kept))
+        times = times[num_closed:]
+        stores = [(self.currency(), self.debits, self.credits,
+                   self.init_balance)]
+        for entries in self._other_currencies.values():
+            stores.append((entries.currency, entries.debits, entries.credits,
+                           entries.opening_balance))
+        ret = []
+        for currency, debit_store, credit_store, opening in stores:
+            debit_totals = MoneyArray(currency,
+                                      debit_store.totals_before(times))
+            credit_totals = MoneyArray(currency,
+                                       credit_store.totals_before(times))
+            balances = debit_totals - credit_totals if self.is_asset \
+                else credit_totals - debit_totals
+            balances += opening
+            if closed:
+                balances = MoneyArray(currency, [
+                    kept[currency.code()].minor_units()
+                    for kept in closed] + balances.minor_units())
+            ret.append(balances)
+        return Result(ok=ret)
+
+    def balance_in(self, currency: Currency, fx_rates: FxRateTable,
+                   time: datetime) -> Result[Money]:
+        """Get the balance at a time converted to a single currency.
+
+        Each currency's balance is converted at the rate as of the time.
+
+        Args:
+            currency: the currency of the result
+            fx_rates: the exchange rates
+            time: the time of the balance and of the rates
+
+        Returns:
+            The total balance, or an error if the time is before the account
+            was created or an exchange rate is not known.
+        """
+        result = self.balances_as_of_date(time)
+        if not result.is_ok():
+            return Result(err=result.err())
+        total = Money(0, currency)
+        for balance in result.ok().values():
+            if balance.minor_units() == 0:
+                continue
+            converted = fx_rates.convert(balance, currency, time)
+            if not converted.is_ok():
+                return converted
+            total += converted.ok()
+        return Result(ok=total)
+
+    def close(self, cutoff: datetime, boundaries: List[datetime]) -> None:
+        """Close the period before a time.
+
+        The entries before the cutoff are dropped and their net is added to
+        the starting balance in each currency, which then starts at the
+        cutoff, see `set_starting_balance`. Entries at or after the cutoff
+        are kept. The balances at the cutoff and at each of the boundaries
+        are remembered, so that `balance_as_of_date` and the other balance
+        methods still give them; any other time before the cutoff is an
+        error, as before the account was created. So are the debit and
+        credit totals of the entries, for `entry_totals`.
+
+        Nothing is done if the account starts after the cutoff.
+
+        Args:
+            cutoff: the end of the period
+            boundaries: the earlier times at which to keep the balances,
+                e.g. the start of the period
+        """
+        if self.init_datetime > cutoff:
+            return
+        for time in boundaries + [cutoff]:
+            if time not in self._closed_balances:
+                result = self.balances_as_of_date(time)
+                if result.is_ok():
+                    self._closed_balances[time] = result.ok()
+            if time not in self._closed_entry_totals:
+                self._closed_entry_totals[time] = {
+                    currency.code(): (debits.minor_units(),
+                                      credits.minor_units())
+                    for currency, (debits, credits) in zip(
+                        self.currencies(), self.entry_totals(time))}
+        opening = self._closed_balances[cutoff]
+        self._closed_totals = dict(self._closed_entry_totals[cutoff])
+        self.set_starting_balance(cutoff, opening[self.currency().code()])
+        self.debits = _entries_from(self.debits, cutoff, self._columnar)
+        self.credits = _entries_from(self.credits, cutoff, self._columnar)
+        for code, entries in self._other_currencies.items():
+            entries.opening_balance = opening[code]
+            entries.debits = _entries_from(entries.debits, cutoff,
+                                           self._columnar)
+            entries.credits = _entries_from(entries.credits, cutoff,
+                                            self._columnar)
+
+    def _closed_at(self, balances: Dict[str, Money]) -> Dict[str, Money]:
+        """Fill in the balances at a closed boundary for every currency.
+
+        Args:
+            balances: the balances kept at the boundary, by currency code
+
+        Returns:
+            The balances, zero in the currencies first used later.
+        """
+        return {currency.code(): balances.get(currency.code(),
+                                              Money(0, currency))
+                for currency in self.currencies()}
+
+    def entry_totals(
+            self, time: Optional[datetime] = None) -> List[Tuple[Money, Money]]:
+        """Get the debit and credit totals of the account in each currency.
+
+        The totals are read from the running totals of the entries, so this
+        does not depend on the number of entries. The starting balance is
+        not included, but the entries of closed periods are, from the totals
+        kept by `close`.
+
+        Args:
+            time: count the entries strictly before this time, by default
+                every entry. It must not be before the end of a closed
+                period, unless it is one of the boundaries kept by `close`.
+
+        Returns:
+            The debit and credit totals in each currency, in the order of
+            `currencies`.
+        """
+        closed = self._closed_entry_totals.get(time) \
+            if time is not None else None
+        ret = []
+        for currency, debit_store, credit_store in self._stores():
+            if closed is not None:
+                debit_total, credit_total = closed.get(currency.code(), (0, 0))
+                ret.append((Money.from_minor_units(debit_total, currency),
+                            Money.from_minor_units(credit_total, currency)))
+                continue
+            debit_total, credit_total = self._closed_totals.get(
+                currency.code(), (0, 0))
+            if time is None:
+                debit_total += debit_store.total()
+                credit_total += credit_store.total()
+            else:
+                debit_total += debit_store.total_before(time)
+                credit_total += credit_store.total_before(time)
+            ret.append((Money.from_minor_units(debit_total, currency),
+                        Money.from_minor_units(credit_total, currency)))
+        return ret
+
+    def _stores(self) -> List[Tuple[Currency, AccountEntryStore,
+                                    AccountEntryStore]]:
+        """Get the debit and credit entries in each currency.
+
+        Returns:
+            The currency, debits and credits, in the order of `currencies`.
+        """
+        stores = [(self.currency(), self.debits, self.credits)]
+        for entries in self._other_currencies.values():
+            stores.append((entries.currency, entries.debits, entries.credits))
+        return stores
+
+    def entry_amounts(self, is_debit: bool) -> MoneyArray:
+        """Get the amounts of the debit or credit entries as a MoneyArray.
+
+        Only the entries in the account's currency are included.
+
+        Args:
+            is_debit: True for the debits, False for the credits
+
+        Returns:
+            The amount of each entry, in entry order.
+        """
+        entries = self.debits if is_debit else self.credits
+        return MoneyArray(self.currency(), entries.minor_units())
+
+    def _balance(self, debit_total: int, credit_total: int) -> Money:
+        """Get the balance of the account from its debit and credit totals.
+
+        Args:
+            debit_total: the sum of the debits to count, in fractional units
+            credit_total: the sum of the credits to count, in fractional units
+
+        Returns:
+            The balance of the account.
+        """
+        return self._signed(debit_total, credit_total,
+                            self.currency()) + self.init_balance
+
+    def _signed(self, debit_total: int, credit_total: int,
+                currency: Currency) -> Money:
+        """Net debit and credit totals, signed for the kind of account.
+
+        Args:
+            debit_total: the sum of the debits, in fractional units
+            credit_total: the sum of the credits, in fractional units
+            currency: the currency of the totals
+
+        Returns:
+            The debits less the credits for an asset, otherwise the credits
+            less the debits.
+        """
+        debit_sign = 1 if self.is_asset else -1
+        return Money.from_minor_units(debit_sign * (debit_total - credit_total),
+                                      currency)
+
+    def last_time(self) -> Optional[datetime]:
+        """Get the time of the last entry in any currency.
+
+        Returns:
+            The time, or None if the account has no entries.
+        """
+        last: Optional[datetime] = None
+        stores = [self.debits, self.credits]
+        for entries in self._other_currencies.values():
+            stores += [entries.debits, entries.credits]
+        for store in stores:
+            time = store.last_time()
+            if time is not None and (last is None or time > last):
+                last = time
+        return last
+
+    def currency(self) -> Currency:
+        """Get the currency of the account's balances.
+
+        This is the currency of the starting balance, US dollars unless
+        set otherwise with `set_starting_balance`.
+
+        Returns:
+            The account's currency.
+        """
+        return self.init_balance.currency()
 
     def id(self) -> str:  # pylint: disable=C0103
         """Get the account id.
@@ -91,28 +470,68 @@ class Account:
     def add_entry(self, is_debit: bool, entry: AccountEntry) -> Error:
         """Add an entry to the account.
 
+        An entry dated before the last entry of its side is inserted in time
+        order, after any entries at the same time.
+
         Args:
             is_debit: True iff the entry is a debit
-            entry: the entry to append
+            entry: the entry to add
 
         Returns:
             An error if an error occurs.
         """
+        _add(self._store(is_debit, entry.amount().currency()), entry)
+        return ok()
 
-        # check dates
-        if len(self.credits) > 0:
-            if entry.time() < self.credits[len(self.credits) - 1].time():
-                return Error("new entry is earlier than last entry")
-        if len(self.debits) > 0:
-            if entry.time() < self.debits[len(self.debits) - 1].time():
-                return Error("new entry is earlier than last entry")
-        # append
-        if is_debit:
-            self.debits.append(entry)
-        else:
-            self.credits.append(entry)
+    def add_entries(self, debit_entries: Sequence[AccountEntry],
+                    credit_entries: Sequence[AccountEntry]) -> Error:
+        """Add several debit and credit entries to the account.
+
+        Entries in time order are appended, the time of the last entry of
+        each side only being looked up once, and backdated ones inserted.
+
+        Args:
+            debit_entries: the debit entries
+            credit_entries: the credit entries
+
+        Returns:
+            An error if an error occurs.
+        """
+        currency = self.currency()
+        for is_debit, entries in [
+                (True, debit_entries), (False, credit_entries)]:
+            store = self.debits if is_debit else self.credits
+            last_time = store.last_time()
+            for entry in entries:
+                if entry.amount().currency() is not currency:
+                    _add(self._store(is_debit, entry.amount().currency()),
+                         entry)
+                elif last_time is None or entry.time() >= last_time:
+                    store.append(entry)
+                    last_time = entry.time()
+                else:
+                    store.insert(entry)
         return ok()
 
+    def _store(self, is_debit: bool, currency: Currency) -> AccountEntryStore:
+        """Get the store for entries of a side and currency.
+
+        Args:
+            is_debit: True for the debits, False for the credits
+            currency: the currency of the entries
+
+        Returns:
+            The store, created if this is the first entry in the currency.
+        """
+        if currency is self.currency() or \
+                currency.code() == self.currency().code():
+            return self.debits if is_debit else self.credits
+        entries = self._other_currencies.get(currency.code())
+        if entries is None:
+            entries = _CurrencyEntries(currency, self._columnar)
+            self._other_currencies[currency.code()] = entries
+        return entries.debits if is_debit else entries.credits
+
     def metadata(self, timestamp: datetime) -> AccountMetadata:
         """Get the metadata for an account as of a given timestamp.
 
@@ -126,3 +545,50 @@ class Account:
         balance = result.ok() if result.is_ok() else None
         return AccountMetadata(self.id(), self.title,
                                balance, timestamp, self.is_asset)
+
+
+def _add(store: AccountEntryStore, entry: AccountEntry) -> None:
+    """Append an entry to a store, or insert it if it is backdated.
+
+    Args:
+        store: the store
+        entry: the entry
+    """
+    last_time = store.last_time()
+    if last_time is None or entry.time() >= last_time:
+        store.append(entry)
+    else:
+        store.insert(entry)
+
+
+def _new_store(columnar: bool) -> AccountEntryStore:
+    """Create an empty entry store.
+
+    Args:
+        columnar: if True, store the entries in packed arrays
+
+    Returns:
+        The store.
+    """
+    if columnar:
+        return ColumnarAccountEntryList()
+    return AccountEntryList()
+
+
+def _entries_from(store: AccountEntryStore, cutoff: datetime,
+                  columnar: bool) -> AccountEntryStore:
+    """Copy the entries of a store at or after a time into a new store.
+
+    Args:
+        store: the store
+        cutoff: the time of the first entry to keep
+        columnar: if True, store the entries in packed arrays
+
+    Returns:
+        The new store.
+    """
+    ret = _new_store(columnar)
+    for entry in store:
+        if entry.time() >= cutoff:
+            ret.append(entry)
+    return ret
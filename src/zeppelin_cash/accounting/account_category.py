@@ -0,0 +1,58 @@
+"""The module wallet.accounting.account_category contains the AccountCategory
+enumeration."""
+from enum import auto, Enum
+
+
+class AccountCategory(Enum):
+    """AccountCategory is the financial statement line an account rolls up to."""
+    # Assets
+    Cash = auto()
+    AccountsReceivable = auto()
+    Inventory = auto()
+    PrepaidExpenses = auto()
+    OtherAssets = auto()
+    FixedAssetsAtCost = auto()
+    AccumulatedDepreciation = auto()
+    # Liabilities
+    AccountsPayable = auto()
+    AccruedExpenses = auto()
+    CurrentPortionOfDebt = auto()
+    IncomeTaxesPayable = auto()
+    LongTermDebt = auto()
+    CapitalStock = auto()
+    RetainedEarnings = auto()
+    # Income statement
+    Sales = auto()
+    CostOfGoodsSold = auto()
+    SalesAndMarketing = auto()
+    ResearchAndDevelopment = auto()
+    InterestIncome = auto()
+    GeneralAndAdministrative = auto()
+
+
+# Accounts in these categories keep their balance as credits less debits,
+# like liabilities.
+_CREDIT_BALANCE_CATEGORIES = frozenset([
+    AccountCategory.AccountsPayable,
+    AccountCategory.AccruedExpenses,
+    AccountCategory.CurrentPortionOfDebt,
+    AccountCategory.IncomeTaxesPayable,
+    AccountCategory.LongTermDebt,
+    AccountCategory.CapitalStock,
+    AccountCategory.RetainedEarnings,
+    AccountCategory.Sales,
+    AccountCategory.InterestIncome,
+])
+
+
+def is_asset(category: AccountCategory) -> bool:
+    """Check if the accounts of a category keep their balance like assets.
+
+    Args:
+        category: the category
+
+    Returns:
+        True iff the balance of an account in the category is its debits
+        less its credits, see `Account.is_asset`.
+    """
+    return category not in _CREDIT_BALANCE_CATEGORIES
@@ -0,0 +1,86 @@
+"""The module wallet.accounting.account_entry_list contains the
+AccountEntryList implementation."""
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.account_entry_store import AccountEntryStore
+from zeppelin_cash.accounting.backdated_entries import BackdatedEntries
+
+
+class AccountEntryList(AccountEntryStore):
+    """An AccountEntryList stores account entries as a list of objects.
+
+    This is the default entry store. Alongside the entries, the list keeps
+    the entry times and the running total of the entry amounts, so the
+    total of all entries before a given time can be found with a binary
+    search instead of a walk over every entry. Backdated entries are kept
+    apart, see `BackdatedEntries`, and merged in when the entries are read.
+    """
+
+    def __init__(self) -> None:
+        """Create a new, empty AccountEntryList instance."""
+        self._entries: List[AccountEntry] = []
+        self._times: List[datetime] = []
+        # self._totals[k] is the sum of the amounts of the first k + 1
+        # entries, in fractional units.
+        self._totals: List[int] = []
+        self._backdated = BackdatedEntries()
+        # all of the entries in time order, once there are backdated ones
+        self._merged: Optional[List[AccountEntry]] = None
+
+    def append(self, entry: AccountEntry) -> None:
+        total = self._totals[-1] if self._totals else 0
+        self._entries.append(entry)
+        self._times.append(entry.time())
+        self._totals.append(total + entry.amount().minor_units())
+        self._merged = None
+
+    def insert(self, entry: AccountEntry) -> None:
+        self._backdated.insert(entry)
+        self._merged = None
+
+    def last_time(self) -> Optional[datetime]:
+        return self._times[-1] if self._times else None
+
+    def total(self) -> int:
+        total = self._totals[-1] if self._totals else 0
+        return total + self._backdated.total()
+
+    def total_before(self, time: datetime) -> int:
+        count = bisect_left(self._times, time)
+        total = self._totals[count - 1] if count > 0 else 0
+        return total + self._backdated.total_before(time)
+
+    def totals_before(self, times: List[datetime]) -> List[int]:
+        ret = []
+        count = 0
+        for time in times:
+            # The search only looks past the previous position, so the
+            # entries are walked forward once.
+            count = bisect_left(self._times, time, count)
+            total = self._totals[count - 1] if count > 0 else 0
+            ret.append(total + self._backdated.total_before(time))
+        return ret
+
+    def _in_order(self) -> List[AccountEntry]:
+        """Get all of the entries in time order.
+
+        Returns:
+            The entries, merged with the backdated ones if there are any.
+        """
+        if not self._backdated:
+            return self._entries
+        if self._merged is None:
+            self._merged = self._backdated.merge(self._entries)
+        return self._merged
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._backdated)
+
+    def __getitem__(self, index: int) -> AccountEntry:
+        return self._in_order()[index]
+
+    def __iter__(self) -> Iterator[AccountEntry]:
+        return iter(self._in_order())
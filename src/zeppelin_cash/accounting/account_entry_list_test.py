@@ -0,0 +1,31 @@
+"""Test the AccountEntryList implementation."""
+from datetime import datetime, timedelta
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.account_entry_list import AccountEntryList
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.money import Money
+
+
+def test_account_entry_list() -> None:
+    """Check that the running totals track the appended entries."""
+    start = datetime.now()
+    entries = AccountEntryList()
+    assert len(entries) == 0
+    assert entries.last_time() is None
+    assert entries.total() == 0
+    assert entries.total_before(start) == 0
+    for k in range(1, 5):
+        entries.append(AccountEntry(start + timedelta(seconds=k),
+                                    Money(10 * k, usd())))
+    assert len(entries) == 4
+    assert entries[0].amount().quantity() == 10
+    assert entries[-1].amount().quantity() == 40
+    assert [entry.amount().quantity() for entry in entries] == [10, 20, 30, 40]
+    assert entries.last_time() == start + timedelta(seconds=4)
+    # the totals are in cents
+    assert entries.total() == 10000
+    assert entries.total_before(start + timedelta(seconds=1)) == 0
+    assert entries.total_before(start + timedelta(seconds=2)) == 1000
+    assert entries.total_before(start + timedelta(seconds=2.5)) == 3000
+    assert entries.total_before(start + timedelta(seconds=5)) == 10000
@@ -0,0 +1,108 @@
+"""The module wallet.accounting.account_entry_store contains the abstract
+AccountEntryStore class."""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+
+
+class AccountEntryStore(ABC):
+    """An AccountEntryStore holds one side (debits or credits) of an account.
+
+    Entries are appended in time order, or inserted when they are dated
+    before the last entry. Implementations also keep the
+    running total of the entry amounts, in fractional currency units (see
+    `Money.minor_units`), so that the total before any time can be found
+    without visiting every entry. The totals are integers, so they are exact
+    however many entries there are.
+    """
+
+    @abstractmethod
+    def append(self, entry: AccountEntry) -> None:
+        """Append an entry to the store.
+
+        The caller is responsible for checking that the entry is not earlier
+        than the last entry.
+
+        Args:
+            entry: the entry to append
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def insert(self, entry: AccountEntry) -> None:
+        """Insert an entry dated before the last entry of the store.
+
+        The entry goes after any entries at the same time. Implementations
+        keep the totals in O(log n) time per insert, see `BackdatedEntries`.
+
+        Args:
+            entry: the entry to insert
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def last_time(self) -> Optional[datetime]:
+        """Get the time of the last entry.
+
+        Returns:
+            The time of the last entry, or None if the store is empty.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def total(self) -> int:
+        """Get the sum of the amounts of all entries.
+
+        Returns:
+            The total in fractional units.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def total_before(self, time: datetime) -> int:
+        """Get the sum of the amounts of all entries strictly before a time.
+
+        Args:
+            time: the cut off time
+
+        Returns:
+            The total in fractional units.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def totals_before(self, times: List[datetime]) -> List[int]:
+        """Get the totals strictly before each of several times.
+
+        This is done in one forward pass over the entries, so it is cheaper
+        than calling `total_before` once per time.
+
+        Args:
+            times: the cut off times, in ascending order
+
+        Returns:
+            The total in fractional units before each time.
+        """
+        raise NotImplementedError()
+
+    def minor_units(self) -> Sequence[int]:
+        """Get the amount of every entry.
+
+        Returns:
+            The amounts in fractional units, in entry order.
+        """
+        return [entry.amount().minor_units() for entry in self]
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __getitem__(self, index: int) -> AccountEntry:
+        raise NotImplementedError()
+
+    def __iter__(self) -> Iterator[AccountEntry]:
+        for k in range(len(self)):
+            yield self[k]
@@ -1,9 +1,12 @@
 """The module wallet.accounting.test_account tests the Account implementation."""
 from datetime import datetime, timedelta
+from random import Random
 
 from zeppelin_cash.accounting.account import Account
 from zeppelin_cash.accounting.account_entry import AccountEntry
 from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.fx_rates import FxRateTable
+from zeppelin_cash.accounting.iso4217 import currency_by_code
 from zeppelin_cash.accounting.money import Money
 
 
@@ -45,8 +48,8 @@ def test_set_starting_balance() -> None:
     assert not result.is_ok()
 
 
-def test_bad_additions() -> None:
-    """Check that entries can only be added in order."""
+def test_backdated_additions() -> None:
+    """Check that entries dated before the last entry are inserted."""
     account = Account("My Account", True, "1234")
     start = datetime.now()
     account.set_starting_balance(start, Money(0, usd()))
@@ -54,10 +57,171 @@ def test_bad_additions() -> None:
     entry = AccountEntry(start + timedelta(seconds=3), Money(100, usd()))
     assert account.add_entry(True, entry).is_ok()
     entry = AccountEntry(start + timedelta(seconds=2), Money(10, usd()))
-    assert not account.add_entry(False, entry).is_ok()
-    assert account.balance().quantity() == 100
+    assert account.add_entry(False, entry).is_ok()
+    assert account.balance().quantity() == 90
     entry = AccountEntry(start + timedelta(seconds=6), Money(10, usd()))
     assert account.add_entry(False, entry).is_ok()
     entry = AccountEntry(start + timedelta(seconds=5), Money(50, usd()))
-    assert not account.add_entry(False, entry).is_ok()
-    assert account.balance().quantity() == 90
+    assert account.add_entry(False, entry).is_ok()
+    assert account.balance().quantity() == 30
+    assert account.balance_as_of_date(
+        start + timedelta(seconds=6)).ok().quantity() == 40
+    assert [entry.time() for entry in account.credits] == [
+        start + timedelta(seconds=seconds) for seconds in [2, 5, 6]]
+
+
+def test_balance_matches_entry_scan() -> None:
+    """Check that the running totals agree with summing every entry."""
+    start = datetime.now()
+    rng = Random(42)
+    for is_asset, columnar in [(True, False), (False, False), (True, True)]:
+        account = Account("My Account", is_asset, "1234", columnar=columnar)
+        account.set_starting_balance(start, Money(500, usd()))
+        for k in range(200):
+            # several entries share a timestamp
+            entry = AccountEntry(start + timedelta(seconds=1 + k // 3),
+                                 Money(rng.randint(1, 10000), usd()))
+            assert account.add_entry(rng.random() < 0.5, entry).is_ok()
+        sign = 1 if is_asset else -1
+        for seconds in range(0, 70):
+            time = start + timedelta(seconds=seconds)
+            expected = 500 + \
+                sum(sign * entry.amount().quantity()
+                    for entry in account.debits if entry.time() < time) - \
+                sum(sign * entry.amount().quantity()
+                    for entry in account.credits if entry.time() < time)
+            result = account.balance_as_of_date(time)
+            assert result.is_ok()
+            assert result.ok() == Money(expected, usd())
+        assert account.balance() == account.balance_as_of_date(
+            start + timedelta(days=1)).ok()
+
+
+def test_balances_at() -> None:
+    """Check that a series of balances matches the single balances."""
+    start = datetime.now()
+    rng = Random(7)
+    for columnar in [False, True]:
+        account = Account("My Account", True, "1234", columnar=columnar)
+        account.set_starting_balance(start, Money(500, usd()))
+        for k in range(100):
+            entry = AccountEntry(start + timedelta(seconds=1 + k // 2),
+                                 Money(rng.randint(1, 10000), usd()))
+            assert account.add_entry(rng.random() < 0.5, entry).is_ok()
+        times = [start + timedelta(seconds=seconds / 4)
+                 for seconds in range(0, 240)]
+        result = account.balances_at(times)
+        assert result.is_ok()
+        assert result.ok() == [account.balance_as_of_date(time).ok()
+                               for time in times]
+        assert account.balances_at([]).ok() == []
+        assert not account.balances_at([times[1], times[0]]).is_ok()
+        assert not account.balances_at(
+            [start - timedelta(seconds=1), start]).is_ok()
+
+
+def test_balance_array() -> None:
+    """Check the balances and entry amounts as MoneyArrays."""
+    start = datetime(2020, 1, 1)
+    for columnar in [False, True]:
+        account = Account("Test", True, "test-id", columnar)
+        account.set_starting_balance(start, Money(5, usd()))
+        for k in range(1, 6):
+            account.add_entry(k % 2 == 0, AccountEntry(
+                start + timedelta(seconds=k), Money(k, usd())))
+        times = [start + timedelta(seconds=k) for k in range(7)]
+        result = account.balance_array(times)
+        assert result.is_ok()
+        assert result.ok().to_money() == account.balances_at(times).ok()
+        assert account.entry_amounts(True).sum() == Money(6, usd())
+        assert account.entry_amounts(False).minor_units() == [100, 300, 500]
+        assert not account.balance_array([times[1], times[0]]).is_ok()
+
+
+def test_balances_in_several_currencies() -> None:
+    """Check that entries in other currencies are kept in separate balances."""
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    start = datetime(2020, 1, 1)
+    account = Account("My Account", True, "1234")
+    account.set_starting_balance(start, Money(10, usd()))
+    day = timedelta(days=1)
+    assert account.add_entry(True, AccountEntry(
+        start + day, Money(100, eur))).is_ok()
+    assert account.add_entry(True, AccountEntry(
+        start + 2 * day, Money(5, usd()))).is_ok()
+    assert account.add_entry(False, AccountEntry(
+        start + 3 * day, Money(30, eur))).is_ok()
+    assert [currency.code() for currency in account.currencies()] == [
+        "USD", "EUR"]
+    assert account.balance() == Money(15, usd())
+    assert account.balances() == {"USD": Money(15, usd()),
+                                  "EUR": Money(70, eur)}
+    assert account.balances_as_of_date(start + 2 * day).ok() == {
+        "USD": Money(10, usd()), "EUR": Money(100, eur)}
+    assert not account.balances_as_of_date(start - day).is_ok()
+    arrays = account.balance_arrays([start + day, start + 4 * day]).ok()
+    assert [list(array) for array in arrays] == [
+        [Money(10, usd()), Money(15, usd())],
+        [Money(0, eur), Money(70, eur)]]
+    rates = FxRateTable()
+    assert not account.balance_in(usd(), rates, start + 4 * day).is_ok()
+    assert rates.set_rate(eur, usd(), start, 1.5).is_ok()
+    assert account.balance_in(usd(), rates, start + 4 * day).ok() == \
+        Money(120, usd())
+    # a zero balance needs no rate
+    assert account.balance_in(usd(), FxRateTable(), start + day).ok() == \
+        Money(10, usd())
+
+
+def test_add_entries() -> None:
+    """Check that a group of entries is added in time order."""
+    start = datetime(2020, 1, 1)
+    account = Account("My Account", True, "1234")
+    account.set_starting_balance(start, Money(0, usd()))
+    day = timedelta(days=1)
+    assert account.add_entries(
+        [AccountEntry(start + day, Money(10, usd())),
+         AccountEntry(start + 3 * day, Money(20, usd()))],
+        [AccountEntry(start + 2 * day, Money(5, usd()))]).is_ok()
+    assert account.balance() == Money(25, usd())
+    # out of order within a side, and before the last entry of a side
+    assert account.add_entries(
+        [AccountEntry(start + 5 * day, Money(1, usd())),
+         AccountEntry(start + 2 * day, Money(2, usd()))],
+        [AccountEntry(start + day, Money(1, usd()))]).is_ok()
+    assert account.balance() == Money(27, usd())
+    assert [entry.amount() for entry in account.debits] == [
+        Money(amount, usd()) for amount in [10, 2, 20, 1]]
+    assert [entry.amount() for entry in account.credits] == [
+        Money(amount, usd()) for amount in [1, 5]]
+
+
+def test_close() -> None:
+    """Check that closing a period keeps the balances at its boundaries."""
+    start = datetime(2020, 1, 1)
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    day = timedelta(days=1)
+    for columnar in [False, True]:
+        account = Account("My Account", True, "1234", columnar=columnar)
+        account.set_starting_balance(start, Money(3, usd()))
+        assert account.add_entries(
+            [AccountEntry(start + day, Money(10, usd())),
+             AccountEntry(start + 2 * day, Money(100, eur)),
+             AccountEntry(start + 4 * day, Money(20, usd()))],
+            [AccountEntry(start + 3 * day, Money(5, usd()))]).is_ok()
+        times = [start, start + 2 * day, start + 5 * day]
+        expected = account.balance_arrays(times).ok()
+        account.close(start + 2 * day, [start])
+        assert account.init_datetime == start + 2 * day
+        assert len(account.debits) == 1
+        assert len(account.credits) == 1
+        assert account.balances() == {"USD": Money(28, usd()),
+                                      "EUR": Money(100, eur)}
+        assert [list(array) for array in account.balance_arrays(times).ok()] \
+            == [list(array) for array in expected]
+        assert account.balances_as_of_date(start).ok() == {
+            "USD": Money(3, usd()), "EUR": Money(0, eur)}
+        assert not account.balances_as_of_date(start + day).is_ok()
+        assert not account.balance_arrays([start + day]).is_ok()
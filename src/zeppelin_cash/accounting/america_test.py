@@ -59,7 +59,7 @@ def test_america():
     # TTD
     assert ttd().name() == "Trinidad & Tobago dollar"
     assert ttd().code() == "TTD"
-    assert ttd().numeric_code() == 840
+    assert ttd().numeric_code() == 780
     assert ttd().symbol() == "TT$"
     # VEB
     assert veb().name() == "Venezuelan bolivar"
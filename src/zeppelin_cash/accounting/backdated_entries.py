@@ -0,0 +1,197 @@
+"""The module wallet.accounting.backdated_entries contains the BackdatedEntries
+implementation."""
+from datetime import datetime
+from random import random
+from typing import Iterable, Iterator, List, Optional
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+
+
+class _Node:
+    """A node of the tree of backdated entries."""
+
+    __slots__ = ("entry", "time", "units", "total", "priority", "left",
+                 "right")
+
+    def __init__(self, entry: AccountEntry) -> None:
+        """Create a new leaf _Node instance.
+
+        Args:
+            entry: the entry
+        """
+        self.entry = entry
+        self.time = entry.time()
+        self.units = entry.amount().minor_units()
+        # the sum of the amounts in the subtree of the node
+        self.total = self.units
+        self.priority = random()
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+class BackdatedEntries:
+    """BackdatedEntries holds the entries inserted before the last entry of
+    an entry store.
+
+    The entries appended in time order stay in the store's own arrays. The
+    entries dated earlier are kept in a treap, a binary search tree by time
+    balanced by random priorities, whose nodes also hold the total of their
+    subtree. Inserting an entry, and the total of the entries before a
+    time, both take O(log n) expected time for n backdated entries, however
+    their times are spread. Entries at the same time are kept in the order
+    they were inserted.
+    """
+
+    def __init__(self) -> None:
+        """Create a new, empty BackdatedEntries instance."""
+        self._root: Optional[_Node] = None
+        self._count = 0
+
+    def insert(self, entry: AccountEntry) -> None:
+        """Insert an entry, after any entries at the same time.
+
+        Args:
+            entry: the entry
+        """
+        self._root = _insert(self._root, _Node(entry))
+        self._count += 1
+
+    def total(self) -> int:
+        """Get the sum of the amounts of all backdated entries.
+
+        Returns:
+            The total in fractional units.
+        """
+        return self._root.total if self._root is not None else 0
+
+    def total_before(self, time: datetime) -> int:
+        """Get the sum of the amounts of the backdated entries before a time.
+
+        Args:
+            time: the cut off time
+
+        Returns:
+            The total in fractional units.
+        """
+        total = 0
+        node = self._root
+        while node is not None:
+            if node.time < time:
+                total += node.units
+                if node.left is not None:
+                    total += node.left.total
+                node = node.right
+            else:
+                node = node.left
+        return total
+
+    def merge(self, appended: Iterable[AccountEntry]) -> List[AccountEntry]:
+        """Merge the backdated entries with the appended ones.
+
+        A backdated entry comes after the appended entries at its time,
+        which were there when it was inserted.
+
+        Args:
+            appended: the appended entries, in order
+
+        Returns:
+            All of the entries, in time order.
+        """
+        ret: List[AccountEntry] = []
+        backdated = iter(self)
+        pending = next(backdated, None)
+        for entry in appended:
+            while pending is not None and pending.time() < entry.time():
+                ret.append(pending)
+                pending = next(backdated, None)
+            ret.append(entry)
+        if pending is not None:
+            ret.append(pending)
+            ret.extend(backdated)
+        return ret
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[AccountEntry]:
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.entry
+            node = node.right
+
+
+def _insert(root: Optional[_Node], node: _Node) -> _Node:
+    """Insert a node into a subtree, after any nodes at the same time.
+
+    Args:
+        root: the root of the subtree
+        node: the new node
+
+    Returns:
+        The new root of the subtree.
+    """
+    if root is None:
+        return node
+    root.total += node.units
+    if node.time < root.time:
+        root.left = _insert(root.left, node)
+        if root.left.priority > root.priority:
+            return _rotate_right(root)
+    else:
+        root.right = _insert(root.right, node)
+        if root.right.priority > root.priority:
+            return _rotate_left(root)
+    return root
+
+
+def _rotate_right(root: _Node) -> _Node:
+    """Lift the left child of a node above it.
+
+    Args:
+        root: the node
+
+    Returns:
+        The new root of the subtree.
+    """
+    pivot = root.left
+    assert pivot is not None
+    root.left = pivot.right
+    pivot.right = root
+    pivot.total = root.total
+    root.total = root.units + _total(root.left) + _total(root.right)
+    return pivot
+
+
+def _rotate_left(root: _Node) -> _Node:
+    """Lift the right child of a node above it.
+
+    Args:
+        root: the node
+
+    Returns:
+        The new root of the subtree.
+    """
+    pivot = root.right
+    assert pivot is not None
+    root.right = pivot.left
+    pivot.left = root
+    pivot.total = root.total
+    root.total = root.units + _total(root.left) + _total(root.right)
+    return pivot
+
+
+def _total(node: Optional[_Node]) -> int:
+    """Get the total of a subtree.
+
+    Args:
+        node: the root of the subtree
+
+    Returns:
+        The sum of its amounts in fractional units, 0 if it is empty.
+    """
+    return node.total if node is not None else 0
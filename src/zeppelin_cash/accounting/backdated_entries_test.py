@@ -0,0 +1,66 @@
+"""Test the BackdatedEntries implementation."""
+from datetime import datetime, timedelta
+from random import Random
+from typing import List
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.account_entry_list import AccountEntryList
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.backdated_entries import BackdatedEntries
+from zeppelin_cash.accounting.columnar_account_entry_list import ColumnarAccountEntryList
+from zeppelin_cash.accounting.money import Money
+
+
+def test_clustered_entries() -> None:
+    """Check the totals of many backdated entries between two entries."""
+    start = datetime(2020, 1, 1)
+    rng = Random(5)
+    backdated = BackdatedEntries()
+    entries: List[AccountEntry] = []
+    for _ in range(500):
+        entry = AccountEntry(
+            start + timedelta(microseconds=rng.randint(0, 50)),
+            Money.from_minor_units(rng.randint(-100, 100), usd()))
+        backdated.insert(entry)
+        entries.append(entry)
+    for micros in range(-1, 52):
+        time = start + timedelta(microseconds=micros)
+        assert backdated.total_before(time) == sum(
+            entry.amount().minor_units() for entry in entries
+            if entry.time() < time)
+    assert backdated.total() == sum(
+        entry.amount().minor_units() for entry in entries)
+    # entries at the same time keep the order they were inserted in
+    assert list(backdated) == sorted(entries, key=lambda e: e.time())
+
+
+def test_backdated_entries() -> None:
+    """Check that entry stores with backdated entries match a sorted scan."""
+    start = datetime(2020, 1, 1)
+    rng = Random(11)
+    for store in [AccountEntryList(), ColumnarAccountEntryList()]:
+        entries = []
+        for _ in range(300):
+            entry = AccountEntry(start + timedelta(seconds=rng.randint(0, 99)),
+                                 Money(rng.randint(1, 1000), usd()))
+            last_time = store.last_time()
+            if last_time is None or entry.time() >= last_time:
+                store.append(entry)
+            else:
+                store.insert(entry)
+            entries.append(entry)
+        times = [start + timedelta(seconds=seconds / 2)
+                 for seconds in range(-1, 202)]
+        expected = [sum(entry.amount().minor_units() for entry in entries
+                        if entry.time() < time) for time in times]
+        assert store.totals_before(times) == expected
+        assert [store.total_before(time) for time in times] == expected
+        assert store.total() == expected[-1]
+        assert len(store) == len(entries)
+        in_order = list(store)
+        assert [entry.time() for entry in in_order] == sorted(
+            entry.time() for entry in entries)
+        assert [store[k].time() for k in range(len(store))] == [
+            entry.time() for entry in in_order]
+        assert list(store.minor_units()) == [
+            entry.amount().minor_units() for entry in in_order]
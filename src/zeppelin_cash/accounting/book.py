@@ -1,157 +1,290 @@
 """The module wallet.accounting.book contains the Book implementation."""
-from typing import List, Tuple
+from bisect import bisect_left
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Set,
+                    Tuple, TypeVar)
 from datetime import datetime
 
 from zeppelin_cash.accounting.account import Account, AccountId
+from zeppelin_cash.accounting.account_category import AccountCategory, is_asset
 from zeppelin_cash.accounting.america import usd
 from zeppelin_cash.accounting.account_entry import AccountEntry
 from zeppelin_cash.accounting.account_metadata import AccountMetadata
 from zeppelin_cash.accounting.balance_sheet import BalanceSheet
 from zeppelin_cash.accounting.cash_flow_statement import CashFlowStatement
-from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.closed_periods import CashMovements, ClosedPeriods
+from zeppelin_cash.accounting.currency import Currency, shared_instance
 from zeppelin_cash.accounting.financial_statement import FinancialStatement
+from zeppelin_cash.accounting.fx_rates import FxRateTable
 from zeppelin_cash.accounting.income_statement import IncomeStatement
 from zeppelin_cash.accounting.journal import Journal
 from zeppelin_cash.accounting.journal_transaction import JournalTransaction
 from zeppelin_cash.accounting.ledger import Ledger
+from zeppelin_cash.accounting.live_statements import LiveStatements
 from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.money_array import MoneyArray
+from zeppelin_cash.accounting.statement_cache import StatementCache, StatementCacheStats, StatementKey
+from zeppelin_cash.accounting.statement_engine import BALANCE_SHEET_LINES, CAPITAL_AND_BORROWING_CATEGORIES, StatementEngine
+from zeppelin_cash.accounting.statement_period import period_boundaries, StatementPeriod
+from zeppelin_cash.accounting.trial_balance import TrialBalance
 from zeppelin_cash.errors import Error, ok, Result
 
+T = TypeVar("T")  # pylint: disable=C0103
+
 
 class Book:
     """A book contains the entire book for a firm."""
 
-    def __init__(self, time: datetime, currency: Currency = usd()) -> None:
+    def __init__(self, time: datetime, currency: Currency = usd(),
+                 columnar: bool = False) -> None:
         """Create an empty book.
 
         Args:
             time: the start time of the book
             currency: the accounting currency of the book
+            columnar: if True, the ledger accounts store their entries in
+                packed arrays, see ColumnarAccountEntryList
         """
         self.ledger = Ledger([])
         self.journal = Journal()
         self.accounting_currency = currency
         self.__account_id_iter = 3
         self.start_time = time
+        self._columnar = columnar
+
+        # the category of every account, the accounts of each category in
+        # the order they were added, and those without a parent account
+        self._category_by_id: Dict[AccountId, AccountCategory] = {}
+        self._ids_by_category: Dict[AccountCategory, List[AccountId]] = {
+            category: [] for category in AccountCategory}
+        self._root_ids_by_category: Dict[AccountCategory, List[AccountId]] = {
+            category: [] for category in AccountCategory}
 
         # Add the basic ledger accounts
+        for title, account_id, category in _DEFAULT_ACCOUNTS:
+            account = Account(title, is_asset(category), account_id,
+                              columnar=self._columnar)
+            account.set_starting_balance(
+                self.start_time, Money(0, self.accounting_currency))
+            self.ledger.add_account(account)
+            self._register(account_id, category)
+
+        # running statement totals, if enabled
+        self._live: Optional[LiveStatements] = None
+        # memoized statements, if enabled
+        self._cache: Optional[StatementCache] = None
+        # exchange rates for translating other currencies into the
+        # accounting currency, see set_exchange_rate
+        self.fx_rates = FxRateTable(cache_size=1024)
+        # lazy push, if enabled: the number of journal transactions pushed to
+        # every account, and for each account materialized since, the number
+        # of its journal positions pushed to it
+        self._lazy = False
+        self._lazy_from = 0
+        self._cursors: Dict[AccountId, int] = {}
+        # what is kept of the closed periods, see close_period
+        self.closed_periods = ClosedPeriods(self.start_time,
+                                            self.accounting_currency)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled book, e.g. as written by FsBookEngine.
+
+        A book pickled before the account categories were kept in one
+        registry has the layout of the first release: a ledger with plain
+        lists of entries, a journal with a plain list of transactions, and a
+        list of account ids per category. It is rebuilt as a new book with
+        the same accounts, entries and transactions.
 
-        # Assets
-        account = Account("Cash", True, default_cash_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._cash_account_ids = [default_cash_id()]
-        account = Account("Accounts Receivable", True,
-                          default_accounts_receivable_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._accounts_receivable_ids = [default_accounts_receivable_id()]
-        account = Account("Inventory", True, default_inventory_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._inventory_ids = [default_inventory_id()]
-        account = Account(
-            "Prepaid Expenses",
-            True,
-            default_prepaid_expenses_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._prepaid_expenses_ids = [default_prepaid_expenses_id()]
-        account = Account("Other Assets", True, default_other_assets_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._other_assets_ids = [default_other_assets_id()]
-        account = Account("Fixed Assets at Cost", True,
-                          default_fixed_assets_at_cost_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._fixed_assets_at_cost_ids = [default_fixed_assets_at_cost_id()]
-        account = Account("Accumulated Depreciation", True,
-                          default_accumulated_depreciation_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._accumulated_depreciation_ids = [
-            default_accumulated_depreciation_id()]
-
-        # Liabilities
-        account = Account("Accounts Payable", False,
-                          default_accounts_payable_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._accounts_payable_ids = [default_accounts_payable_id()]
-        account = Account("Accrued Expenses", False,
-                          default_accrued_expenses_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._accrued_expenses_ids = [default_accrued_expenses_id()]
-        account = Account("Current Portion of Debt", False,
-                          default_current_portion_of_debt_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._current_portion_of_debt_ids = [
-            default_current_portion_of_debt_id()]
-        account = Account("Income Taxes Payable", False,
-                          default_income_taxes_payable_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._income_taxes_payable_ids = [default_income_taxes_payable_id()]
-        account = Account("Long Term Debt", False, default_long_term_debt_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._long_term_debt_ids = [default_long_term_debt_id()]
-        account = Account("Capital Stock", False, default_capital_stock_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._capital_stock_ids = [default_capital_stock_id()]
-        account = Account("Retained Earnings", False,
-                          default_retained_earnings_id())
-        account.set_starting_balance(
-            self.start_time, Money(0, self.accounting_currency))
-        self.ledger.add_account(account)
-        self._retained_earnings_ids = [default_retained_earnings_id()]
-
-        # other account types
-        self._sales_account_ids: List[str] = []
-        self._cost_of_goods_sold_ids: List[str] = []
-        self._sales_and_marketing_ids: List[str] = []
-        self._research_and_development_ids: List[str] = []
-        self._interest_income_ids: List[str] = []
-        self._general_and_administrative_ids: List[str] = []
-
-    def is_valid(self) -> bool:
+        Args:
+            state: the pickled attributes
+        """
+        if "_category_by_id" in state:
+            self.__dict__.update(state)
+            return
+        self.__init__(  # type: ignore  # pylint: disable=C2801
+            state["start_time"], shared_instance(state["accounting_currency"]))
+        self.__account_id_iter = state["_Book__account_id_iter"]
+        category_by_id = {
+            account_id: category
+            for name, category in _LEGACY_CATEGORY_IDS
+            for account_id in state.get(name, [])}
+        for legacy in vars(state["ledger"])["accounts"]:
+            attributes = vars(legacy)
+            account_id = attributes["_id"]
+            result = self.ledger.get_account(account_id)
+            if result.is_ok():
+                account = result.ok()
+            else:
+                account = Account(attributes["title"], attributes["is_asset"],
+                                  account_id, columnar=self._columnar)
+                assert self.ledger.add_account(account).is_ok()
+                self._register(account_id, category_by_id.get(
+                    account_id, AccountCategory.Cash))
+            account.set_starting_balance(attributes["init_datetime"],
+                                         attributes["init_balance"])
+            assert self.ledger.add_entries(
+                account_id, attributes["debits"],
+                attributes["credits"]).is_ok()
+        journal = vars(state["journal"])
+        assert self.journal.add_transactions([
+            JournalTransaction(vars(transaction)["_time"],
+                               vars(transaction)["description"],
+                               vars(transaction)["_entries"])
+            for transaction in journal["transactions"]]).is_ok()
+        assert self.journal.have_pushed(journal["_pushed_index"]).is_ok()
+
+    def is_valid(self, audit: bool = False) -> bool:
         """Check If the book is valid.
 
+        Args:
+            audit: True to check every transaction again rather than trust
+                the checks made as they were added, see `Journal.is_valid`
+
         Returns:
             True iff the account is valid.
         """
-        return self.journal.is_valid()
+        return self.journal.is_valid(audit)
 
     def add_transaction(self, transaction: JournalTransaction) -> Error:
         """Add a transaction to the book.
 
         Valid transactions are automatically pushed from the journal
-        to the ledger. This is an atomic operation.
+        to the ledger, unless lazy push is enabled, see `enable_lazy_push`.
+        This is an atomic operation.
 
         Returns:
             an error if an error occurs.
         """
+        err = self._check_open(transaction)
+        if not err.is_ok():
+            return err
         err = self.journal.add_transaction(transaction)
         if not err.is_ok():
             return err
+        if self._cache is not None:
+            self._cache.invalidate_from(
+                transaction.time(), self.journal.version)
+        if not self._lazy:
+            self.push()
+        elif self._live is not None:
+            # the running totals need every entry as it is added
+            for entry in transaction.entries():
+                self._materialize(entry.account_id())
+            self._live.record_time(transaction.time())
+        return ok()
+
+    def add_transactions(
+            self, transactions: Iterable[JournalTransaction]) -> Error:
+        """Add a batch of transactions to the book.
+
+        The whole batch is checked first: every transaction must be valid
+        and every entry must be for an account of the book. If any check
+        fails nothing is added. Otherwise the transactions are added to the
+        journal and pushed to the ledger together, or left on the journal if
+        lazy push is enabled. Backdated transactions are inserted in time
+        order, as with `add_transaction`.
+
+        Args:
+            transactions: the transactions
+
+        Returns:
+            An error if the batch cannot be added.
+        """
+        batch = list(transactions)
+        if not batch:
+            return ok()
+        account_ids: Set[AccountId] = set()
+        for transaction in batch:
+            err = self._check_open(transaction)
+            if not err.is_ok():
+                return err
+            for entry in transaction.entries():
+                account_ids.add(entry.account_id())
+        for account_id in account_ids:
+            result = self.ledger.get_account(account_id)
+            if not result.is_ok():
+                return result.err()
+        err = self.journal.add_transactions(batch)
+        if not err.is_ok():
+            return err
+        if self._cache is not None:
+            self._cache.invalidate_from(
+                min(transaction.time() for transaction in batch),
+                self.journal.version)
+        if not self._lazy or self._live is not None:
+            self.push()
+        return ok()
+
+    def _check_open(self, transaction: JournalTransaction) -> Error:
+        """Check that a transaction is not in a closed period.
+
+        Args:
+            transaction: the transaction
+
+        Returns:
+            An error if the transaction is before the last cutoff.
+        """
+        cutoff = self.closed_periods.last_cutoff()
+        if cutoff is not None and transaction.time() < cutoff:
+            return Error("the period is closed")
+        return ok()
+
+    def close_period(
+            self, cutoff: datetime,
+            cold_archive: Optional[Callable[[List[JournalTransaction]],
+                                            None]] = None) -> Error:
+        """Close the period before a time.
+
+        The transactions before the cutoff are moved out of the journal, to
+        `closed_periods.transactions` or to the cold archive if one is given,
+        and each account folds its entries before the cutoff into its
+        starting balance, see `Account.close`. This keeps the journal, the
+        ledger and the cost of statements in proportion to the open period
+        rather than the whole history of the book.
+
+        Statements remain correct for periods that start and end at the
+        start of the book, at a cutoff or after the last cutoff: the
+        balances at those times are kept by the accounts, and the cash
+        movements of the archived transactions by `closed_periods`. Any
+        other time before the last cutoff is an error, and so is adding a
+        transaction dated before it.
+
+        Args:
+            cutoff: the end of the period, after the last cutoff
+            cold_archive: if given, called with the removed transactions, in
+                time order, instead of keeping them
+
+        Returns:
+            An error if the cutoff is not after the last one, or if a cash
+            movement in another currency before it has no exchange rate.
+        """
+        last_cutoff = self.closed_periods.last_cutoff()
+        if last_cutoff is not None and cutoff <= last_cutoff:
+            return Error("the period is already closed")
         self.push()
+        engine = StatementEngine(self.ledger, self.journal,
+                                 self.accounting_currency,
+                                 self._account_ids_by_category(),
+                                 self.fx_rates)
+
+        first_time = self.journal.transactions[0].time() \
+            if self.journal.transactions else None
+        if first_time is not None and first_time <= cutoff:
+            # every movement summed by the close can then be translated
+            checked = engine.cash_movements([first_time, cutoff])
+            if not checked.is_ok():
+                return checked.err()
+
+        def movements(start: datetime, end: datetime) -> CashMovements:
+            return engine.cash_movements([start, end]).ok()[0]
+
+        self.closed_periods.close(cutoff, first_time, movements)
+        self.ledger.close_period(cutoff, self.closed_periods.boundaries())
+        self.closed_periods.archive(self.journal.remove_before(cutoff),
+                                    cold_archive)
+        if self._cache is not None:
+            self._cache.clear(self.journal.version)
+        self._lazy_from = len(self.journal.transactions)
+        self._cursors.clear()
         return ok()
 
     def push(self) -> None:
@@ -160,15 +293,156 @@ class Book:
         Returns:
             None
         """
+        if self._lazy:
+            self._push_lazily()
+            return
         transactions = self.journal.un_pushed_transactions()
+        if not transactions:
+            return
+        # group the entries by account, so each account is looked up once
+        grouped: Dict[AccountId, Tuple[List[AccountEntry],
+                                       List[AccountEntry]]] = {}
         for transaction in transactions:
+            time = transaction.time()
             for entry in transaction.entries():
-                account_entry = AccountEntry(
-                    transaction.time(), entry.amount())
-                self.ledger.add_entry(entry.account_id(),
-                                      entry.is_debit(), account_entry)
+                group = grouped.get(entry.account_id())
+                if group is None:
+                    group = grouped[entry.account_id()] = ([], [])
+                group[0 if entry.is_debit() else 1].append(
+                    AccountEntry(time, entry.amount()))
+        for account_id, (debit_entries, credit_entries) in grouped.items():
+            err = self.ledger.add_entries(
+                account_id, debit_entries, credit_entries)
+            if self._live is not None and err.is_ok():
+                self._live.record_entries(account_id, True, debit_entries)
+                self._live.record_entries(account_id, False, credit_entries)
+        if self._live is not None:
+            self._live.record_time(transactions[-1].time())
         self.journal.have_pushed(len(transactions))
 
+    def enable_lazy_push(self) -> None:
+        """Stop pushing transactions to the ledger as they are added.
+
+        Once enabled, `add_transaction` only appends to the journal. Each
+        account is brought up to date from its un-pushed entries the first
+        time one of its balances, or a statement, is read. A cursor per
+        account into the journal's index of its transactions makes sure
+        each entry is pushed once. Read accounts through the book, e.g.
+        `balances_at`, or call `push` before reading the ledger directly.
+
+        While live statements are enabled the running totals need every
+        entry, so transactions are still pushed as they are added.
+        """
+        self.push()
+        self._lazy = True
+        self._lazy_from = len(self.journal.transactions)
+        self._cursors.clear()
+
+    def disable_lazy_push(self) -> None:
+        """Push everything, and push transactions as they are added again."""
+        self.push()
+        self._lazy = False
+
+    def _push_lazily(self) -> None:
+        """Bring every account up to date in lazy push mode."""
+        num_transactions = len(self.journal.transactions)
+        if num_transactions == self._lazy_from:
+            return
+        for account_id in self._category_by_id:
+            self._materialize(account_id)
+        self.journal.have_pushed(num_transactions - self._lazy_from)
+        self._lazy_from = num_transactions
+        self._cursors.clear()
+
+    def _materialize(self, account_id: AccountId) -> None:
+        """Push the un-pushed entries of one account in lazy push mode.
+
+        Args:
+            account_id: the id of the account
+        """
+        positions = self.journal.account_positions(account_id)
+        cursor = self._cursors.get(account_id)
+        if cursor is None:
+            cursor = bisect_left(positions, self._lazy_from)
+        if cursor == len(positions):
+            return
+        self._cursors[account_id] = len(positions)
+        debit_entries: List[AccountEntry] = []
+        credit_entries: List[AccountEntry] = []
+        for position in positions[cursor:]:
+            transaction = self.journal.added_transaction(position)
+            for entry in transaction.entries():
+                if entry.account_id() == account_id:
+                    (debit_entries if entry.is_debit() else credit_entries).append(
+                        AccountEntry(transaction.time(), entry.amount()))
+        err = self.ledger.add_entries(
+            account_id, debit_entries, credit_entries)
+        if self._live is not None and err.is_ok():
+            self._live.record_entries(account_id, True, debit_entries)
+            self._live.record_entries(account_id, False, credit_entries)
+
+    def enable_live_statements(self, period_start: datetime) -> Error:
+        """Keep running totals for every statement line.
+
+        Once enabled, the totals are updated as transactions are pushed to the
+        ledger. A balance sheet for any time after the last transaction, and
+        an income statement from `period_start` to any time after the last
+        transaction, are then read from the totals in constant time. Other
+        statements are still computed from the ledger.
+
+        Calling this again starts a new income statement period.
+
+        Args:
+            period_start: the start of the income statement period to track,
+                e.g. the start of the fiscal year
+
+        Returns:
+            An error if the period starts inside a closed period, or if an
+            income tax payment in another currency has no exchange rate.
+        """
+        self.push()
+        taxes = Money(0, self.accounting_currency)
+        if self.journal.transactions:
+            taxes, err = self._income_taxes_paid(
+                period_start, self.journal.transactions[-1].time())
+            if not err.is_ok():
+                return err
+        # the archived transactions are all before the last cutoff
+        last_cutoff = self.closed_periods.last_cutoff() or period_start
+        archived, err = self._archived_movements(
+            period_start, max(period_start, last_cutoff))
+        if not err.is_ok():
+            return err
+        taxes += archived[0]
+        live = LiveStatements(self.accounting_currency,
+                              period_start, taxes.minor_units())
+        for category, account_ids in self._account_ids_by_category().items():
+            for account_id in account_ids:
+                live.add_account(
+                    category, self.ledger.get_account(account_id).ok())
+        if self.journal.transactions:
+            live.record_time(self.journal.transactions[-1].time())
+        self._live = live
+        return ok()
+
+    def disable_live_statements(self) -> None:
+        """Stop keeping running totals for the statement lines."""
+        self._live = None
+
+    def _track_account(self, category: AccountCategory,
+                       account_id: AccountId) -> None:
+        """Update the live statements and cache, if enabled, for a new account.
+
+        Args:
+            category: the category of the account
+            account_id: the id of the account
+        """
+        if self._cache is not None:
+            self._cache.clear(self.journal.version)
+        if self._live is not None:
+            self._live.add_account(
+                category, self.ledger.get_account(account_id).ok())
+
     def __new_account_id(self) -> str:
         """Get a new account id.
 
@@ -188,53 +462,150 @@ class Book:
         Returns:
             a balance sheet or an error
         """
+        return self._memoize(("balance_sheet", time, time),
+                             lambda: self._balance_sheet(time))
+
+    def _balance_sheet(self, time: datetime) -> Result[BalanceSheet]:
+        """Compute a balance sheet for a given time.
+
+        Args:
+            time: the time of the statement
+
+        Returns:
+            a balance sheet or an error
+        """
+        self.push()
+        if self._live is not None and self._live.covers(time):
+            return Result(ok=self._live.balance_sheet(time))
         sheet = BalanceSheet(time)
         still_ok = True
         # assets
-        sheet.cash, err = self._sum_balances(time, self._cash_account_ids)
+        sheet.cash, err = self._sum_balances(time, AccountCategory.Cash)
         still_ok = still_ok and err.is_ok()
         sheet.accounts_receivable, err = self._sum_balances(
-            time, self._accounts_receivable_ids)
+            time, AccountCategory.AccountsReceivable)
         still_ok = still_ok and err.is_ok()
-        sheet.inventory, err = self._sum_balances(time, self._inventory_ids)
+        sheet.inventory, err = self._sum_balances(
+            time, AccountCategory.Inventory)
         still_ok = still_ok and err.is_ok()
         sheet.prepaid_expenses, err = self._sum_balances(
-            time, self._prepaid_expenses_ids)
+            time, AccountCategory.PrepaidExpenses)
         still_ok = still_ok and err.is_ok()
         sheet.other_assets, err = self._sum_balances(
-            time, self._other_assets_ids)
+            time, AccountCategory.OtherAssets)
         still_ok = still_ok and err.is_ok()
         sheet.fixed_assets_at_cost, err = self._sum_balances(
-            time, self._fixed_assets_at_cost_ids)
+            time, AccountCategory.FixedAssetsAtCost)
         still_ok = still_ok and err.is_ok()
         sheet.accumulated_depreciation, err = self._sum_balances(
-            time, self._accumulated_depreciation_ids)
+            time, AccountCategory.AccumulatedDepreciation)
         still_ok = still_ok and err.is_ok()
         # liabilities
         sheet.accounts_payable, err = self._sum_balances(
-            time, self._accounts_payable_ids)
+            time, AccountCategory.AccountsPayable)
         still_ok = still_ok and err.is_ok()
         sheet.accrued_expenses, err = self._sum_balances(
-            time, self._accrued_expenses_ids)
+            time, AccountCategory.AccruedExpenses)
         still_ok = still_ok and err.is_ok()
         sheet.current_portion_of_debt, err = self._sum_balances(
-            time, self._current_portion_of_debt_ids)
+            time, AccountCategory.CurrentPortionOfDebt)
         still_ok = still_ok and err.is_ok()
         sheet.income_taxes_payable, err = self._sum_balances(
-            time, self._income_taxes_payable_ids)
+            time, AccountCategory.IncomeTaxesPayable)
         still_ok = still_ok and err.is_ok()
         sheet.long_term_debt, err = self._sum_balances(
-            time, self._long_term_debt_ids)
+            time, AccountCategory.LongTermDebt)
         still_ok = still_ok and err.is_ok()
         sheet.capital_stock, err = self._sum_balances(
-            time, self._capital_stock_ids)
+            time, AccountCategory.CapitalStock)
         still_ok = still_ok and err.is_ok()
         sheet.retained_earnings, err = self._sum_balances(
-            time, self._retained_earnings_ids)
+            time, AccountCategory.RetainedEarnings)
         still_ok = still_ok and err.is_ok()
         return Result(ok=sheet) if still_ok else Result(
             err=Error("cannot calculate balance sheet"))
 
+    def balance_sheet_series(
+            self, times: List[datetime]) -> Result[List[BalanceSheet]]:
+        """Get the balance sheets at several times.
+
+        Each account is read once for all of the times, see
+        `Account.balances_at`, so this is cheaper than calling
+        `balance_sheet` once per time.
+
+        Args:
+            times: the times of the statements, in ascending order
+
+        Returns:
+            a balance sheet per time or an error
+        """
+        self.push()
+        sheets = [BalanceSheet(time) for time in times]
+        account_ids = self._account_ids_by_category()
+        for category, line in BALANCE_SHEET_LINES:
+            totals = MoneyArray.zeros(self.accounting_currency, len(times))
+            for account_id in account_ids[category]:
+                result = self.ledger.balance_arrays(times, account_id)
+                if not result.is_ok():
+                    return Result(
+                        err=Error("cannot calculate balance sheet"))
+                for balances in result.ok():
+                    if balances.currency().code() != self.accounting_currency.code():
+                        translated = self.fx_rates.convert_all(
+                            balances.to_money(), times, self.accounting_currency)
+                        if not translated.is_ok():
+                            return Result(
+                                err=Error("cannot calculate balance sheet"))
+                        balances = MoneyArray.from_money(
+                            translated.ok(), self.accounting_currency)
+                    totals += balances
+            for sheet, total in zip(sheets, totals):
+                setattr(sheet, line, total)
+        return Result(ok=sheets)
+
+    def balances_at(self, times: List[datetime],
+                    account_id: AccountId) -> Result[List[Money]]:
+        """Get the balances of an account at several times.
+
+        This will push all journaled transactions to the account first.
+
+        Args:
+            times: the times of the balances, in ascending order
+            account_id: the id of the account
+
+        Returns:
+            The balance at each time, or an error.
+        """
+        if self._lazy:
+            self._materialize(account_id)
+        else:
+            self.push()
+        return self.ledger.balances_at(times, account_id)
+
+    def account_transactions(
+            self, account_id: AccountId, start: datetime,
+            end: datetime) -> Result[List[JournalTransaction]]:
+        """Get the transactions that touched an account in a time range.
+
+        The journal keeps an index of the transactions of each account, so
+        this does not scan the whole journal. The transactions of closed
+        periods are not included, see `close_period`.
+
+        Args:
+            account_id: the id of the account
+            start: the start of the range, inclusive
+            end: the end of the range, inclusive
+
+        Returns:
+            The transactions with an entry for the account, in time order,
+            or an error if the account does not exist.
+        """
+        account = self.ledger.get_account(account_id)
+        if not account.is_ok():
+            return Result(err=account.err())
+        return Result(ok=self.journal.transactions_for_account(
+            account_id, start, end))
+
     def cash_flow_statement(self, start: datetime,
                             end: datetime) -> Result[CashFlowStatement]:
         """Get a cash flow statement for the book.
@@ -246,40 +617,67 @@ class Book:
         Returns:
             a cash flow statement or an error
         """
+        return self._memoize(("cash_flow_statement", start, end),
+                             lambda: self._cash_flow_statement(start, end))
+
+    def _cash_flow_statement(self, start: datetime,
+                             end: datetime) -> Result[CashFlowStatement]:
+        """Compute a cash flow statement for the book.
+
+        Args:
+            start: the starting time
+            end: the ending time
+
+        Returns:
+            a cash flow statement or an error
+        """
+        self.push()
         statement = CashFlowStatement(start, end)
         still_ok = True
 
         statement.beginning_cash_balance, err = self._sum_balances(
-            start, self._cash_account_ids)
+            start, AccountCategory.Cash)
         still_ok = still_ok and err.is_ok()
 
-        first, err = self._sum_balances(end, self._fixed_assets_at_cost_ids)
+        first, err = self._sum_balances(end, AccountCategory.FixedAssetsAtCost)
         still_ok = still_ok and err.is_ok()
-        second, err = self._sum_balances(start, self._fixed_assets_at_cost_ids)
+        second, err = self._sum_balances(
+            start, AccountCategory.FixedAssetsAtCost)
         still_ok = still_ok and err.is_ok()
         statement.fixed_asset_purchases = first - second
 
-        first, err = self._sum_balances(end, self._long_term_debt_ids)
+        first, err = self._sum_balances(end, AccountCategory.LongTermDebt)
         still_ok = still_ok and err.is_ok()
         second, err = self._sum_balances(
-            end, self._current_portion_of_debt_ids)
+            end, AccountCategory.CurrentPortionOfDebt)
         still_ok = still_ok and err.is_ok()
-        third, err = self._sum_balances(start, self._long_term_debt_ids)
+        third, err = self._sum_balances(start, AccountCategory.LongTermDebt)
         still_ok = still_ok and err.is_ok()
         fourth, err = self._sum_balances(
-            start, self._current_portion_of_debt_ids)
+            start, AccountCategory.CurrentPortionOfDebt)
         still_ok = still_ok and err.is_ok()
         statement.net_borrowings = first + second - third - fourth
 
-        first, err = self._sum_balances(end, self._capital_stock_ids)
+        first, err = self._sum_balances(end, AccountCategory.CapitalStock)
         still_ok = still_ok and err.is_ok()
-        second, err = self._sum_balances(start, self._capital_stock_ids)
+        second, err = self._sum_balances(start, AccountCategory.CapitalStock)
         still_ok = still_ok and err.is_ok()
         statement.sale_of_stock = first - second
 
-        statement.income_taxes_paid = self._income_taxes_paid(start, end)
-        statement.cash_receipts = self._cash_receipts(start, end)
-        statement.cash_disbursements = self._cash_disbursements(start, end)
+        archived, err = self._archived_movements(start, end)
+        still_ok = still_ok and err.is_ok()
+        taxes, err = self._income_taxes_paid(start, end)
+        if not err.is_ok():
+            return Result(err=err)
+        receipts, err = self._cash_receipts(start, end)
+        if not err.is_ok():
+            return Result(err=err)
+        disbursements, err = self._cash_disbursements(start, end)
+        if not err.is_ok():
+            return Result(err=err)
+        statement.income_taxes_paid = taxes + archived[0]
+        statement.cash_receipts = receipts + archived[1]
+        statement.cash_disbursements = disbursements + archived[2]
 
         return Result(ok=statement) if still_ok else Result(
             err=Error("cannot calculate cash flow statement"))
@@ -295,52 +693,76 @@ class Book:
         Returns:
             an income statement or an error
         """
+        return self._memoize(("income_statement", start, end),
+                             lambda: self._income_statement(start, end))
+
+    def _income_statement(self, start: datetime,
+                          end: datetime) -> Result[IncomeStatement]:
+        """Compute an income statement for the book.
+
+        Args:
+            start: the starting time
+            end: the ending time
+
+        Returns:
+            an income statement or an error
+        """
+        self.push()
+        if self._live is not None and self._live.covers_period(start, end):
+            return Result(ok=self._live.income_statement(end))
         statement = IncomeStatement(start, end)
         statement.start_time = start
         statement.end_time = end
 
         still_ok = True
-        first, err = self._sum_balances(end, self._sales_account_ids)
+        first, err = self._sum_balances(end, AccountCategory.Sales)
         still_ok = still_ok and err.is_ok()
-        second, err = self._sum_balances(start, self._sales_account_ids)
+        second, err = self._sum_balances(start, AccountCategory.Sales)
         still_ok = still_ok and err.is_ok()
         statement.net_sales = first - second
 
-        first, err = self._sum_balances(end, self._cost_of_goods_sold_ids)
+        first, err = self._sum_balances(end, AccountCategory.CostOfGoodsSold)
         still_ok = still_ok and err.is_ok()
-        second, err = self._sum_balances(start, self._cost_of_goods_sold_ids)
+        second, err = self._sum_balances(
+            start, AccountCategory.CostOfGoodsSold)
         still_ok = still_ok and err.is_ok()
         statement.cost_of_goods_sold = first - second
 
-        first, err = self._sum_balances(end, self._sales_and_marketing_ids)
+        first, err = self._sum_balances(end, AccountCategory.SalesAndMarketing)
         still_ok = still_ok and err.is_ok()
-        second, err = self._sum_balances(start, self._sales_and_marketing_ids)
+        second, err = self._sum_balances(
+            start, AccountCategory.SalesAndMarketing)
         still_ok = still_ok and err.is_ok()
         statement.sales_and_marketing = first - second
 
         first, err = self._sum_balances(
-            end, self._research_and_development_ids)
+            end, AccountCategory.ResearchAndDevelopment)
         still_ok = still_ok and err.is_ok()
         second, err = self._sum_balances(
-            start, self._research_and_development_ids)
+            start, AccountCategory.ResearchAndDevelopment)
         still_ok = still_ok and err.is_ok()
         statement.research_and_development = first - second
 
         first, err = self._sum_balances(
-            end, self._general_and_administrative_ids)
+            end, AccountCategory.GeneralAndAdministrative)
         still_ok = still_ok and err.is_ok()
         second, err = self._sum_balances(
-            start, self._general_and_administrative_ids)
+            start, AccountCategory.GeneralAndAdministrative)
         still_ok = still_ok and err.is_ok()
         statement.general_and_administrative = first - second
 
-        first, err = self._sum_balances(end, self._interest_income_ids)
+        first, err = self._sum_balances(end, AccountCategory.InterestIncome)
         still_ok = still_ok and err.is_ok()
-        second, err = self._sum_balances(start, self._interest_income_ids)
+        second, err = self._sum_balances(start, AccountCategory.InterestIncome)
         still_ok = still_ok and err.is_ok()
         statement.interest_income = first - second
 
-        statement.income_taxes = self._income_taxes_paid(start, end)
+        archived, err = self._archived_movements(start, end)
+        still_ok = still_ok and err.is_ok()
+        taxes, err = self._income_taxes_paid(start, end)
+        if not err.is_ok():
+            return Result(err=err)
+        statement.income_taxes = taxes + archived[0]
         return Result(ok=statement) if still_ok else Result(
             err=Error("cannot calculate income statement"))
 
@@ -348,46 +770,195 @@ class Book:
                             end: datetime) -> Result[FinancialStatement]:
         """Get a financial statement for the book.
 
-        This implementation returns a financial statement with all zero values.
+        All three statements are computed in one pass over the ledger and
+        the journal, see StatementEngine.
 
         Returns:
             A financial statement.
         """
         self.push()
-        bs_result = self.balance_sheet(end)
-        if not bs_result.is_ok():
-            return Result(err=bs_result.err())
-        balance_sheet = bs_result.ok()
-        cf_result = self.cash_flow_statement(start, end)
-        if not cf_result.is_ok():
-            return Result(err=cf_result.err())
-        cash_flow = cf_result.ok()
-        is_result = self.income_statement(start, end)
-        if not is_result.is_ok():
-            return Result(err=is_result.err())
-        income = is_result.ok()
-        return Result(ok=FinancialStatement(balance_sheet, cash_flow, income))
+        engine = StatementEngine(self.ledger, self.journal,
+                                 self.accounting_currency,
+                                 self._account_ids_by_category(),
+                                 self.fx_rates, self.closed_periods)
+        return self._memoize(("financial_statement", start, end),
+                             lambda: engine.financial_statement(start, end))
+
+    def financial_statement_series(
+            self, start: datetime, end: datetime, period: StatementPeriod,
+            fiscal_year_start_month: int = 1) -> Result[List[FinancialStatement]]:
+        """Get the financial statements of consecutive periods.
+
+        The periods start on the first day of each month, quarter or fiscal
+        year between `start` and `end`, see `period_boundaries`, and each
+        statement is the same as `financial_statement` for its period. The
+        ledger and the journal are each walked once for the whole series.
+
+        Args:
+            start: the start of the first period
+            end: the end of the last period
+            period: the length of each period
+            fiscal_year_start_month: the month a fiscal year starts, 1 to 12
+
+        Returns:
+            A financial statement per period or an error.
+        """
+        if end < start:
+            return Result(err=Error("the series cannot end before it starts"))
+        if not 1 <= fiscal_year_start_month <= 12:
+            return Result(err=Error("invalid fiscal year start month"))
+        self.push()
+        engine = StatementEngine(self.ledger, self.journal,
+                                 self.accounting_currency,
+                                 self._account_ids_by_category(),
+                                 self.fx_rates, self.closed_periods)
+        return engine.financial_statement_series(
+            period_boundaries(start, end, period, fiscal_year_start_month))
+
+    def set_exchange_rate(self, base: Currency, quote: Currency,
+                          time: datetime, rate: float) -> Error:
+        """Set an exchange rate used to translate statements.
+
+        Balances and journal amounts in other currencies are translated into
+        the accounting currency at the rate as of the time of the statement
+        or the transaction.
+
+        Args:
+            base: the currency being bought
+            quote: the currency it is paid for in
+            time: the time the rate takes effect
+            rate: the units of the quote currency per unit of the base
+                currency
+
+        Returns:
+            An error if the rate is invalid.
+        """
+        err = self.fx_rates.set_rate(base, quote, time, rate)
+        if err.is_ok() and self._cache is not None:
+            self._cache.clear(self.journal.version)
+        return err
+
+    def enable_statement_cache(self, max_size: int = 128) -> None:
+        """Memoize the statements computed by the book.
+
+        Balance sheets, cash flow statements, income statements and
+        financial statements are cached, and the least recently used are
+        evicted once `max_size` statements are cached. Posting a transaction
+        only drops the statements whose period ends at or after it.
+
+        Cached statements are shared between callers and must not be
+        modified.
+
+        Args:
+            max_size: the maximum number of statements to keep
+        """
+        self._cache = StatementCache(max_size, self.journal.version)
+
+    def disable_statement_cache(self) -> None:
+        """Stop memoizing statements."""
+        self._cache = None
+
+    def statement_cache_stats(self) -> Optional[StatementCacheStats]:
+        """Get the hit, miss and eviction counts of the statement cache.
+
+        Returns:
+            The counters, or None if the cache is not enabled.
+        """
+        return self._cache.stats() if self._cache is not None else None
+
+    def _memoize(self, key: StatementKey,
+                 compute: Callable[[], Result[T]]) -> Result[T]:
+        """Read a statement from the cache, computing it on a miss.
+
+        Args:
+            key: the kind, start and end of the statement
+            compute: computes the statement
+
+        Returns:
+            The statement or an error.
+        """
+        if self._cache is None:
+            return compute()
+        cached = self._cache.get(key, self.journal.version)
+        if cached is not None:
+            return cached
+        result = compute()
+        self._cache.put(key, self.journal.version, result)
+        return result
+
+    def _account_ids_by_category(self) -> Dict[AccountCategory, List[str]]:
+        """Get the ids of the accounts in each category.
+
+        Returns:
+            The account ids, keyed by category.
+        """
+        return self._ids_by_category
 
     def _sum_balances(self, time: datetime,
-                      account_ids: List[str]) -> Tuple[Money, Error]:
-        """Sum the balances at a given time of the accounts listed.
+                      category: AccountCategory) -> Tuple[Money, Error]:
+        """Sum the balances at a given time of the accounts in a category.
+
+        The balances are read from the cached roll-ups of the top level
+        accounts of the category, see `Ledger.subtree_balances`.
 
         Args:
             time: the time of the balance
-            account_ids: the accounts to sum
+            category: the category of the accounts to sum
 
         Returns:
             The sum.
         """
         total = Money(0, self.accounting_currency)
-        for account_id in account_ids:
-            result = self.ledger.balance_as_of_date(time, account_id)
+        for account_id in self._root_ids_by_category[category]:
+            result = self.ledger.subtree_balance_in(
+                self.accounting_currency, self.fx_rates, time, account_id)
             if not result.is_ok():
                 return total, result.err()
             total += result.ok()
         return total, ok()
 
-    def _income_taxes_paid(self, start: datetime, end: datetime) -> Money:
+    def _in_accounting_currency(self, money: Money,
+                                time: datetime) -> Tuple[Money, Error]:
+        """Translate a journal amount into the accounting currency.
+
+        Args:
+            money: the amount
+            time: the time of the exchange rate
+
+        Returns:
+            The translated amount, or the amount itself with an error if no
+            exchange rate is known.
+        """
+        if money.currency() is self.accounting_currency:
+            return money, ok()
+        result = self.fx_rates.convert(money, self.accounting_currency, time)
+        if not result.is_ok():
+            return money, Error("no exchange rate from {} at {}".format(
+                money.currency().code(), time))
+        return result.ok(), ok()
+
+    def _archived_movements(self, start: datetime,
+                            end: datetime) -> Tuple[CashMovements, Error]:
+        """Get the cash movements of the closed periods within a period.
+
+        Args:
+            start: the start of the period
+            end: the end of the period
+
+        Returns:
+            The income taxes paid, cash receipts and cash disbursements of
+            the archived transactions, zero with an error if the start or
+            end is inside a closed period.
+        """
+        zero = Money(0.0, self.accounting_currency)
+        movements = self.closed_periods.movements(start, end)
+        if movements is None:
+            return (zero, zero, zero), Error(
+                "the time is inside a closed period")
+        return movements, ok()
+
+    def _income_taxes_paid(self, start: datetime,
+                           end: datetime) -> Tuple[Money, Error]:
         """Calculate the income taxes paid.
 
         This looks for entries that reduce income taxes receivable.
@@ -397,18 +968,55 @@ class Book:
             end: the end time in which to look
 
         Returns:
-            The income taxes paid in the period.
+            The income taxes paid in the period, or an error if an amount in
+            another currency has no exchange rate.
         """
         ret = Money(0.0, self.accounting_currency)
-        for transaction in self.journal.transactions:
-            if transaction.time() < start or transaction.time() > end:
-                continue
+        for transaction in self.journal.transactions_between(start, end):
             for entry in transaction.entries():
-                if entry.account_id() in self._income_taxes_payable_ids and entry.is_debit():
-                    ret += entry.amount()
-        return ret
+                if self._category_by_id.get(entry.account_id()) is \
+                        AccountCategory.IncomeTaxesPayable and entry.is_debit():
+                    amount, err = self._in_accounting_currency(
+                        entry.amount(), transaction.time())
+                    if not err.is_ok():
+                        return ret, err
+                    ret += amount
+        return ret, ok()
+
+    def _cash_diff(self,
+                   transaction: JournalTransaction) -> Tuple[Money, Error]:
+        """Calculate the change in cash of a transaction.
+
+        Cash moved to or from capital stock, borrowing, income taxes or
+        fixed assets is not counted.
+
+        Args:
+            transaction: the transaction
 
-    def _cash_receipts(self, start: datetime, end: datetime) -> Money:
+        Returns:
+            The change, or an error if an amount in another currency has no
+            exchange rate.
+        """
+        cash_diff = Money(0, self.accounting_currency)
+        capital_and_borrowing_diff = Money(0, self.accounting_currency)
+        for entry in transaction.entries():
+            category = self._category_by_id.get(entry.account_id())
+            if category is not AccountCategory.Cash and \
+                    category not in CAPITAL_AND_BORROWING_CATEGORIES:
+                continue
+            amount, err = self._in_accounting_currency(
+                entry.amount(), transaction.time())
+            if not err.is_ok():
+                return cash_diff, err
+            factor = 1.0 if entry.is_debit() else -1.0
+            if category is AccountCategory.Cash:
+                cash_diff += amount.scale(factor)
+            else:
+                capital_and_borrowing_diff += amount.scale(factor)
+        return cash_diff + capital_and_borrowing_diff, ok()
+
+    def _cash_receipts(self, start: datetime,
+                       end: datetime) -> Tuple[Money, Error]:
         """Calculate the cash receipts for a period.
 
         Cash receipts are anything that increases cash that is not
@@ -419,31 +1027,20 @@ class Book:
             end: the end of the period
 
         Returns:
-            The cash receipts in the period.
+            The cash receipts in the period, or an error if an amount in
+            another currency has no exchange rate.
         """
         ret = Money(0.0, self.accounting_currency)
-        negative_sum = self._capital_stock_ids + \
-            self._long_term_debt_ids + \
-            self._current_portion_of_debt_ids + \
-            self._income_taxes_payable_ids + \
-            self._fixed_assets_at_cost_ids
-        for transaction in self.journal.transactions:
-            if transaction.time() < start or transaction.time() > end:
-                continue
-            cash_diff = Money(0, self.accounting_currency)
-            capital_and_borrowing_diff = Money(0, self.accounting_currency)
-            for entry in transaction.entries():
-                if entry.account_id() in self._cash_account_ids:
-                    cash_diff += entry.amount().scale(1.0 if entry.is_debit() else -1.0)
-                elif entry.account_id() in negative_sum:
-                    factor = 1.0 if entry.is_debit() else -1.0
-                    capital_and_borrowing_diff += entry.amount().scale(factor)
-            diff = cash_diff + capital_and_borrowing_diff
+        for transaction in self.journal.transactions_between(start, end):
+            diff, err = self._cash_diff(transaction)
+            if not err.is_ok():
+                return ret, err
             if diff.quantity() > 0.0:
                 ret += diff
-        return ret
+        return ret, ok()
 
-    def _cash_disbursements(self, start: datetime, end: datetime) -> Money:
+    def _cash_disbursements(self, start: datetime,
+                            end: datetime) -> Tuple[Money, Error]:
         """Calculate the cash disbursements for a period.
 
         Cash disbursements are all cash payments other than paying off
@@ -454,48 +1051,65 @@ class Book:
             end: the end of the period
 
         Returns:
-            The cash receipts in the period.
+            The cash disbursements in the period, or an error if an amount
+            in another currency has no exchange rate.
         """
         ret = Money(0.0, self.accounting_currency)
-        negative_sum = self._capital_stock_ids + \
-            self._long_term_debt_ids + \
-            self._current_portion_of_debt_ids + \
-            self._income_taxes_payable_ids + \
-            self._fixed_assets_at_cost_ids
-        for transaction in self.journal.transactions:
-            if transaction.time() < start or transaction.time() > end:
-                continue
-            cash_diff = Money(0, self.accounting_currency)
-            capital_and_borrowing_diff = Money(0, self.accounting_currency)
-            for entry in transaction.entries():
-                if entry.account_id() in self._cash_account_ids:
-                    cash_diff += entry.amount().scale(1.0 if entry.is_debit() else -1.0)
-                elif entry.account_id() in negative_sum:
-                    capital_and_borrowing_diff += entry.amount().scale(
-                        1.0 if entry.is_debit() else -1.0)
-            diff = cash_diff + capital_and_borrowing_diff
+        for transaction in self.journal.transactions_between(start, end):
+            diff, err = self._cash_diff(transaction)
+            if not err.is_ok():
+                return ret, err
             if diff.quantity() < 0.0:
                 ret += diff.scale(-1.0)
-        return ret
+        return ret, ok()
 
-    def add_account(self, name: str, is_asset: bool) -> AccountId:
+    def add_account(self, name: str, category: AccountCategory,
+                    currency: Optional[Currency] = None,
+                    is_asset_account: Optional[bool] = None) -> AccountId:
         """Add a new account to the book.
 
         Args:
             name: the human-readable name of the account
-            is_asset: whether or not the account represents an asset.
-                If the account represents an asset, then the balance of the
-                account is added to the balance sheet. Otherwise, the account represents
-                liabilities and the value is subtracted from the balance sheet.
+            category: the statement line the account rolls up to
+            currency: the currency of the account, US dollars by default.
+                Statements translate its balance into the accounting
+                currency, see set_exchange_rate.
+            is_asset_account: whether the balance of the account is its
+                debits less its credits, like an asset, or its credits less
+                its debits, like a liability. By default this follows the
+                category, see `is_asset`.
 
         Returns:
             The id for the new account.
         """
+        if is_asset_account is None:
+            is_asset_account = is_asset(category)
         new_id = self.__new_account_id()
-        assert self.ledger.add_account(Account(name, is_asset, new_id)).is_ok()
-        self._cash_account_ids.append(new_id)
+        account = Account(name, is_asset_account, new_id,
+                          columnar=self._columnar)
+        if currency is not None:
+            account.set_starting_balance(account.init_datetime,
+                                         Money(0, currency))
+        assert self.ledger.add_account(account).is_ok()
+        self._register(new_id, category)
+        self._track_account(category, new_id)
         return new_id
 
+    def account_category(self,
+                         account_id: AccountId) -> Result[AccountCategory]:
+        """Get the category of an account.
+
+        Args:
+            account_id: the id of the account
+
+        Returns:
+            The category, or an error if the account is not in the book.
+        """
+        category = self._category_by_id.get(account_id)
+        if category is None:
+            return Result(err=Error("account not found"))
+        return Result(ok=category)
+
     def list_accounts(self, timestamp: datetime) -> List[AccountMetadata]:
         """List all of the accounts on the ledger.
 
@@ -510,22 +1124,52 @@ class Book:
         self.push()
         return self.ledger.list_accounts(timestamp)
 
-    def add_cash_account(self, name: str) -> str:
-        """Add a cash account to the list of accounts.
+    def trial_balance(
+            self, time: Optional[datetime] = None) -> Result[TrialBalance]:
+        """Get the debit and credit totals of every account at a time.
 
-        TODO(gs): Similar account adding methods should be made
-        for other types of accounts.
+        This pushes all journaled transactions first. Every total is read
+        from the running totals the accounts keep as entries are pushed: all
+        of them for the current totals, when `time` is None or after the
+        last transaction, or those before `time` found by binary search.
+        Starting balances are not included, but the entries of closed
+        periods are, see `close_period`.
+
+        Args:
+            time: count the entries strictly before this time, by default
+                every entry
+
+        Returns:
+            The totals of each account and the grand totals, or an error if
+            the time is inside a closed period, other than at one of its
+            boundaries.
+        """
+        last_cutoff = self.closed_periods.last_cutoff()
+        if time is not None and last_cutoff is not None and \
+                time < last_cutoff and \
+                time not in self.closed_periods.boundaries():
+            return Result(err=Error("the time is inside a closed period"))
+        self.push()
+        if time is not None and self.journal.transactions and \
+                time > self.journal.transactions[-1].time():
+            return Result(ok=TrialBalance(
+                time, self.ledger.trial_balance().lines))
+        return Result(ok=self.ledger.trial_balance(time))
+
+    def add_cash_account(self, name: str,
+                         currency: Optional[Currency] = None) -> str:
+        """Add a cash account to the list of accounts.
 
         Args:
             name: name of the account
+            currency: the currency of the account, US dollars by default.
+                Statements translate its balance into the accounting
+                currency, see set_exchange_rate.
 
         Returns:
             The id of the new account.
         """
-        new_id = self.__new_account_id()
-        assert self.ledger.add_account(Account(name, True, new_id)).is_ok()
-        self._cash_account_ids.append(new_id)
-        return new_id
+        return self.add_account(name, AccountCategory.Cash, currency)
 
     def add_research_and_development_account(self, name: str) -> str:
         """Add a research and development account.
@@ -536,10 +1180,53 @@ class Book:
         Returns:
             The id of the new account.
         """
+        return self.add_account(name, AccountCategory.ResearchAndDevelopment)
+
+    def add_sub_account(self, name: str, parent_id: AccountId,
+                        currency: Optional[Currency] = None) -> Result[AccountId]:
+        """Add an account under another account in the chart of accounts.
+
+        The new account has the category of its parent, and its balance
+        rolls up into the parent's line of the statements through the
+        parent, e.g. "Cash", "Bank A", "Operating".
+
+        Args:
+            name: the human-readable name of the account
+            parent_id: the id of the parent account
+            currency: the currency of the account, US dollars by default
+
+        Returns:
+            The id for the new account, or an error if the parent is not in
+            the book.
+        """
+        category = self._category_by_id.get(parent_id)
+        if category is None:
+            return Result(err=Error("parent account not found"))
+        parent = self.ledger.get_account(parent_id).ok()
         new_id = self.__new_account_id()
-        assert self.ledger.add_account(Account(name, True, new_id)).is_ok()
-        self._research_and_development_ids.append(new_id)
-        return new_id
+        account = Account(name, parent.is_asset, new_id,
+                          columnar=self._columnar)
+        if currency is not None:
+            account.set_starting_balance(account.init_datetime,
+                                         Money(0, currency))
+        assert self.ledger.add_account(account, parent_id).is_ok()
+        self._register(new_id, category, is_root=False)
+        self._track_account(category, new_id)
+        return Result(ok=new_id)
+
+    def _register(self, account_id: AccountId, category: AccountCategory,
+                  is_root: bool = True) -> None:
+        """Record the category of an account.
+
+        Args:
+            account_id: the id of the account
+            category: the category of the account
+            is_root: False if the account has a parent account
+        """
+        self._category_by_id[account_id] = category
+        self._ids_by_category[category].append(account_id)
+        if is_root:
+            self._root_ids_by_category[category].append(account_id)
 
 
 # id getters
@@ -669,3 +1356,62 @@ def default_retained_earnings_id() -> str:
         "retained-earnings"
     """
     return "retained-earnings"
+
+
+# The title, id and category of the accounts every book starts with.
+# the lists of account ids of each category in books pickled by the first
+# release, see Book.__setstate__
+_LEGACY_CATEGORY_IDS: List[Tuple[str, AccountCategory]] = [
+    ("_cash_account_ids", AccountCategory.Cash),
+    ("_accounts_receivable_ids", AccountCategory.AccountsReceivable),
+    ("_inventory_ids", AccountCategory.Inventory),
+    ("_prepaid_expenses_ids", AccountCategory.PrepaidExpenses),
+    ("_other_assets_ids", AccountCategory.OtherAssets),
+    ("_fixed_assets_at_cost_ids", AccountCategory.FixedAssetsAtCost),
+    ("_accumulated_depreciation_ids",
+     AccountCategory.AccumulatedDepreciation),
+    ("_accounts_payable_ids", AccountCategory.AccountsPayable),
+    ("_accrued_expenses_ids", AccountCategory.AccruedExpenses),
+    ("_current_portion_of_debt_ids", AccountCategory.CurrentPortionOfDebt),
+    ("_income_taxes_payable_ids", AccountCategory.IncomeTaxesPayable),
+    ("_long_term_debt_ids", AccountCategory.LongTermDebt),
+    ("_capital_stock_ids", AccountCategory.CapitalStock),
+    ("_retained_earnings_ids", AccountCategory.RetainedEarnings),
+    ("_sales_account_ids", AccountCategory.Sales),
+    ("_cost_of_goods_sold_ids", AccountCategory.CostOfGoodsSold),
+    ("_sales_and_marketing_ids", AccountCategory.SalesAndMarketing),
+    ("_research_and_development_ids", AccountCategory.ResearchAndDevelopment),
+    ("_interest_income_ids", AccountCategory.InterestIncome),
+    ("_general_and_administrative_ids",
+     AccountCategory.GeneralAndAdministrative),
+]
+
+_DEFAULT_ACCOUNTS: List[Tuple[str, AccountId, AccountCategory]] = [
+    # Assets
+    ("Cash", default_cash_id(), AccountCategory.Cash),
+    ("Accounts Receivable", default_accounts_receivable_id(),
+     AccountCategory.AccountsReceivable),
+    ("Inventory", default_inventory_id(), AccountCategory.Inventory),
+    ("Prepaid Expenses", default_prepaid_expenses_id(),
+     AccountCategory.PrepaidExpenses),
+    ("Other Assets", default_other_assets_id(), AccountCategory.OtherAssets),
+    ("Fixed Assets at Cost", default_fixed_assets_at_cost_id(),
+     AccountCategory.FixedAssetsAtCost),
+    ("Accumulated Depreciation", default_accumulated_depreciation_id(),
+     AccountCategory.AccumulatedDepreciation),
+    # Liabilities
+    ("Accounts Payable", default_accounts_payable_id(),
+     AccountCategory.AccountsPayable),
+    ("Accrued Expenses", default_accrued_expenses_id(),
+     AccountCategory.AccruedExpenses),
+    ("Current Portion of Debt", default_current_portion_of_debt_id(),
+     AccountCategory.CurrentPortionOfDebt),
+    ("Income Taxes Payable", default_income_taxes_payable_id(),
+     AccountCategory.IncomeTaxesPayable),
+    ("Long Term Debt", default_long_term_debt_id(),
+     AccountCategory.LongTermDebt),
+    ("Capital Stock", default_capital_stock_id(),
+     AccountCategory.CapitalStock),
+    ("Retained Earnings", default_retained_earnings_id(),
+     AccountCategory.RetainedEarnings),
+]
@@ -1,11 +1,16 @@
 """The module wallet.accounting.test_book test the Book implementation."""
 from datetime import datetime, timedelta
+from random import Random
+from typing import List
 
-from zeppelin_cash.accounting.book import Book, default_cash_id, default_capital_stock_id
+from zeppelin_cash.accounting.account_category import AccountCategory
+from zeppelin_cash.accounting.book import Book, default_cash_id, default_capital_stock_id, default_inventory_id
 from zeppelin_cash.accounting.journal_transaction import JournalTransaction
 from zeppelin_cash.accounting.journal_entry import JournalEntry
 from zeppelin_cash.accounting.money import Money
 from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.iso4217 import currency_by_code
+from zeppelin_cash.accounting.sample_book import random_book
 
 
 def test_book_init() -> None:
@@ -135,3 +140,487 @@ def test_income_statement() -> None:
     assert is_result.is_ok()
     income_statement = is_result.ok()
     assert income_statement.research_and_development.quantity() == 100000
+
+
+def test_columnar_book() -> None:
+    """Check that a book with columnar accounts gives the same statements."""
+    start = datetime.now()
+    end = start + timedelta(seconds=4)
+    books = [Book(start), Book(start, columnar=True)]
+    for book in books:
+        rnd_id = book.add_research_and_development_account("Prototype shop")
+        err = book.add_transaction(
+            JournalTransaction(
+                start + timedelta(seconds=1),
+                "Investing some cash",
+                [JournalEntry(default_capital_stock_id(), False, Money(1000000, usd())),
+                 JournalEntry(default_cash_id(), True, Money(1000000, usd()))]))
+        assert err.is_ok()
+        err = book.add_transaction(
+            JournalTransaction(
+                start + timedelta(seconds=2),
+                "Paying for a prototype",
+                [JournalEntry(default_cash_id(), False, Money(100000, usd())),
+                 JournalEntry(rnd_id, True, Money(100000, usd()))]))
+        assert err.is_ok()
+    statements = [book.financial_statement(start, end) for book in books]
+    assert all(result.is_ok() for result in statements)
+    assert str(statements[0].ok()) == str(statements[1].ok())
+
+
+def test_statement_cache() -> None:
+    """Check that cached statements are reused until a posting changes them."""
+    start = datetime.now()
+    book = Book(start)
+    book.enable_statement_cache(max_size=8)
+    err = book.add_transaction(
+        JournalTransaction(
+            start + timedelta(seconds=1),
+            "Investing some cash",
+            [JournalEntry(default_capital_stock_id(), False, Money(1000000, usd())),
+             JournalEntry(default_cash_id(), True, Money(1000000, usd()))]))
+    assert err.is_ok()
+    early = start + timedelta(seconds=2)
+    late = start + timedelta(seconds=4)
+    first = book.financial_statement(start, early)
+    assert first.is_ok()
+    assert book.financial_statement(start, early) is first
+    assert book.balance_sheet(late).ok().cash.quantity() == 1000000
+    assert book.cash_flow_statement(start, late).is_ok()
+    assert book.income_statement(start, late).is_ok()
+    stats = book.statement_cache_stats()
+    assert stats is not None
+    assert (stats.hits, stats.misses, stats.size) == (1, 4, 4)
+    # Paying cash after the early window only invalidates the later windows.
+    rnd_id = book.add_research_and_development_account("Prototype shop")
+    stats = book.statement_cache_stats()
+    assert stats is not None and stats.size == 0
+    assert book.financial_statement(start, early) is not first
+    first = book.financial_statement(start, early)
+    err = book.add_transaction(
+        JournalTransaction(
+            start + timedelta(seconds=3),
+            "Paying for a prototype",
+            [JournalEntry(default_cash_id(), False, Money(100000, usd())),
+             JournalEntry(rnd_id, True, Money(100000, usd()))]))
+    assert err.is_ok()
+    assert book.financial_statement(start, early) is first
+    assert book.balance_sheet(late).ok().cash.quantity() == 900000
+    # So does a batch of postings after it.
+    sheet = book.balance_sheet(late)
+    assert book.add_transactions([
+        JournalTransaction(
+            late + timedelta(seconds=seconds),
+            "Paying for parts",
+            [JournalEntry(default_cash_id(), False, Money(1000, usd())),
+             JournalEntry(rnd_id, True, Money(1000, usd()))])
+        for seconds in [1, 2]]).is_ok()
+    assert book.financial_statement(start, early) is first
+    assert book.balance_sheet(late) is sheet
+    assert book.balance_sheet(late + timedelta(seconds=3)).ok().cash == \
+        Money(898000, usd())
+    book.disable_statement_cache()
+    assert book.statement_cache_stats() is None
+
+
+def test_balance_sheet_series() -> None:
+    """Check that a series of balance sheets matches the single sheets."""
+    start = datetime(2020, 1, 1)
+    book = random_book(start, 200)
+    times = [start + timedelta(seconds=seconds)
+             for seconds in range(0, 250, 7)]
+    result = book.balance_sheet_series(times)
+    assert result.is_ok()
+    sheets = result.ok()
+    assert len(sheets) == len(times)
+    for time, sheet in zip(times, sheets):
+        assert vars(sheet) == vars(book.balance_sheet(time).ok())
+    assert not book.balance_sheet_series(
+        [start - timedelta(seconds=1)]).is_ok()
+    balances = book.balances_at(times, default_inventory_id())
+    assert balances.is_ok()
+    assert [sheet.inventory for sheet in sheets] == balances.ok()
+
+
+def test_account_transactions() -> None:
+    """Check the transactions that touched an account in a time range."""
+    start = datetime(2020, 1, 1)
+    book = random_book(start, 200)
+    range_start = start + timedelta(seconds=50)
+    range_end = start + timedelta(seconds=120)
+    result = book.account_transactions(default_cash_id(), range_start,
+                                       range_end)
+    assert result.is_ok()
+    expected = [transaction for transaction in book.journal.transactions
+                if range_start <= transaction.time() <= range_end and any(
+                    entry.account_id() == default_cash_id()
+                    for entry in transaction.entries())]
+    assert expected
+    assert result.ok() == expected
+    assert not book.account_transactions("no-such-id", range_start,
+                                         range_end).is_ok()
+
+
+def test_foreign_currency_account() -> None:
+    """Check that balances in other currencies are translated."""
+    start = datetime(2020, 1, 1)
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    book = Book(start)
+    book.enable_statement_cache()
+    book.enable_live_statements(start)
+    euro_id = book.add_cash_account("Euro account", eur)
+    account = book.ledger.get_account(euro_id).ok()
+    account.set_starting_balance(account.init_datetime, Money(100, eur))
+    first = start + timedelta(days=1)
+    second = start + timedelta(days=2)
+    assert not book.balance_sheet(first).is_ok()
+    assert not book.financial_statement(start, first).is_ok()
+    assert book.set_exchange_rate(eur, usd(), first, 1.1).is_ok()
+    assert book.set_exchange_rate(eur, usd(), second, 1.2).is_ok()
+    assert book.balance_sheet(first).ok().cash == Money(110, usd())
+    assert book.balance_sheet(second).ok().cash == Money(120, usd())
+    statement = book.financial_statement(first, second).ok()
+    assert statement.balance_sheet.cash == Money(120, usd())
+    assert statement.cash_flow_statement.beginning_cash_balance == \
+        Money(110, usd())
+    sheets = book.balance_sheet_series([first, second]).ok()
+    assert [sheet.cash for sheet in sheets] == [Money(110, usd()),
+                                                Money(120, usd())]
+
+
+def test_postings_in_other_currencies() -> None:
+    """Check that accounts hold postings in several currencies."""
+    start = datetime(2020, 1, 1)
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    book = Book(start)
+    book.enable_live_statements(start)
+    assert book.add_transaction(
+        JournalTransaction(
+            start + timedelta(seconds=1),
+            "Investing some cash",
+            [JournalEntry(default_capital_stock_id(), False, Money(1000, usd())),
+             JournalEntry(default_cash_id(), True, Money(1000, usd()))])).is_ok()
+    assert book.add_transaction(
+        JournalTransaction(
+            start + timedelta(seconds=2),
+            "Investing some euros",
+            [JournalEntry(default_capital_stock_id(), False, Money(500, eur)),
+             JournalEntry(default_cash_id(), True, Money(500, eur))])).is_ok()
+    time = start + timedelta(seconds=3)
+    assert not book.balance_sheet(time).is_ok()
+    assert book.set_exchange_rate(eur, usd(), start, 1.1).is_ok()
+    sheet = book.balance_sheet(time).ok()
+    assert sheet.cash == Money(1550, usd())
+    assert sheet.shareholders_equity() == Money(1550, usd())
+    assert book.balance_sheet_series([time]).ok()[0].cash == Money(1550, usd())
+    cash = book.ledger.get_account(default_cash_id()).ok()
+    assert cash.balances() == {"USD": Money(1000, usd()),
+                               "EUR": Money(500, eur)}
+
+
+def test_missing_exchange_rate() -> None:
+    """Check that cash movements without an exchange rate are an error."""
+    start = datetime(2020, 1, 1)
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    book = Book(start)
+    cash_id = book.add_cash_account("Euro account", eur)
+    stock_id = book.add_account("Euro stock", AccountCategory.CapitalStock,
+                                eur)
+    deposit = start + timedelta(seconds=1)
+    for time, is_debit in [(deposit, True),
+                           (start + timedelta(seconds=2), False)]:
+        assert book.add_transaction(JournalTransaction(
+            time, "Investing some euros",
+            [JournalEntry(stock_id, not is_debit, Money(500, eur)),
+             JournalEntry(cash_id, is_debit, Money(500, eur))])).is_ok()
+    end = start + timedelta(seconds=3)
+    # the balances are back to zero, which needs no rate
+    assert book.balance_sheet(end).is_ok()
+    message = "no exchange rate from EUR at {}".format(deposit)
+    assert book.cash_flow_statement(start, end).err().message() == message
+    assert book.financial_statement(start, end).err().message() == message
+    assert book.set_exchange_rate(eur, usd(), start, 1.1).is_ok()
+    statement = book.cash_flow_statement(start, end).ok()
+    assert statement.cash_receipts == Money(0, usd())
+    assert book.financial_statement(start, end).is_ok()
+
+
+def test_add_account_by_category() -> None:
+    """Check that new accounts roll up to the line of their category."""
+    start = datetime(2020, 1, 1)
+    book = Book(start)
+    sales_id = book.add_account("Online sales", AccountCategory.Sales)
+    receivable_id = book.add_account("Invoices",
+                                     AccountCategory.AccountsReceivable)
+    assert book.account_category(sales_id).ok() == AccountCategory.Sales
+    assert book.account_category(default_cash_id()).ok() == \
+        AccountCategory.Cash
+    assert not book.account_category("no-such-id").is_ok()
+    assert not book.ledger.get_account(sales_id).ok().is_asset
+    assert book.ledger.get_account(receivable_id).ok().is_asset
+    assert book.add_transaction(
+        JournalTransaction(
+            start + timedelta(seconds=1),
+            "Selling on credit",
+            [JournalEntry(sales_id, False, Money(250, usd())),
+             JournalEntry(receivable_id, True, Money(250, usd()))])).is_ok()
+    end = start + timedelta(seconds=2)
+    statement = book.income_statement(start, end).ok()
+    assert statement.net_sales == Money(250, usd())
+    sheet = book.balance_sheet(end).ok()
+    assert sheet.accounts_receivable == Money(250, usd())
+    assert sheet.cash == Money(0, usd())
+    engine_statement = book.financial_statement(start, end).ok()
+    assert engine_statement.income_statement.net_sales == Money(250, usd())
+
+
+def test_sub_accounts() -> None:
+    """Check that sub-accounts roll up into their parent's statement line."""
+    start = datetime(2020, 1, 1)
+    book = Book(start)
+    bank_id = book.add_sub_account("Bank A", default_cash_id()).ok()
+    operating_id = book.add_sub_account("Operating", bank_id).ok()
+    assert not book.add_sub_account("Orphan", "no-such-id").is_ok()
+    assert book.account_category(operating_id).ok() == AccountCategory.Cash
+    for seconds, amount in [(1, 1000), (3, 500)]:
+        assert book.add_transaction(
+            JournalTransaction(
+                start + timedelta(seconds=seconds),
+                "Investing some cash",
+                [JournalEntry(default_capital_stock_id(), False,
+                              Money(amount, usd())),
+                 JournalEntry(operating_id, True,
+                              Money(amount, usd()))])).is_ok()
+        time = start + timedelta(seconds=seconds + 1)
+        sheet = book.balance_sheet(time).ok()
+        assert sheet.cash == book.financial_statement(
+            start, time).ok().balance_sheet.cash
+    assert book.balance_sheet(start + timedelta(seconds=2)).ok().cash == \
+        Money(1000, usd())
+    assert book.balance_sheet(start + timedelta(seconds=4)).ok().cash == \
+        Money(1500, usd())
+
+
+def test_foreign_sub_accounts() -> None:
+    """Check that foreign sub-accounts are translated one by one."""
+    start = datetime(2020, 1, 1)
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    book = Book(start)
+    for k in range(3):
+        account_id = book.add_sub_account(
+            "Euro account {}".format(k), default_cash_id(), eur).ok()
+        account = book.ledger.get_account(account_id).ok()
+        account.set_starting_balance(account.init_datetime,
+                                     Money(0.01, eur))
+    assert book.set_exchange_rate(eur, usd(), start, 1.5).is_ok()
+    time = start + timedelta(seconds=1)
+    sheet = book.balance_sheet(time).ok()
+    assert sheet.cash == Money(0.06, usd())
+    assert str(sheet) == str(
+        book.financial_statement(start, time).ok().balance_sheet)
+    assert str(sheet) == str(book.balance_sheet_series([time]).ok()[0])
+
+
+def test_add_transactions() -> None:
+    """Check that a batch gives the same book as adding one at a time."""
+    start = datetime(2020, 1, 1)
+    source = random_book(start, 300)
+    book = Book(start)
+    book.add_cash_account("Savings")
+    book.add_research_and_development_account("Lab")
+    book.add_research_and_development_account("Shop")
+    book.enable_live_statements(start)
+    assert book.add_transactions(source.journal.transactions[:100]).is_ok()
+    assert book.add_transactions(
+        iter(source.journal.transactions[100:])).is_ok()
+    end = start + timedelta(seconds=400)
+    assert str(book.balance_sheet(end).ok()) == \
+        str(source.balance_sheet(end).ok())
+    assert str(book.financial_statement(start, end).ok()) == \
+        str(source.financial_statement(start, end).ok())
+    # a batch with an unknown account is rolled back, a backdated one is
+    # inserted
+    good = JournalTransaction(
+        end, "Investing some cash",
+        [JournalEntry(default_capital_stock_id(), False, Money(10, usd())),
+         JournalEntry(default_cash_id(), True, Money(10, usd()))])
+    unknown = JournalTransaction(
+        end, "Paying someone",
+        [JournalEntry("no-such-id", False, Money(10, usd())),
+         JournalEntry(default_cash_id(), True, Money(10, usd()))])
+    early = JournalTransaction(
+        start, "Investing early",
+        [JournalEntry(default_capital_stock_id(), False, Money(10, usd())),
+         JournalEntry(default_cash_id(), True, Money(10, usd()))])
+    assert not book.add_transactions([good, unknown]).is_ok()
+    assert len(book.journal.transactions) == 300
+    assert book.add_transactions([good, early]).is_ok()
+    assert source.add_transaction(good).is_ok()
+    assert source.add_transaction(early).is_ok()
+    later = end + timedelta(seconds=1)
+    assert str(book.balance_sheet(later).ok()) == \
+        str(source.balance_sheet(later).ok())
+
+
+def test_backdated_transactions() -> None:
+    """Check that transactions added out of order give the same book."""
+    start = datetime(2020, 1, 1)
+    source = random_book(start, 300)
+    shuffled = list(source.journal.transactions)
+    Random(5).shuffle(shuffled)
+    end = start + timedelta(seconds=400)
+    times = [start + timedelta(seconds=seconds) for seconds in [50, 200, 400]]
+    for lazy in [False, True]:
+        book = Book(start)
+        book.add_cash_account("Savings")
+        book.add_research_and_development_account("Lab")
+        book.add_research_and_development_account("Shop")
+        book.enable_statement_cache()
+        if lazy:
+            book.enable_lazy_push()
+        for transaction in shuffled[:150]:
+            assert book.add_transaction(transaction).is_ok()
+        # reading a statement fills the cache, which backdating must clear
+        assert book.balance_sheet(end).is_ok()
+        assert book.add_transactions(shuffled[150:]).is_ok()
+        assert book.journal.transactions == sorted(
+            book.journal.transactions, key=lambda t: t.time())
+        for time in times:
+            assert str(book.balance_sheet(time).ok()) == \
+                str(source.balance_sheet(time).ok())
+        assert book.balances_at(times, default_cash_id()).ok() == \
+            source.balances_at(times, default_cash_id()).ok()
+        assert str(book.financial_statement(start, end).ok()) == \
+            str(source.financial_statement(start, end).ok())
+
+
+def test_lazy_push() -> None:
+    """Check that accounts are only brought up to date when read."""
+    start = datetime(2020, 1, 1)
+    eager = random_book(start, 300)
+    book = Book(start)
+    book.add_cash_account("Savings")
+    book.add_research_and_development_account("Lab")
+    book.add_research_and_development_account("Shop")
+    book.enable_lazy_push()
+    for transaction in eager.journal.transactions[:200]:
+        assert book.add_transaction(transaction).is_ok()
+    assert book.add_transactions(eager.journal.transactions[200:]).is_ok()
+    cash = book.ledger.get_account(default_cash_id()).ok()
+    inventory = book.ledger.get_account(default_inventory_id()).ok()
+    assert len(cash.debits) + len(cash.credits) == 0
+    end = start + timedelta(seconds=400)
+    times = [start + timedelta(seconds=100), end]
+    assert book.balances_at(times, default_cash_id()).ok() == \
+        eager.balances_at(times, default_cash_id()).ok()
+    num_entries = len(cash.debits) + len(cash.credits)
+    assert num_entries > 0
+    assert len(inventory.debits) + len(inventory.credits) == 0
+    # each entry is pushed once
+    assert book.balances_at(times, default_cash_id()).is_ok()
+    assert len(cash.debits) + len(cash.credits) == num_entries
+    assert str(book.financial_statement(start, end).ok()) == \
+        str(eager.financial_statement(start, end).ok())
+    assert len(inventory.debits) + len(inventory.credits) > 0
+    assert len(cash.debits) + len(cash.credits) == num_entries
+    # live statements still see every transaction as it is added
+    book.enable_live_statements(start)
+    transaction = JournalTransaction(
+        end, "Investing some cash",
+        [JournalEntry(default_capital_stock_id(), False, Money(10, usd())),
+         JournalEntry(default_cash_id(), True, Money(10, usd()))])
+    assert book.add_transaction(transaction).is_ok()
+    assert eager.add_transaction(transaction).is_ok()
+    later = end + timedelta(seconds=1)
+    assert str(book.balance_sheet(later).ok()) == \
+        str(eager.balance_sheet(later).ok())
+    book.disable_lazy_push()
+    assert not book.journal.un_pushed_transactions()
+
+
+def test_trial_balance() -> None:
+    """Check that a trial balance matches the account balances."""
+    start = datetime(2020, 1, 1)
+    book = random_book(start, 300)
+    book.enable_lazy_push()
+    assert book.add_transaction(JournalTransaction(
+        start + timedelta(seconds=50), "Investing some cash",
+        [JournalEntry(default_capital_stock_id(), False, Money(10, usd())),
+         JournalEntry(default_cash_id(), True, Money(10, usd()))])).is_ok()
+    for time in [start + timedelta(seconds=100), None]:
+        trial_balance = book.trial_balance(time).ok()
+        assert trial_balance.is_balanced()
+        metadata = book.list_accounts(
+            time or start + timedelta(seconds=400))
+        assert len(trial_balance.lines) == len(metadata)
+        for line, account in zip(trial_balance.lines, metadata):
+            assert line.account_id == account.account_id
+            assert account.balance == (
+                line.net() if account.is_asset else line.net().scale(-1.0))
+    later = book.trial_balance(start + timedelta(seconds=400)).ok()
+    assert [line.debits for line in later.lines] == [
+        line.debits for line in book.trial_balance().ok().lines]
+
+
+def test_close_period() -> None:
+    """Check that statements over closed periods are kept."""
+    start = datetime(2020, 1, 1)
+    first_cutoff = start + timedelta(seconds=100)
+    second_cutoff = start + timedelta(seconds=200)
+    end = start + timedelta(seconds=400)
+    source = random_book(start, 300)
+    for columnar in [False, True]:
+        book = random_book(start, 300, columnar=columnar)
+        closed = book.journal.transactions_between(
+            start, second_cutoff - timedelta(seconds=1))
+        archived: List[JournalTransaction] = []
+        if columnar:
+            book.enable_lazy_push()
+        assert book.close_period(first_cutoff).is_ok()
+        assert book.close_period(second_cutoff, archived.extend).is_ok()
+        assert not book.close_period(first_cutoff).is_ok()
+        assert book.journal.transactions[0].time() >= second_cutoff
+        assert book.closed_periods.transactions + archived == closed
+        times = [start, first_cutoff, second_cutoff, end]
+        for time in times:
+            assert str(book.balance_sheet(time).ok()) == \
+                str(source.balance_sheet(time).ok())
+        for k, period_start in enumerate(times):
+            for period_end in times[k:]:
+                assert str(book.financial_statement(
+                    period_start, period_end).ok()) == \
+                    str(source.financial_statement(
+                        period_start, period_end).ok())
+                assert str(book.cash_flow_statement(
+                    period_start, period_end).ok()) == \
+                    str(source.cash_flow_statement(
+                        period_start, period_end).ok())
+                assert str(book.income_statement(
+                    period_start, period_end).ok()) == \
+                    str(source.income_statement(
+                        period_start, period_end).ok())
+        inside = start + timedelta(seconds=150)
+        assert not book.balance_sheet(inside).is_ok()
+        assert not book.financial_statement(start, inside).is_ok()
+        assert not book.cash_flow_statement(inside, end).is_ok()
+        transaction = JournalTransaction(
+            inside, "Investing some cash",
+            [JournalEntry(default_capital_stock_id(), False, Money(10, usd())),
+             JournalEntry(default_cash_id(), True, Money(10, usd()))])
+        assert not book.add_transaction(transaction).is_ok()
+        assert not book.add_transactions([transaction]).is_ok()
+        assert book.enable_live_statements(first_cutoff).is_ok()
+        assert str(book.income_statement(first_cutoff, end).ok()) == \
+            str(source.income_statement(first_cutoff, end).ok())
+        assert book.is_valid(audit=True)
+        # the closed entries are still in the trial balance
+        for trial_time in [start, first_cutoff, second_cutoff, end, None]:
+            assert [(line.account_id, line.debits, line.credits)
+                    for line in book.trial_balance(trial_time).ok().lines] == [
+                (line.account_id, line.debits, line.credits)
+                for line in source.trial_balance(trial_time).ok().lines]
+        assert not book.trial_balance(inside).is_ok()
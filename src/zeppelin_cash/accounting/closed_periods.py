@@ -0,0 +1,202 @@
+"""The module wallet.accounting.closed_periods contains the ClosedPeriods
+implementation."""
+from bisect import bisect_left
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.journal_transaction import JournalTransaction
+from zeppelin_cash.accounting.money import Money
+
+# The income taxes paid, cash receipts and cash disbursements of a period.
+CashMovements = Tuple[Money, Money, Money]
+
+
+class ClosedPeriods:
+    """ClosedPeriods keeps what statements need from the closed periods.
+
+    Closing a period, see `Book.close_period`, moves the transactions before
+    a cutoff out of the journal. Balances are kept by the accounts
+    themselves, see `Account.close`. The cash movements, which are summed
+    from the transactions, are kept here: for each period boundary, the
+    total of the archived transactions strictly before it and up to and
+    including it. Together with the journal, these give the cash movements
+    of any period whose start and end are not strictly inside a closed
+    period.
+
+    The archived transactions themselves are kept in `transactions`, unless
+    they are handed to a cold archive when the period is closed.
+    """
+
+    def __init__(self, start_time: datetime, currency: Currency) -> None:
+        """Create a new ClosedPeriods instance with no closed period.
+
+        Args:
+            start_time: the start of the book, the first period boundary
+            currency: the accounting currency
+        """
+        self.start_time = start_time
+        self.currency = currency
+        self.transactions: List[JournalTransaction] = []
+        self._boundaries: List[datetime] = []
+        # the cash movements of the archived transactions before, and up to
+        # and including, each boundary; None until the transactions at the
+        # boundary are archived
+        self._before: List[CashMovements] = []
+        self._through: List[Optional[CashMovements]] = []
+        # the time of the first archived transaction
+        self._first_time: Optional[datetime] = None
+
+    def last_cutoff(self) -> Optional[datetime]:
+        """Get the end of the last closed period.
+
+        Returns:
+            The time, or None if no period was closed.
+        """
+        return self._boundaries[-1] if self._boundaries else None
+
+    def boundaries(self) -> List[datetime]:
+        """Get the times at which balances are kept for the closed periods.
+
+        Returns:
+            The start of the book, unless it is after the first cutoff, and
+            the cutoffs, in ascending order.
+        """
+        return list(self._boundaries)
+
+    def close(self, cutoff: datetime, first_time: Optional[datetime],
+              movements: Callable[[datetime, datetime], CashMovements]) -> None:
+        """Record the cash movements of a new closed period.
+
+        This must be called before the transactions are removed from the
+        journal.
+
+        Args:
+            cutoff: the end of the period, after the last cutoff
+            first_time: the time of the first transaction in the journal
+            movements: gives the cash movements of the transactions in the
+                journal from a time to another, both inclusive
+        """
+        zero = self._zero()
+        start = self.last_cutoff()
+        if start is None and self.start_time < cutoff:
+            start = self.start_time
+            self._boundaries.append(start)
+            self._before.append(zero)
+            self._through.append(None)
+        before_cutoff = self._before[-1] if self._before else zero
+        if first_time is not None:
+            if start is None:
+                before_cutoff = _minus(movements(first_time, cutoff),
+                                       movements(cutoff, cutoff))
+            else:
+                # only the first period has transactions before its start
+                before_start = _minus(movements(first_time, start),
+                                      movements(start, start))
+                self._before[-1] = _plus(self._before[-1], before_start)
+                self._through[-1] = _plus(self._before[-1],
+                                          movements(start, start))
+                before_cutoff = _plus(self._before[-1], _minus(
+                    movements(start, cutoff), movements(cutoff, cutoff)))
+        elif start is not None:
+            self._through[-1] = self._before[-1]
+        self._boundaries.append(cutoff)
+        self._before.append(before_cutoff)
+        self._through.append(None)
+
+    def archive(self, transactions: List[JournalTransaction],
+                cold_archive: Optional[Callable[[List[JournalTransaction]],
+                                                None]] = None) -> None:
+        """Archive the transactions of a closed period.
+
+        Args:
+            transactions: the transactions, in time order
+            cold_archive: if given, called with the transactions instead of
+                keeping them in `transactions`
+        """
+        if not transactions:
+            return
+        first_time = transactions[0].time()
+        if self._first_time is None or first_time < self._first_time:
+            self._first_time = first_time
+        if cold_archive is None:
+            self.transactions.extend(transactions)
+        else:
+            cold_archive(transactions)
+
+    def movements(self, start: datetime,
+                  end: datetime) -> Optional[CashMovements]:
+        """Get the cash movements of the archived transactions in a period.
+
+        Args:
+            start: the start of the period, inclusive
+            end: the end of the period, inclusive
+
+        Returns:
+            The income taxes paid, cash receipts and cash disbursements, or
+            None if the start or end is strictly inside a closed period.
+        """
+        if not self._boundaries or start > end:
+            return self._zero()
+        before_start = self._total(start, False)
+        through_end = self._total(end, True)
+        if before_start is None or through_end is None:
+            return None
+        return _minus(through_end, before_start)
+
+    def _total(self, time: datetime,
+               inclusive: bool) -> Optional[CashMovements]:
+        """Get the cash movements of the archived transactions before a time.
+
+        Args:
+            time: the time
+            inclusive: True to include the transactions at the time
+
+        Returns:
+            The totals, or None if the time is strictly inside a closed
+            period.
+        """
+        if time >= self._boundaries[-1]:
+            return self._before[-1]
+        if self._first_time is None or time < self._first_time or (
+                time == self._first_time and not inclusive):
+            return self._zero()
+        k = bisect_left(self._boundaries, time)
+        if k == len(self._boundaries) or self._boundaries[k] != time:
+            return None
+        return self._through[k] if inclusive else self._before[k]
+
+    def _zero(self) -> CashMovements:
+        """Get no cash movements.
+
+        Returns:
+            Zero income taxes paid, cash receipts and cash disbursements.
+        """
+        zero = Money(0.0, self.currency)
+        return (zero, zero, zero)
+
+
+def _plus(first: CashMovements, second: CashMovements) -> CashMovements:
+    """Add two sets of cash movements.
+
+    Args:
+        first: the first
+        second: the second
+
+    Returns:
+        The sums.
+    """
+    return (first[0] + second[0], first[1] + second[1], first[2] + second[2])
+
+
+def _minus(first: CashMovements, second: CashMovements) -> CashMovements:
+    """Subtract two sets of cash movements.
+
+    Args:
+        first: the first
+        second: the one to subtract
+
+    Returns:
+        The differences.
+    """
+    return (first[0] - second[0], first[1] - second[1], first[2] - second[2])
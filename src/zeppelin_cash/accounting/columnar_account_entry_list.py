@@ -0,0 +1,175 @@
+"""The module wallet.accounting.columnar_account_entry_list contains the
+ColumnarAccountEntryList implementation."""
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, List, Optional, Sequence
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.account_entry_store import AccountEntryStore
+from zeppelin_cash.accounting.backdated_entries import BackdatedEntries
+from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.money import Money
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(time: datetime) -> int:
+    """Convert a time to microseconds since the epoch.
+
+    Naive times are measured from a naive epoch, so they round trip
+    without being shifted into any timezone.
+
+    Args:
+        time: the time to convert
+
+    Returns:
+        The number of microseconds since the epoch.
+    """
+    if time.tzinfo is None:
+        return (time - _EPOCH) // _MICROSECOND
+    return (time - _EPOCH_UTC) // _MICROSECOND
+
+
+class ColumnarAccountEntryList(AccountEntryStore):
+    """A ColumnarAccountEntryList stores account entries in packed arrays.
+
+    Rather than an AccountEntry, a datetime, a Money and a Currency object
+    per entry, each entry takes one slot in each of four typed arrays: the
+    time in epoch microseconds (int64), the amount and the running total in
+    fractional currency units (int64), and an index into a small table of
+    the currencies seen.
+    Entries are only rebuilt as AccountEntry objects when they are read,
+    so existing code that iterates over `Account.debits` or `Account.credits`
+    keeps working.
+
+    The store holds one timezone: the one of the first entry. Entries are
+    handed back in that timezone.
+
+    Backdated entries are kept apart as objects, see `BackdatedEntries`, and
+    merged in when the entries are read. The columns only hold the entries
+    appended in time order.
+    """
+
+    def __init__(self) -> None:
+        """Create a new, empty ColumnarAccountEntryList instance."""
+        self._times = array("q")
+        self._amounts = array("q")
+        # self._totals[k] is the sum of the first k + 1 amounts.
+        self._totals = array("q")
+        self._currency_indices = array("H")
+        self._currencies: List[Currency] = []
+        self._currency_index_by_code: Dict[str, int] = {}
+        self._tzinfo: Optional[tzinfo] = None
+        self._backdated = BackdatedEntries()
+        # all of the entries in time order, once there are backdated ones
+        self._merged: Optional[List[AccountEntry]] = None
+
+    def append(self, entry: AccountEntry) -> None:
+        time = entry.time()
+        amount = entry.amount()
+        if len(self._times) == 0:
+            self._tzinfo = time.tzinfo
+        currency = amount.currency()
+        currency_index = self._currency_index_by_code.get(currency.code())
+        if currency_index is None:
+            currency_index = len(self._currencies)
+            self._currencies.append(currency)
+            self._currency_index_by_code[currency.code()] = currency_index
+        total = self._totals[-1] if self._totals else 0
+        self._times.append(_to_micros(time))
+        self._amounts.append(amount.minor_units())
+        self._totals.append(total + amount.minor_units())
+        self._currency_indices.append(currency_index)
+        self._merged = None
+
+    def insert(self, entry: AccountEntry) -> None:
+        self._backdated.insert(entry)
+        self._merged = None
+
+    def last_time(self) -> Optional[datetime]:
+        return self._from_micros(self._times[-1]) if self._times else None
+
+    def total(self) -> int:
+        total = self._totals[-1] if self._totals else 0
+        return total + self._backdated.total()
+
+    def total_before(self, time: datetime) -> int:
+        count = bisect_left(self._times, _to_micros(time))
+        total = self._totals[count - 1] if count > 0 else 0
+        return total + self._backdated.total_before(time)
+
+    def totals_before(self, times: List[datetime]) -> List[int]:
+        ret = []
+        count = 0
+        for time in times:
+            count = bisect_left(self._times, _to_micros(time), count)
+            total = self._totals[count - 1] if count > 0 else 0
+            ret.append(total + self._backdated.total_before(time))
+        return ret
+
+    def time_column(self) -> memoryview:
+        """Get the entry times without copying them.
+
+        Backdated entries are not in the column.
+
+        Returns:
+            A read-only view of the times, in microseconds since the epoch.
+        """
+        return memoryview(self._times).toreadonly()
+
+    def amount_column(self) -> memoryview:
+        """Get the entry amounts without copying them.
+
+        Backdated entries are not in the column.
+
+        Returns:
+            A read-only view of the amounts, in fractional currency units.
+        """
+        return memoryview(self._amounts).toreadonly()
+
+    def minor_units(self) -> Sequence[int]:
+        if self._backdated:
+            return [entry.amount().minor_units() for entry in self]
+        return self.amount_column()
+
+    def _from_micros(self, micros: int) -> datetime:
+        """Convert microseconds since the epoch back into a time.
+
+        Args:
+            micros: the number of microseconds since the epoch
+
+        Returns:
+            The time, in the timezone of the store.
+        """
+        if self._tzinfo is None:
+            return _EPOCH + timedelta(microseconds=micros)
+        return (_EPOCH_UTC + timedelta(microseconds=micros)
+                ).astimezone(self._tzinfo)
+
+    def __len__(self) -> int:
+        return len(self._times) + len(self._backdated)
+
+    def __getitem__(self, index: int) -> AccountEntry:
+        if self._backdated:
+            if self._merged is None:
+                self._merged = self._backdated.merge(
+                    self._appended(k) for k in range(len(self._times)))
+            return self._merged[index]
+        return self._appended(index)
+
+    def _appended(self, index: int) -> AccountEntry:
+        """Rebuild one of the entries appended in time order.
+
+        Args:
+            index: the position of the entry in the columns
+
+        Returns:
+            The entry.
+        """
+        currency = self._currencies[self._currency_indices[index]]
+        return AccountEntry(self._from_micros(self._times[index]),
+                            Money.from_minor_units(self._amounts[index],
+                                                   currency))
@@ -0,0 +1,46 @@
+"""Test the ColumnarAccountEntryList implementation."""
+from datetime import datetime, timedelta, timezone
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.america import ars, usd
+from zeppelin_cash.accounting.columnar_account_entry_list import ColumnarAccountEntryList
+from zeppelin_cash.accounting.money import Money
+
+
+def test_columnar_account_entry_list() -> None:
+    """Check that entries round trip through the packed arrays."""
+    start = datetime.now()
+    entries = ColumnarAccountEntryList()
+    assert len(entries) == 0
+    assert entries.last_time() is None
+    assert entries.total() == 0
+    for k in range(1, 5):
+        entries.append(AccountEntry(start + timedelta(seconds=k),
+                                    Money(10 * k, usd())))
+    entries.append(AccountEntry(start + timedelta(seconds=5),
+                                Money(0.25, ars())))
+    assert len(entries) == 5
+    assert entries[0].time() == start + timedelta(seconds=1)
+    assert entries[0].amount() == Money(10, usd())
+    assert entries[-1].amount() == Money(0.25, ars())
+    assert [entry.amount().quantity()
+            for entry in entries] == [10, 20, 30, 40, 0.25]
+    assert entries.last_time() == start + timedelta(seconds=5)
+    # the totals and amounts are in cents
+    assert entries.total_before(start + timedelta(seconds=2)) == 1000
+    assert entries.total_before(start + timedelta(seconds=2.5)) == 3000
+    assert list(entries.time_column())[1] - \
+        list(entries.time_column())[0] == 1000000
+    assert list(entries.amount_column()) == [1000, 2000, 3000, 4000, 25]
+
+
+def test_columnar_timezones() -> None:
+    """Check that timezone aware times are handed back unchanged."""
+    zone = timezone(timedelta(hours=-5))
+    start = datetime(2020, 3, 1, 12, 30, tzinfo=zone)
+    entries = ColumnarAccountEntryList()
+    entries.append(AccountEntry(start, Money(1, usd())))
+    assert entries[0].time() == start
+    assert entries[0].time().utcoffset() == timedelta(hours=-5)
+    assert entries.total_before(start) == 0
+    assert entries.total_before(start + timedelta(microseconds=1)) == 100
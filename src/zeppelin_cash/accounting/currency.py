@@ -1,12 +1,25 @@
 """The module wallet.accounting.currency contains the Currency class implementation."""
+from typing import Any, Dict, Optional, Tuple
 
 
 class Currency:
     """Currency encapsulates a *type* of physical cash.
 
     Examples could be US dollars or Kenyan shillings.
+
+    Currencies are immutable. Use `shared_currency` to get the one instance
+    of a currency that is shared by the whole process, so that money in the
+    same currency can be compared by identity.
     """
     # pylint: disable=R0913
+    __slots__ = ("_name", "_code", "_numeric_code", "_symbol",
+                 "_fraction_symbol", "_fractions_per_unit")
+    _name: str
+    _code: str
+    _numeric_code: int
+    _symbol: str
+    _fraction_symbol: str
+    _fractions_per_unit: int
 
     def __init__(
             self,
@@ -27,12 +40,51 @@ class Currency:
             fractions_per_unit: the number of the fraction unit in the currency,
                 e.g. 100 cents in a US dollar
         """
-        self.__name = name
-        self.__code = code
-        self.__numeric_code = numeric_code
-        self.__symbol = symbol
-        self.__fraction_symbol = fraction_symbol
-        self.__fractions_per_unit = fractions_per_unit
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_code", code)
+        object.__setattr__(self, "_numeric_code", numeric_code)
+        object.__setattr__(self, "_symbol", symbol)
+        object.__setattr__(self, "_fraction_symbol", fraction_symbol)
+        object.__setattr__(self, "_fractions_per_unit", fractions_per_unit)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse to modify the currency.
+
+        Raises:
+            AttributeError: always, currencies are immutable
+        """
+        raise AttributeError("Currency is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse to modify the currency.
+
+        Raises:
+            AttributeError: always, currencies are immutable
+        """
+        raise AttributeError("Currency is immutable")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the currency so that it is shared again when unpickled.
+
+        Returns:
+            The arguments to `shared_currency` for this currency.
+        """
+        return (shared_currency, (self._name, self._code, self._numeric_code,
+                                  self._symbol, self._fraction_symbol,
+                                  self._fractions_per_unit))
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a currency pickled before currencies were shared.
+
+        Such a pickle holds the attributes as `_Currency__name` and so on.
+        The currency is restored as a separate instance with the same
+        attributes; money unpickled with it uses the shared instance.
+
+        Args:
+            state: the legacy attribute dict
+        """
+        for slot in Currency.__slots__:
+            object.__setattr__(self, slot, state["_Currency_" + slot])
 
     def name(self) -> str:
         """Get the name of the currency.
@@ -40,7 +92,7 @@ class Currency:
         Returns:
             The name of the currency, e.g. "US dollar".
         """
-        return self.__name
+        return self._name
 
     def code(self) -> str:
         """Get the ISO 4217 three letter code for the currency.
@@ -48,7 +100,7 @@ class Currency:
         Returns:
             The ISO code for the currency, e.g. USD.
         """
-        return self.__code
+        return self._code
 
     def numeric_code(self) -> int:
         """Get the ISO 4217 numeric code.
@@ -56,7 +108,7 @@ class Currency:
         Returns:
             The ISO code for the currency, e.g. 840 for USD.
         """
-        return self.__numeric_code
+        return self._numeric_code
 
     def symbol(self) -> str:
         """Get the symbol for the currency, e.g. "$" for USD.
@@ -64,7 +116,7 @@ class Currency:
         Returns:
             The symbol for the currency.
         """
-        return self.__symbol
+        return self._symbol
 
     def fraction_symbol(self) -> str:
         """Get the symbol used for fractions of the currency, e.g. "¢" for USD.
@@ -72,7 +124,7 @@ class Currency:
         Returns:
             The fraction symbol for the currency.
         """
-        return self.__fraction_symbol
+        return self._fraction_symbol
 
     def fractions_per_unit(self) -> int:
         """Get the number of fractional parts are in the currency, e.g. 100 cents in 1 USD.
@@ -80,4 +132,79 @@ class Currency:
         Returns:
             The number in the fractional part of the currency.
         """
-        return self.__fractions_per_unit
+        return self._fractions_per_unit
+
+
+# The shared currencies, by ISO 4217 code.
+_SHARED_CURRENCIES: Dict[str, Currency] = {}
+
+
+def shared_currency(
+        name: str,
+        code: str,
+        numeric_code: int = 0,
+        symbol: str = "",
+        fraction_symbol: str = "",
+        fractions_per_unit: int = 100) -> Currency:
+    """Get the shared instance of a currency.
+
+    The first call for a code creates the currency, and every later call for
+    that code returns the same instance, whatever its name, symbols and
+    numeric code. The number of fractional units must agree, since money
+    is kept in fractional units.
+
+    Args:
+        name: the name of the currency
+        code: the three letter ISO 4217 code, e.g. USD
+        numeric_code: the numeric ISO 4217 code
+        symbol: the currency's symbol, e.g. "$" for USD
+        fraction_symbol: the fractional symbol for the currency, e.g. "¢" for USD
+        fractions_per_unit: the number of the fraction unit in the currency,
+            e.g. 100 cents in a US dollar
+
+    Returns:
+        The shared Currency instance for the code.
+
+    Raises:
+        ValueError: if the currency was created with another number of
+            fractional units
+    """
+    currency = _SHARED_CURRENCIES.get(code)
+    if currency is None:
+        currency = Currency(name, code, numeric_code, symbol, fraction_symbol,
+                            fractions_per_unit)
+        _SHARED_CURRENCIES[code] = currency
+    elif currency.fractions_per_unit() != fractions_per_unit:
+        raise ValueError("{} has {} fractional units, not {}".format(
+            code, currency.fractions_per_unit(), fractions_per_unit))
+    return currency
+
+
+def shared_instance(currency: Currency) -> Currency:
+    """Get the shared instance of a currency's code.
+
+    This is for currencies that were created on their own, e.g. unpickled
+    from before currencies were shared.
+
+    Args:
+        currency: the currency
+
+    Returns:
+        The shared Currency instance for its code, see `shared_currency`.
+    """
+    return shared_currency(currency.name(), currency.code(),
+                           currency.numeric_code(), currency.symbol(),
+                           currency.fraction_symbol(),
+                           currency.fractions_per_unit())
+
+
+def find_shared_currency(code: str) -> Optional[Currency]:
+    """Get the shared instance of a currency, if it has been created.
+
+    Args:
+        code: the three letter ISO 4217 code, e.g. USD
+
+    Returns:
+        The shared Currency instance, or None.
+    """
+    return _SHARED_CURRENCIES.get(code)
@@ -0,0 +1,70 @@
+"""Test the Currency implementation."""
+import pickle
+
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.currency import Currency, find_shared_currency, shared_currency
+from zeppelin_cash.accounting.money import Money
+
+
+def test_shared_currency() -> None:
+    """Check that there is one shared instance per currency code."""
+    assert usd() is usd()
+    assert find_shared_currency("USD") is usd()
+    assert shared_currency("Another dollar", "USD") is usd()
+    assert usd().name() == "US dollar"
+    assert find_shared_currency("XTT") is None
+    test_currency = shared_currency("Test currency", "XTT",
+                                    fractions_per_unit=1000)
+    assert find_shared_currency("XTT") is test_currency
+    assert test_currency.fractions_per_unit() == 1000
+
+
+def test_immutable() -> None:
+    """Check that a currency cannot be modified."""
+    currency = Currency("Test currency", "XTS")
+    for attempt in [lambda: setattr(currency, "_code", "USD"),
+                    lambda: setattr(currency, "extra", 1),
+                    lambda: delattr(currency, "_code")]:
+        try:
+            attempt()
+            assert False
+        except AttributeError:
+            pass
+    assert currency.code() == "XTS"
+
+
+def test_pickle() -> None:
+    """Check that unpickled currencies are the shared instances."""
+    amounts = [Money(k, usd()) for k in range(100)]
+    data = pickle.dumps(amounts)
+    assert data.count(b"US dollar") == 1
+    for amount in pickle.loads(data):
+        assert amount.currency() is usd()
+
+
+# [Money(12.34, usd), Money(-5, usd)] pickled before money was kept in
+# fractional units and currencies were shared
+_LEGACY_PICKLE = (
+    b"\x80\x02]q\x00(czeppelin_cash.accounting.money\nMoney\nq\x01)\x81q\x02"
+    b"}q\x03(X\x10\x00\x00\x00_Money__quantityq\x04G@(\xae\x14z\xe1G\xae"
+    b"X\x10\x00\x00\x00_Money__currencyq\x05"
+    b"czeppelin_cash.accounting.currency\nCurrency\nq\x06)\x81q\x07}q\x08("
+    b"X\x0f\x00\x00\x00_Currency__nameq\tX\t\x00\x00\x00US dollarq\n"
+    b"X\x0f\x00\x00\x00_Currency__codeq\x0bX\x03\x00\x00\x00USDq\x0c"
+    b"X\x17\x00\x00\x00_Currency__numeric_codeq\rMH\x03"
+    b"X\x11\x00\x00\x00_Currency__symbolq\x0eX\x01\x00\x00\x00$q\x0f"
+    b"X\x1a\x00\x00\x00_Currency__fraction_symbolq\x10"
+    b"X\x02\x00\x00\x00\xc2\xa2q\x11"
+    b"X\x1d\x00\x00\x00_Currency__fractions_per_unitq\x12Kdububh\x01)\x81"
+    b"q\x13}q\x14(h\x04J\xfb\xff\xff\xffh\x05h\x07ube.")
+
+
+def test_legacy_pickle() -> None:
+    """Check that money pickled in the legacy format can be loaded."""
+    amounts = pickle.loads(_LEGACY_PICKLE)
+    assert [amount.minor_units() for amount in amounts] == [1234, -500]
+    for amount in amounts:
+        assert amount.currency() is usd()
+    again = pickle.loads(pickle.dumps(amounts))
+    assert again == amounts
+    assert again[0].currency() is usd()
@@ -0,0 +1,264 @@
+"""The module wallet.accounting.fx_rates contains the FxRateTable
+implementation."""
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.errors import Error, ok, Result
+
+# (base currency code, quote currency code)
+CurrencyPair = Tuple[str, str]
+
+
+class _RateSeries:
+    """The rates of one currency pair, in time order."""
+
+    def __init__(self) -> None:
+        """Create a new, empty _RateSeries instance."""
+        self.times: List[datetime] = []
+        self.rates: List[float] = []
+
+    def add(self, time: datetime, rate: float) -> None:
+        """Add a rate, replacing any rate at the same time.
+
+        Args:
+            time: the time the rate takes effect
+            rate: the rate
+        """
+        position = bisect_right(self.times, time)
+        if position > 0 and self.times[position - 1] == time:
+            self.rates[position - 1] = rate
+            return
+        self.times.insert(position, time)
+        self.rates.insert(position, rate)
+
+    def position(self, time: datetime, lo: int = 0) -> int:
+        """Find the rate in effect at a time.
+
+        Args:
+            time: the time
+            lo: a position known to be at or before the result
+
+        Returns:
+            The position of the last rate at or before the time, or -1 if
+            there is none.
+        """
+        return bisect_right(self.times, time, max(lo, 0)) - 1
+
+
+class FxRateTable:
+    """An FxRateTable stores exchange rates by currency pair and time.
+
+    A rate from a base currency to a quote currency is the number of units
+    of the quote currency one unit of the base currency buys. It is in
+    effect from its time until the next rate of the pair. Rates are looked
+    up with a binary search, and a rate of the opposite pair is used,
+    inverted, when the pair has none.
+
+    Recent lookups can be kept in a least recently used cache, which is
+    cleared whenever a rate is added.
+    """
+
+    def __init__(self, cache_size: int = 0) -> None:
+        """Create a new, empty FxRateTable instance.
+
+        Args:
+            cache_size: the number of lookups to cache, 0 for no cache
+        """
+        self._series: Dict[CurrencyPair, _RateSeries] = {}
+        self._cache_size = cache_size
+        self._cache: 'OrderedDict[Tuple[str, str, datetime], float]' = OrderedDict(
+        )
+
+    def set_rate(self, base: Currency, quote: Currency, time: datetime,
+                 rate: float) -> Error:
+        """Set the exchange rate of a currency pair from a time on.
+
+        Args:
+            base: the currency being bought
+            quote: the currency it is paid for in
+            time: the time the rate takes effect
+            rate: the units of the quote currency per unit of the base
+                currency
+
+        Returns:
+            An error if the rate is not positive or the currencies are the
+            same.
+        """
+        if rate <= 0.0:
+            return Error("exchange rates must be positive")
+        if base.code() == quote.code():
+            return Error("cannot set an exchange rate for a single currency")
+        pair = (base.code(), quote.code())
+        series = self._series.get(pair)
+        if series is None:
+            series = _RateSeries()
+            self._series[pair] = series
+        series.add(time, rate)
+        self._cache.clear()
+        return ok()
+
+    def rate(self, base: Currency, quote: Currency,
+             time: datetime) -> Result[float]:
+        """Get the exchange rate of a currency pair as of a time.
+
+        Args:
+            base: the currency being bought
+            quote: the currency it is paid for in
+            time: the time
+
+        Returns:
+            The units of the quote currency per unit of the base currency,
+            or an error if no rate is known at that time.
+        """
+        if base is quote or base.code() == quote.code():
+            return Result(ok=1.0)
+        key = (base.code(), quote.code(), time)
+        rate = self._cache.get(key)
+        if rate is not None:
+            self._cache.move_to_end(key)
+            return Result(ok=rate)
+        rate = self._find(base.code(), quote.code(), time)
+        if rate is None:
+            return Result(err=Error("no exchange rate from {} to {}".format(
+                base.code(), quote.code())))
+        if self._cache_size > 0:
+            self._cache[key] = rate
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return Result(ok=rate)
+
+    def convert(self, money: Money, currency: Currency,
+                time: datetime) -> Result[Money]:
+        """Convert money to another currency at the rate as of a time.
+
+        Args:
+            money: the money to convert
+            currency: the currency to convert it to
+            time: the time of the rate
+
+        Returns:
+            The converted money, rounded to the nearest fractional unit, or
+            an error if no rate is known.
+        """
+        result = self.rate(money.currency(), currency, time)
+        if not result.is_ok():
+            return Result(err=result.err())
+        return Result(ok=_converted(money, currency, result.ok()))
+
+    def convert_all(self, amounts: Sequence[Money], times: Sequence[datetime],
+                    currency: Currency) -> Result[List[Money]]:
+        """Convert many amounts to another currency in one pass.
+
+        Each amount is converted at the rate as of its own time. When the
+        times are ascending, as for the entries of an account, the rates of
+        each pair are walked forward rather than searched from the start.
+
+        Args:
+            amounts: the money to convert
+            times: the time of the rate for each amount
+            currency: the currency to convert the amounts to
+
+        Returns:
+            The converted money, or an error if a rate is not known.
+        """
+        assert len(amounts) == len(times)
+        code = currency.code()
+        # the series, whether it is inverted, the last position and time
+        # found, for each currency converted from
+        cursors: Dict[str, Tuple[Optional[_RateSeries], bool, int,
+                                 Optional[datetime]]] = {}
+        ret = []
+        for money, time in zip(amounts, times):
+            from_code = money.currency().code()
+            if from_code == code:
+                ret.append(money)
+                continue
+            cursor = cursors.get(from_code)
+            if cursor is None:
+                series = self._series.get((from_code, code))
+                inverted = series is None
+                if inverted:
+                    series = self._series.get((code, from_code))
+                cursor = (series, inverted, 0, None)
+            series, inverted, position, last_time = cursor
+            rate: Optional[float] = None
+            if series is not None:
+                if last_time is None or time < last_time:
+                    position = 0
+                position = series.position(time, position)
+                cursors[from_code] = (series, inverted, position, time)
+                if position >= 0:
+                    rate = series.rates[position]
+                    if inverted:
+                        rate = 1.0 / rate
+            if rate is None:
+                # the pair's rates start later, try the opposite pair
+                rate = self._find(from_code, code, time)
+            if rate is None:
+                return Result(err=Error("no exchange rate from {} to {}".format(
+                    from_code, code)))
+            ret.append(_converted(money, currency, rate))
+        return Result(ok=ret)
+
+    def convert_entries(self, entries: Iterable[AccountEntry],
+                        currency: Currency) -> Result[List[Money]]:
+        """Convert the amounts of account entries at the rates of their times.
+
+        Args:
+            entries: the entries, e.g. `Account.debits`
+            currency: the currency to convert the amounts to
+
+        Returns:
+            The converted amount of each entry, or an error if a rate is not
+            known.
+        """
+        entries = list(entries)
+        return self.convert_all([entry.amount() for entry in entries],
+                                [entry.time() for entry in entries], currency)
+
+    def _find(self, base_code: str, quote_code: str,
+              time: datetime) -> Optional[float]:
+        """Search for the rate of a pair, or the inverse of the opposite pair.
+
+        Args:
+            base_code: the code of the base currency
+            quote_code: the code of the quote currency
+            time: the time
+
+        Returns:
+            The rate, or None if neither pair has a rate as of the time.
+        """
+        series = self._series.get((base_code, quote_code))
+        if series is not None:
+            position = series.position(time)
+            if position >= 0:
+                return series.rates[position]
+        series = self._series.get((quote_code, base_code))
+        if series is not None:
+            position = series.position(time)
+            if position >= 0:
+                return 1.0 / series.rates[position]
+        return None
+
+
+def _converted(money: Money, currency: Currency, rate: float) -> Money:
+    """Convert money at a rate.
+
+    Args:
+        money: the money to convert
+        currency: the currency to convert it to
+        rate: the units of `currency` per unit of the money's currency
+
+    Returns:
+        The converted money, rounded to the nearest fractional unit.
+    """
+    from_fractions = money.currency().fractions_per_unit() or 1
+    to_fractions = currency.fractions_per_unit() or 1
+    return Money.from_minor_units(
+        round(money.minor_units() * rate * to_fractions / from_fractions),
+        currency)
@@ -0,0 +1,85 @@
+"""Test the FxRateTable implementation."""
+from datetime import datetime, timedelta
+
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.america import cad, usd
+from zeppelin_cash.accounting.fx_rates import FxRateTable
+from zeppelin_cash.accounting.iso4217 import currency_by_code
+from zeppelin_cash.accounting.money import Money
+
+
+def test_rate_as_of() -> None:
+    """Check that the rate in effect at a time is found."""
+    start = datetime(2020, 1, 1)
+    eur = currency_by_code("EUR")
+    assert eur is not None
+    for cache_size in [0, 2]:
+        rates = FxRateTable(cache_size)
+        assert rates.set_rate(eur, usd(), start + timedelta(days=2),
+                              1.25).is_ok()
+        assert rates.set_rate(eur, usd(), start, 1.1).is_ok()
+        assert not rates.set_rate(eur, usd(), start, 0.0).is_ok()
+        assert not rates.set_rate(eur, eur, start, 1.0).is_ok()
+        assert not rates.rate(eur, usd(), start - timedelta(days=1)).is_ok()
+        for _ in range(2):
+            assert rates.rate(eur, usd(), start).ok() == 1.1
+            assert rates.rate(
+                eur,
+                usd(),
+                start +
+                timedelta(
+                    days=1)).ok() == 1.1
+            assert rates.rate(
+                eur,
+                usd(),
+                start +
+                timedelta(
+                    days=2)).ok() == 1.25
+            assert rates.rate(usd(), eur, start + timedelta(days=3)).ok() == \
+                1.0 / 1.25
+            assert rates.rate(usd(), usd(), start).ok() == 1.0
+            assert not rates.rate(cad(), usd(), start).is_ok()
+        # replacing a rate drops the cached lookups
+        assert rates.set_rate(eur, usd(), start, 1.2).is_ok()
+        assert rates.rate(eur, usd(), start).ok() == 1.2
+
+
+def test_convert() -> None:
+    """Check single and batch conversions."""
+    start = datetime(2020, 1, 1)
+    eur = currency_by_code("EUR")
+    yen = currency_by_code("JPY")
+    assert eur is not None and yen is not None
+    rates = FxRateTable()
+    rates.set_rate(eur, usd(), start, 1.1)
+    rates.set_rate(eur, usd(), start + timedelta(days=1), 1.2)
+    rates.set_rate(usd(), yen, start, 150.0)
+    assert rates.convert(Money(10, eur), usd(), start).ok() == Money(11, usd())
+    assert rates.convert(Money(1.01, usd()), yen, start).ok() == \
+        Money(152, yen)
+    assert rates.convert(Money(300, yen), usd(), start).ok() == \
+        Money(2, usd())
+    assert not rates.convert(Money(1, cad()), usd(), start).is_ok()
+    times = [
+        start,
+        start +
+        timedelta(
+            days=1),
+        start,
+        start +
+        timedelta(
+            days=2)]
+    amounts = [Money(10, eur), Money(10, eur), Money(5, usd()),
+               Money(300, yen)]
+    converted = rates.convert_all(amounts, times, usd())
+    assert converted.ok() == [Money(11, usd()), Money(12, usd()),
+                              Money(5, usd()), Money(2, usd())]
+    for amount, time, result in zip(amounts, times, converted.ok()):
+        assert rates.convert(amount, usd(), time).ok() == result
+    assert not rates.convert_all([Money(1, eur)], [start - timedelta(days=1)],
+                                 usd()).is_ok()
+    entries = [AccountEntry(start + timedelta(hours=hours), Money(1, eur))
+               for hours in range(0, 48, 12)]
+    assert rates.convert_entries(entries, usd()).ok() == [
+        Money(1.1, usd()), Money(1.1, usd()), Money(1.2, usd()),
+        Money(1.2, usd())]
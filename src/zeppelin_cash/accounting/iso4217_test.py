@@ -0,0 +1,71 @@
+"""Test the ISO 4217 currency table."""
+from zeppelin_cash.accounting.america import clp, ttd, usd
+from zeppelin_cash.accounting.currency import shared_currency
+from zeppelin_cash.accounting.iso4217 import ISO_4217_TABLE, currency_by_code, currency_by_numeric_code
+from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.util import get_currency
+
+
+def test_table() -> None:
+    """Check that the table has no duplicate codes."""
+    codes = [row[0] for row in ISO_4217_TABLE]
+    numeric_codes = [row[1] for row in ISO_4217_TABLE]
+    assert len(set(codes)) == len(codes)
+    assert len(set(numeric_codes)) == len(numeric_codes)
+    assert all(len(code) == 3 and code.isupper() for code in codes)
+
+
+def test_lookup() -> None:
+    """Check the lookups by code and by numeric code."""
+    euro = currency_by_code("EUR")
+    assert euro is not None
+    assert euro.name() == "Euro"
+    assert euro.numeric_code() == 978
+    assert euro.symbol() == "€"
+    assert euro.fractions_per_unit() == 100
+    assert currency_by_numeric_code(978) is euro
+    yen = currency_by_code("JPY")
+    assert yen is not None
+    assert yen.fractions_per_unit() == 1
+    dinar = currency_by_code("KWD")
+    assert dinar is not None
+    assert dinar.fractions_per_unit() == 1000
+    assert currency_by_code("XAU") is currency_by_numeric_code(959)
+    assert currency_by_code("ABC") is None
+    assert currency_by_numeric_code(1) is None
+
+
+def test_america() -> None:
+    """Check that the American helpers are the table's currencies."""
+    assert currency_by_code("USD") is usd()
+    assert currency_by_numeric_code(840) is usd()
+    assert currency_by_code("TTD") is ttd()
+    assert currency_by_code("PEI") is not None
+    assert get_currency("USD") is usd()
+    assert get_currency("GBP").name() == "Pound Sterling"
+    assert get_currency("ABC").code() == "ABC"
+
+
+def test_minor_units() -> None:
+    """Check that the table's minor units win over other definitions."""
+    for row in ISO_4217_TABLE:
+        currency = currency_by_code(row[0])
+        assert currency is not None
+        assert currency.fractions_per_unit() == 10 ** (row[2] or 0)
+    assert clp().fractions_per_unit() == 1
+    assert str(Money(1500, clp())) == "1,500 CLP"
+    try:
+        shared_currency("Chilean peso", "CLP", fractions_per_unit=100)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_numeric_codes() -> None:
+    """Check that every currency is indexed under its own numeric code."""
+    for row in ISO_4217_TABLE:
+        currency = currency_by_numeric_code(row[1])
+        assert currency is not None
+        assert currency.numeric_code() == row[1]
+        assert currency.code() == row[0]
+    assert currency_by_numeric_code(780) is ttd()
@@ -1,56 +1,298 @@
 """The module wallet.accounting.journal contains the Journal class implementation."""
-from typing import List
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Sequence, Set, Tuple
 
 from zeppelin_cash.accounting.journal_transaction import JournalTransaction
 from zeppelin_cash.errors import Error, ok
 
 
 class Journal:
-    """This is the general journal."""
+    """This is the general journal.
+
+    `transactions` is kept in time order. A backdated transaction is
+    inserted after any transactions at the same time, and the journal also
+    remembers the order the transactions were added in, which is the order
+    they are pushed in.
+
+    Backdated transactions are held apart until the journal is next read in
+    time order, then merged into the time ordered lists in one pass. Adding
+    k of them to a journal of n transactions then takes O(n + k log k) time,
+    rather than k list insertions of O(n) each.
+    """
 
     def __init__(self) -> None:
         """Create a new Journal instance."""
-        self.transactions: List[JournalTransaction] = []
+        self._transactions: List[JournalTransaction] = []
+        # the time of each transaction, for binary searches
+        self._times: List[datetime] = []
+        # the transactions in the order they were added
+        self._added: List[JournalTransaction] = []
+        # the ascending positions in self._added of the transactions with an
+        # entry for each account id
+        self._postings: Dict[str, List[int]] = {}
+        # the times and transactions with an entry for each account id, in
+        # time order
+        self._account_times: Dict[str, List[datetime]] = {}
+        self._account_transactions: Dict[str, List[JournalTransaction]] = {}
+        # the backdated transactions not merged into the lists above yet, in
+        # the order they were added
+        self._backdated: List[JournalTransaction] = []
+        # the running totals of the debits and credits, in fractional units,
+        # per currency code
+        self._debit_totals: Dict[str, int] = {}
+        self._credit_totals: Dict[str, int] = {}
         self._pushed_index = 0
+        # bumped once every time transactions are added, one or a batch at
+        # a time, or removed
+        self.version = 0
+
+    @property
+    def transactions(self) -> List[JournalTransaction]:
+        """Get the transactions in time order.
+
+        Returns:
+            The journal's own list, which must only be changed by the
+            journal.
+        """
+        self._merge_backdated()
+        return self._transactions
 
     def add_transaction(self, transaction: JournalTransaction) -> Error:
         """Add a transaction to the journal.
 
-        This will fail if the transactions' associated times are not added in order.
+        A transaction dated before the last one is inserted in time order.
 
         Args:
-            transaction: the transaction to append.
+            transaction: the transaction to add.
 
         Returns:
             An error if an error occurs.
         """
         if not transaction.is_valid():
             return Error("invalid transaction")
-        len_tran = len(self.transactions)
-        if len_tran > 0:
-            if self.transactions[len_tran - 1].time() > transaction.time():
-                return Error("invalid transaction time")
-        self.transactions.append(transaction)
+        self._append(transaction)
+        self.version += 1
+        return ok()
+
+    def add_transactions(
+            self, transactions: Sequence[JournalTransaction]) -> Error:
+        """Add several transactions to the journal at once.
+
+        Every transaction is checked before any is added, so either all of
+        them are added or, if any is invalid, none is.
+
+        Args:
+            transactions: the transactions to add
+
+        Returns:
+            An error if any transaction cannot be added.
+        """
+        for transaction in transactions:
+            if not transaction.is_valid():
+                return Error("invalid transaction")
+        for transaction in transactions:
+            self._append(transaction)
+        if transactions:
+            self.version += 1
         return ok()
 
-    def is_valid(self) -> bool:
+    def _append(self, transaction: JournalTransaction) -> None:
+        """Add a checked transaction and index it.
+
+        Args:
+            transaction: the transaction
+        """
+        time = transaction.time()
+        backdated = bool(self._times) and time < self._times[-1]
+        if backdated:
+            self._backdated.append(transaction)
+        else:
+            self._times.append(time)
+            self._transactions.append(transaction)
+        transaction.set_journaled()
+        position = len(self._added)
+        self._added.append(transaction)
+        for entry in transaction.entries():
+            amount = entry.amount()
+            totals = self._debit_totals if entry.is_debit() \
+                else self._credit_totals
+            code = amount.currency().code()
+            totals[code] = totals.get(code, 0) + amount.minor_units()
+            account_id = entry.account_id()
+            postings = self._postings.setdefault(account_id, [])
+            # a transaction may have several entries for one account
+            if not postings or postings[-1] != position:
+                postings.append(position)
+                if not backdated:
+                    # the account's last transaction is no later
+                    self._account_times.setdefault(
+                        account_id, []).append(time)
+                    self._account_transactions.setdefault(
+                        account_id, []).append(transaction)
+
+    def _merge_backdated(self) -> None:
+        """Merge the backdated transactions into the time ordered lists."""
+        if not self._backdated:
+            return
+        backdated = sorted(self._backdated, key=lambda t: t.time())
+        self._backdated = []
+        self._times, self._transactions = _merged(
+            self._times, self._transactions, backdated)
+        by_account: Dict[str, List[JournalTransaction]] = {}
+        for transaction in backdated:
+            account_ids: Set[str] = set()
+            for entry in transaction.entries():
+                if entry.account_id() not in account_ids:
+                    account_ids.add(entry.account_id())
+                    by_account.setdefault(
+                        entry.account_id(), []).append(transaction)
+        for account_id, transactions in by_account.items():
+            times, merged = _merged(
+                self._account_times.get(account_id, []),
+                self._account_transactions.get(account_id, []), transactions)
+            self._account_times[account_id] = times
+            self._account_transactions[account_id] = merged
+
+    def remove_before(self, cutoff: datetime) -> List[JournalTransaction]:
+        """Remove the transactions before a time, e.g. to archive them.
+
+        The indices are rebuilt from the remaining transactions, which keep
+        the order they were added in and whether they were pushed.
+
+        Args:
+            cutoff: the time of the first transaction to keep
+
+        Returns:
+            The removed transactions, in time order.
+        """
+        self._merge_backdated()
+        count = bisect_left(self._times, cutoff)
+        if count == 0:
+            return []
+        removed = self.transactions[:count]
+        pushed = [transaction for transaction in self._added[:self._pushed_index]
+                  if transaction.time() >= cutoff]
+        un_pushed = [transaction
+                     for transaction in self._added[self._pushed_index:]
+                     if transaction.time() >= cutoff]
+        self._transactions = []
+        self._times = []
+        self._added = []
+        self._postings = {}
+        self._account_times = {}
+        self._account_transactions = {}
+        self._debit_totals = {}
+        self._credit_totals = {}
+        for transaction in pushed + un_pushed:
+            self._append(transaction)
+        self._pushed_index = len(pushed)
+        self.version += 1
+        return removed
+
+    def transactions_between(self, start: datetime,
+                             end: datetime) -> List[JournalTransaction]:
+        """Get the transactions in a time range.
+
+        The transactions are found by binary search, so this takes
+        O(log N + K) time for N transactions, K of them in the range.
+
+        Args:
+            start: the start of the range, inclusive
+            end: the end of the range, inclusive
+
+        Returns:
+            The transactions at or after `start` and at or before `end`, in
+            time order.
+        """
+        self._merge_backdated()
+        first = bisect_left(self._times, start)
+        last = bisect_right(self._times, end)
+        return self._transactions[first:last]
+
+    def transactions_for_account(
+            self, account_id: str, start: datetime,
+            end: datetime) -> List[JournalTransaction]:
+        """Get the transactions with an entry for an account in a time range.
+
+        The transactions are found from a per account index, so this takes
+        O(log K + M) time for K transactions of the account, M of them
+        matching.
+
+        Args:
+            account_id: the id of the account
+            start: the start of the range, inclusive
+            end: the end of the range, inclusive
+
+        Returns:
+            The matching transactions, in time order.
+        """
+        self._merge_backdated()
+        times = self._account_times.get(account_id, [])
+        first = bisect_left(times, start)
+        last = bisect_right(times, end)
+        return self._account_transactions[account_id][first:last] \
+            if times else []
+
+    def account_positions(self, account_id: str) -> List[int]:
+        """Get the positions of the transactions with an entry for an account.
+
+        The list is the journal's own index, so it must not be modified. It
+        grows as transactions are added.
+
+        Args:
+            account_id: the id of the account
+
+        Returns:
+            The ascending positions in the order the transactions were added,
+            see `added_transaction`.
+        """
+        return self._postings.get(account_id, [])
+
+    def added_transaction(self, position: int) -> JournalTransaction:
+        """Get a transaction by the order it was added in.
+
+        Args:
+            position: the number of transactions added before it
+
+        Returns:
+            The transaction.
+        """
+        return self._added[position]
+
+    def is_valid(self, audit: bool = False) -> bool:
         """Check if a Journal is valid.
 
+        Every transaction is checked when it is added, and the running debit
+        and credit totals are compared, so this takes O(1) time. Only a
+        change to the number of transactions in `transactions` is noticed,
+        e.g. one appended without `add_transaction`, and then every
+        transaction is checked again. Other changes, e.g. to the entries of
+        a journaled transaction, are only found in audit mode, which always
+        checks every transaction again.
+
+        Args:
+            audit: True to check every transaction again, see
+                `JournalTransaction.verify`
+
         Returns:
             True iff the transaction is valid.
         """
-        for transaction in self.transactions:
-            if not transaction.is_valid():
-                return False
-        return True
+        if audit or len(self.transactions) != len(self._added):
+            for transaction in self.transactions:
+                if not transaction.verify():
+                    return False
+            return True
+        return self._debit_totals == self._credit_totals
 
     def un_pushed_transactions(self) -> List[JournalTransaction]:
         """Get a list of all un-pushed transactions.
 
         Returns:
-            A list of all un-pushed transactions.
+            A list of all un-pushed transactions, in the order they were
+            added.
         """
-        return self.transactions[self._pushed_index:]
+        return self._added[self._pushed_index:]
 
     def have_pushed(self, num_pushed: int) -> Error:
         """Set some number of transactions to have been pushed.
@@ -61,8 +303,40 @@ class Journal:
         Returns:
             An error if the number pushed is greater than the number of un-pushed transactions.
         """
-        if num_pushed > len(self.transactions) - self._pushed_index:
+        if num_pushed > len(self._added) - self._pushed_index:
             return Error(
                 "the number pushed is greater than the number of un-pushed transactions")
         self._pushed_index += num_pushed
         return ok()
+
+
+def _merged(times: List[datetime], transactions: List[JournalTransaction],
+            backdated: List[JournalTransaction]
+            ) -> Tuple[List[datetime], List[JournalTransaction]]:
+    """Merge backdated transactions into a time ordered list.
+
+    Each backdated transaction goes after the transactions of the list at
+    its time, which were all added before it.
+
+    Args:
+        times: the time of each transaction in the list
+        transactions: the list
+        backdated: the backdated transactions, in time order
+
+    Returns:
+        The times and the transactions of the merged list.
+    """
+    merged_times: List[datetime] = []
+    merged: List[JournalTransaction] = []
+    k = 0
+    for transaction in backdated:
+        time = transaction.time()
+        last = bisect_right(times, time, k)
+        merged_times.extend(times[k:last])
+        merged.extend(transactions[k:last])
+        merged_times.append(time)
+        merged.append(transaction)
+        k = last
+    merged_times.extend(times[k:])
+    merged.extend(transactions[k:])
+    return merged_times, merged
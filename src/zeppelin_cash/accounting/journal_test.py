@@ -1,6 +1,6 @@
 """The module wallet.accounting.test_journal tests the Journal implementation."""
 from datetime import datetime, timedelta
-from random import randint
+from random import randint, Random
 
 from zeppelin_cash.accounting.america import usd
 from zeppelin_cash.accounting.journal import Journal
@@ -38,8 +38,8 @@ def test_journal() -> None:
     assert not journal.is_valid()
 
 
-def test_add_transaction_wrong_order() -> None:
-    """Test that adding a transaction fails if the times are in the wrong order."""
+def test_add_backdated_transaction() -> None:
+    """Test that a backdated transaction is inserted in time order."""
     journal = Journal()
     assert journal.is_valid()
     entries = [
@@ -65,8 +65,14 @@ def test_add_transaction_wrong_order() -> None:
         first_time, "Buy more equipment for cash", entries)
     assert transaction2.is_valid()
     err = journal.add_transaction(transaction2)
-    assert not err.is_ok()
+    assert err.is_ok()
     assert journal.is_valid()
+    assert journal.transactions == [transaction2, transaction1]
+    assert journal.un_pushed_transactions() == [transaction1, transaction2]
+    assert journal.transactions_for_account(
+        "equipment-id", first_time, second_time) == [transaction2, transaction1]
+    assert journal.account_positions("debt-id") == [0]
+    assert journal.added_transaction(1) is transaction2
 
 
 def test_transaction_publishing() -> None:
@@ -105,3 +111,150 @@ def test_transaction_publishing() -> None:
     assert len(unpublished) == num_transactions - 10
     err = journal.have_pushed(num_transactions)
     assert not err.is_ok()
+
+
+def test_transactions_between() -> None:
+    """Test that a time range returns the transactions within it."""
+    journal = Journal()
+    start = datetime(2020, 1, 1)
+    times = [start + timedelta(seconds=seconds)
+             for seconds in [1, 2, 2, 3, 5, 8]]
+    for time in times:
+        err = journal.add_transaction(JournalTransaction(
+            time, "Buy equipment for cash",
+            [JournalEntry("cash-id", False, Money(1000, usd())),
+             JournalEntry("equipment-id", True, Money(1000, usd()))]))
+        assert err.is_ok()
+    for first in range(10):
+        for last in range(10):
+            range_start = start + timedelta(seconds=first)
+            range_end = start + timedelta(seconds=last)
+            expected = [transaction for transaction in journal.transactions
+                        if range_start <= transaction.time() <= range_end]
+            assert journal.transactions_between(
+                range_start, range_end) == expected
+
+
+def test_transactions_for_account() -> None:
+    """Test that the account index matches a scan of the journal."""
+    journal = Journal()
+    start = datetime(2020, 1, 1)
+    account_ids = ["cash-id", "debt-id", "equipment-id"]
+    for seconds in range(30):
+        debit_id = account_ids[seconds % 3]
+        credit_id = account_ids[seconds % 2]
+        err = journal.add_transaction(JournalTransaction(
+            start + timedelta(seconds=seconds // 2), "transaction",
+            [JournalEntry(debit_id, True, Money(10, usd())),
+             JournalEntry(credit_id, False, Money(10, usd()))]))
+        assert err.is_ok()
+    for account_id in account_ids + ["other-id"]:
+        for first in range(0, 16, 3):
+            for last in range(first, 17, 4):
+                range_start = start + timedelta(seconds=first)
+                range_end = start + timedelta(seconds=last)
+                expected = [
+                    transaction for transaction in journal.transactions
+                    if range_start <= transaction.time() <= range_end and any(
+                        entry.account_id() == account_id
+                        for entry in transaction.entries())]
+                assert journal.transactions_for_account(
+                    account_id, range_start, range_end) == expected
+
+
+def test_add_transactions() -> None:
+    """Check that a batch of transactions is added entirely or not at all."""
+    start = datetime(2020, 1, 1)
+    journal = Journal()
+
+    def transfer(seconds: int, amount: int) -> JournalTransaction:
+        return JournalTransaction(
+            start + timedelta(seconds=seconds), "Transfer",
+            [JournalEntry("cash-id", False, Money(amount, usd())),
+             JournalEntry("equipment-id", True, Money(amount, usd()))])
+    assert journal.add_transactions([transfer(1, 10), transfer(2, 20)]).is_ok()
+    # the version is bumped once per batch
+    assert journal.version == 1
+    unbalanced = JournalTransaction(
+        start + timedelta(seconds=4), "Unbalanced",
+        [JournalEntry("equipment-id", True, Money(5, usd()))])
+    assert not journal.add_transactions(
+        [transfer(3, 30), unbalanced]).is_ok()
+    assert len(journal.transactions) == 2
+    assert journal.version == 1
+    assert journal.add_transactions([transfer(3, 30), transfer(2, 5)]).is_ok()
+    assert [transaction.time() for transaction in journal.transactions] == [
+        start + timedelta(seconds=seconds) for seconds in [1, 2, 2, 3]]
+    assert journal.transactions_for_account(
+        "cash-id", start, start + timedelta(seconds=3)) == journal.transactions
+
+
+def test_audit() -> None:
+    """Check that an audit checks every transaction again."""
+    start = datetime(2020, 1, 1)
+    journal = Journal()
+    for k in range(10):
+        assert journal.add_transaction(JournalTransaction(
+            start + timedelta(seconds=k), "Transfer",
+            [JournalEntry("cash-id", False, Money(k, usd())),
+             JournalEntry("equipment-id", True, Money(k, usd()))])).is_ok()
+    assert journal.is_valid()
+    assert journal.is_valid(audit=True)
+    # changing a journaled transaction is only caught by an audit
+    journal.transactions[3].entries().pop()
+    assert journal.is_valid()
+    assert not journal.is_valid(audit=True)
+
+
+def test_remove_before() -> None:
+    """Check that removing old transactions keeps the rest indexed."""
+    start = datetime(2020, 1, 1)
+    journal = Journal()
+    for k in [4, 1, 3, 0, 2]:
+        assert journal.add_transaction(JournalTransaction(
+            start + timedelta(seconds=k), "Transfer",
+            [JournalEntry("cash-id", False, Money(k, usd())),
+             JournalEntry("equipment-id", True, Money(k, usd()))])).is_ok()
+    journal.have_pushed(3)
+    version = journal.version
+    removed = journal.remove_before(start + timedelta(seconds=2))
+    assert [transaction.time() for transaction in removed] == [
+        start, start + timedelta(seconds=1)]
+    assert journal.version > version
+    assert [transaction.time() for transaction in journal.transactions] == [
+        start + timedelta(seconds=k) for k in [2, 3, 4]]
+    # of those left, the transaction at 2 seconds was not pushed
+    assert [transaction.time()
+            for transaction in journal.un_pushed_transactions()] == [
+        start + timedelta(seconds=2)]
+    assert journal.transactions_for_account(
+        "cash-id", start, start + timedelta(seconds=4)) == journal.transactions
+    assert journal.is_valid()
+    assert journal.remove_before(start) == []
+
+
+def test_backdated_run() -> None:
+    """Check that runs of backdated transactions are merged in time order."""
+    start = datetime(2020, 1, 1)
+    rng = Random(7)
+    journal = Journal()
+    added = []
+    for k in range(300):
+        account_id = rng.choice(["cash-id", "savings-id"])
+        transaction = JournalTransaction(
+            start + timedelta(seconds=rng.randint(0, 50)), "Transfer",
+            [JournalEntry(account_id, False, Money(k, usd())),
+             JournalEntry("equipment-id", True, Money(k, usd()))])
+        assert journal.add_transaction(transaction).is_ok()
+        added.append(transaction)
+        if k % 50 == 0:
+            # reading merges the backdated transactions so far
+            assert journal.transactions == sorted(
+                added, key=lambda t: t.time())
+    in_order = sorted(added, key=lambda t: t.time())
+    end = start + timedelta(seconds=50)
+    assert journal.transactions_for_account("cash-id", start, end) == [
+        transaction for transaction in in_order
+        if transaction.entries()[0].account_id() == "cash-id"]
+    assert journal.transactions_between(start, end) == in_order
+    assert journal.un_pushed_transactions() == added
@@ -1,6 +1,6 @@
 """The module wallet.accounting.journal_transaction contains the
 JournalTransaction implementation."""
-from typing import List
+from typing import Any, Dict, List
 from datetime import datetime
 
 from zeppelin_cash.accounting.journal_entry import JournalEntry
@@ -25,37 +25,68 @@ class JournalTransaction:
         self._time = time
         self.description = description
         self._entries = entries
+        # set once a journal has checked and accepted the transaction
+        self._journaled = False
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled transaction.
+
+        An unpickled transaction is not trusted to be journaled, e.g. one
+        read back from a write-ahead log, so it is checked again when it is
+        added to a journal.
+
+        Args:
+            state: the pickled attributes
+        """
+        self.__dict__.update(state)
+        self._journaled = False
 
     def is_valid(self) -> bool:
         """Check if a transaction is valid.
 
+        Once the transaction is journaled, see `set_journaled`, it is known
+        to be valid and is not checked again, since a journaled transaction
+        is not changed. See `verify` to check it again.
+
+        Returns:
+            True iff the transaction is valid
+        """
+        return self._journaled or self.verify()
+
+    def set_journaled(self) -> None:
+        """Record that a journal checked and accepted the transaction."""
+        self._journaled = True
+
+    def verify(self) -> bool:
+        """Check if a transaction is valid, ignoring whether it is journaled.
+
+        The entries are checked in one pass: they must all be in one
+        currency, with at least one debit and one credit, and the debits
+        must add up to the credits.
+
         Returns:
             True iff the transaction is valid
         """
-        if len(self._entries) == 0:
+        entries = self._entries
+        if len(entries) == 0:
             # XXX: Is this the correct policy?
             return True
-        code = self._entries[0].amount().currency().code()
-        for entry in self._entries:
-            if entry.amount().currency().code() != code:
+        currency = entries[0].amount().currency()
+        code = currency.code()
+        debit = 0
+        credit = 0
+        num_debits = 0
+        for entry in entries:
+            amount = entry.amount()
+            if amount.currency() is not currency and \
+                    amount.currency().code() != code:
                 return False
-        my_credits = []  # there is already a built-in 'credits'
-        debits = []
-        for entry in self._entries:
             if entry.is_debit():
-                debits.append(entry)
+                debit += amount.minor_units()
+                num_debits += 1
             else:
-                my_credits.append(entry)
-        if len(my_credits) == 0 or len(debits) == 0:
-            return False
-        credit = my_credits[0].amount()
-        for k in range(1, len(my_credits)):
-            credit += my_credits[k].amount()
-        debit = debits[0].amount()
-        for k in range(1, len(debits)):
-            debit += debits[k].amount()
-        assert credit.currency().code() == debit.currency().code()
-        return credit.quantity() == debit.quantity()
+                credit += amount.minor_units()
+        return 0 < num_debits < len(entries) and debit == credit
 
     def time(self) -> datetime:
         """Get the time of the transaction.
@@ -3,6 +3,7 @@ JournalTransaction implementation."""
 from datetime import datetime
 
 from zeppelin_cash.accounting.america import usd, ars
+from zeppelin_cash.accounting.journal import Journal
 from zeppelin_cash.accounting.money import Money
 from zeppelin_cash.accounting.journal_entry import JournalEntry
 from zeppelin_cash.accounting.journal_transaction import JournalTransaction
@@ -78,3 +79,21 @@ def test_transaction_entries() -> None:
     found1 = found[1].account_id()
     assert (found0 == "foo" and found1 == "bar") or (
         found0 == "bar" and found1 == "foo")
+
+
+def test_cached_validity() -> None:
+    """Check that validity is only cached once a transaction is journaled."""
+    entries = [
+        JournalEntry("cash-id", False, Money(10, usd())),
+        JournalEntry("equipment-id", True, Money(10, usd())),
+    ]
+    transaction = JournalTransaction(datetime.now(), "Equipment", entries)
+    assert transaction.is_valid()
+    entries.append(JournalEntry("equipment-id", True, Money(1, usd())))
+    assert not transaction.is_valid()
+    entries.pop()
+    journal = Journal()
+    assert journal.add_transaction(transaction).is_ok()
+    entries.append(JournalEntry("equipment-id", True, Money(1, usd())))
+    assert transaction.is_valid()
+    assert not transaction.verify()
@@ -1,5 +1,5 @@
 """The module wallet.accounting.ledger contains the Ledger implementation."""
-from typing import List
+from typing import Dict, List, Optional, Sequence
 from datetime import datetime
 
 from zeppelin_cash.accounting.account import Account
@@ -7,15 +7,29 @@ from zeppelin_cash.accounting.account_entry import AccountEntry
 from zeppelin_cash.accounting.account_metadata import AccountMetadata
 from zeppelin_cash.accounting.america import usd
 from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.fx_rates import FxRateTable
 from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.money_array import MoneyArray
+from zeppelin_cash.accounting.trial_balance import TrialBalance, TrialBalanceLine
 from zeppelin_cash.errors import Error, ok, Result
 
 
+# The number of roll-up balances cached per account.
+_ROLLUP_CACHE_SIZE = 16
+
+
 class Ledger:
     """A Ledger contains logical accounts.
 
     Using a ledger, one should be able to replay the transaction history
     of a firm.
+
+    The accounts can be arranged in a chart of accounts, a forest in which
+    each account has at most one parent, see `set_parent`. The balance of
+    an account's subtree, the account and all of its descendants, is
+    cached per account and time. Posting an entry through `add_entry` only
+    drops the cached balances along the path from the account to its root,
+    and only those at times after the entry.
     """
 
     def __init__(self, accounts: List[Account],
@@ -28,22 +42,251 @@ class Ledger:
         """
         self.accounts = accounts
         self.accounting_currency = currency
+        # Index the accounts by id. Asset and liability accounts are also
+        # indexed separately so that either side of the balance sheet can be
+        # walked without visiting the other. If the same id is passed twice,
+        # the first account wins, as it does when scanning `accounts`.
+        self._accounts_by_id: Dict[str, Account] = {}
+        self._asset_accounts: Dict[str, Account] = {}
+        self._liability_accounts: Dict[str, Account] = {}
+        for account in accounts:
+            if account.id() not in self._accounts_by_id:
+                self._index_account(account)
+        # the chart of accounts
+        self._parent_by_id: Dict[str, str] = {}
+        self._children_by_id: Dict[str, List[str]] = {}
+        # the subtree balances by account and time, None for the current
+        # balance
+        self._rollups: Dict[str,
+                            Dict[Optional[datetime], Dict[str, Money]]] = {}
+
+    def _index_account(self, account: Account) -> None:
+        """Add an account to the lookup indices.
+
+        Args:
+            account: the account to index
+        """
+        self._accounts_by_id[account.id()] = account
+        if account.is_asset:
+            self._asset_accounts[account.id()] = account
+        else:
+            self._liability_accounts[account.id()] = account
 
-    def add_account(self, account: Account) -> Error:
+    def add_account(self, account: Account,
+                    parent_id: Optional[str] = None) -> Error:
         """Add an account.
 
         Args:
             account: the account to add
+            parent_id: the id of the account's parent in the chart of
+                accounts, if any
 
         Returns:
             An error if the account cannot be added.
         """
-        for each in self.accounts:
-            if each.id() == account.id():
-                return Error("account id already present")
+        if account.id() in self._accounts_by_id:
+            return Error("account id already present")
+        if parent_id is not None and parent_id not in self._accounts_by_id:
+            return Error("parent account not found")
         self.accounts.append(account)
+        self._index_account(account)
+        if parent_id is not None:
+            return self.set_parent(account.id(), parent_id)
+        return ok()
+
+    def set_parent(self, account_id: str, parent_id: Optional[str]) -> Error:
+        """Move an account under another account in the chart of accounts.
+
+        Args:
+            account_id: the id of the account to move, with its descendants
+            parent_id: the id of the new parent, or None to make the account
+                a root
+
+        Returns:
+            An error if either account is not found or the move would make
+            an account its own ancestor.
+        """
+        if account_id not in self._accounts_by_id:
+            return Error("account not found")
+        if parent_id is not None:
+            if parent_id not in self._accounts_by_id:
+                return Error("parent account not found")
+            ancestor: Optional[str] = parent_id
+            while ancestor is not None:
+                if ancestor == account_id:
+                    return Error("an account cannot be its own ancestor")
+                ancestor = self._parent_by_id.get(ancestor)
+        old_parent_id = self._parent_by_id.pop(account_id, None)
+        if old_parent_id is not None:
+            self._children_by_id[old_parent_id].remove(account_id)
+            self._invalidate(old_parent_id, None)
+        if parent_id is not None:
+            self._parent_by_id[account_id] = parent_id
+            self._children_by_id.setdefault(parent_id, []).append(account_id)
+            self._invalidate(parent_id, None)
         return ok()
 
+    def parent(self, account_id: str) -> Optional[str]:
+        """Get the parent of an account in the chart of accounts.
+
+        Args:
+            account_id: the id of the account
+
+        Returns:
+            The id of the parent, or None if the account is a root or is not
+            found.
+        """
+        return self._parent_by_id.get(account_id)
+
+    def children(self, account_id: str) -> List[str]:
+        """Get the children of an account in the chart of accounts.
+
+        Args:
+            account_id: the id of the account
+
+        Returns:
+            The ids of the children, in the order they were added.
+        """
+        return list(self._children_by_id.get(account_id, []))
+
+    def subtree_balances(self, account_id: str,
+                         time: Optional[datetime] = None) -> Result[Dict[str, Money]]:
+        """Get the balance of an account and all of its descendants.
+
+        Each account's balance is counted with its own sign, as on the
+        balance sheet. The result is cached until an entry is posted to
+        the subtree before the time.
+
+        Args:
+            account_id: the id of the root of the subtree
+            time: the time of the balance, or None for the current balance
+
+        Returns:
+            The total balance in each currency, by currency code, or an
+            error if the account is not found or the time is before any
+            account of the subtree was created.
+        """
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Result(err=Error("account not found"))
+        cache = self._rollups.get(account_id)
+        if cache is not None and time in cache:
+            return Result(ok=dict(cache[time]))
+        if time is None:
+            totals = account.balances()
+        else:
+            result = account.balances_as_of_date(time)
+            if not result.is_ok():
+                return result
+            totals = result.ok()
+        for child_id in self._children_by_id.get(account_id, []):
+            child_result = self.subtree_balances(child_id, time)
+            if not child_result.is_ok():
+                return child_result
+            for code, balance in child_result.ok().items():
+                totals[code] = totals[code] + balance if code in totals \
+                    else balance
+        if cache is None:
+            cache = {}
+            self._rollups[account_id] = cache
+        elif len(cache) >= _ROLLUP_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[time] = dict(totals)
+        return Result(ok=totals)
+
+    def subtree_balance_in(self, currency: Currency, fx_rates: FxRateTable,
+                           time: datetime, account_id: str) -> Result[Money]:
+        """Get the balance of an account and its descendants in one currency.
+
+        Balances in other currencies are converted account by account, as
+        the StatementEngine does, so that both give the same totals. A
+        subtree with balances in the one currency only is read from the
+        cached roll-up, see `subtree_balances`.
+
+        Args:
+            currency: the currency of the balance
+            fx_rates: the exchange rates
+            time: the time of the balance and of the rates
+            account_id: the id of the root of the subtree
+
+        Returns:
+            The total balance, or an error if the subtree balance cannot be
+            read or an exchange rate is not known.
+        """
+        result = self.subtree_balances(account_id, time)
+        if not result.is_ok():
+            return Result(err=result.err())
+        total = Money(0, currency)
+        if all(code == currency.code() for code in result.ok()):
+            for balance in result.ok().values():
+                total += balance
+            return Result(ok=total)
+        pending = [account_id]
+        while pending:
+            node_id = pending.pop()
+            pending.extend(self._children_by_id.get(node_id, []))
+            balances = self._accounts_by_id[node_id].balances_as_of_date(time)
+            if not balances.is_ok():
+                return Result(err=balances.err())
+            for balance in balances.ok().values():
+                if balance.minor_units() == 0:
+                    continue
+                converted = fx_rates.convert(balance, currency, time)
+                if not converted.is_ok():
+                    return converted
+                total += converted.ok()
+        return Result(ok=total)
+
+    def _invalidate(self, account_id: str, time: Optional[datetime]) -> None:
+        """Drop the cached subtree balances from an account up to its root.
+
+        Args:
+            account_id: the id of the account that changed
+            time: the time of the change; balances before or at it are kept.
+                None drops every cached balance.
+        """
+        node: Optional[str] = account_id
+        while node is not None:
+            cache = self._rollups.get(node)
+            if cache:
+                if time is None:
+                    cache.clear()
+                else:
+                    for key in [key for key in cache
+                                if key is None or key > time]:
+                        del cache[key]
+            node = self._parent_by_id.get(node)
+
+    def get_account(self, account_id: str) -> Result[Account]:
+        """Get an account by its id.
+
+        Args:
+            account_id: the id of the account
+
+        Returns:
+            The account, or an error if no account has that id.
+        """
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Result(err=Error("account not found"))
+        return Result(ok=account)
+
+    def asset_accounts(self) -> List[Account]:
+        """Get all of the asset accounts.
+
+        Returns:
+            The asset accounts in the order they were added.
+        """
+        return list(self._asset_accounts.values())
+
+    def liability_accounts(self) -> List[Account]:
+        """Get all of the liability accounts.
+
+        Returns:
+            The liability accounts in the order they were added.
+        """
+        return list(self._liability_accounts.values())
+
     def add_entry(self, account_id: str, is_debit: bool,
                   entry: AccountEntry) -> Error:
         """Add an entry to an account.
@@ -56,11 +299,39 @@ class Ledger:
         Returns:
             An error if an error occurs.
         """
-        for k in range(len(self.accounts)):
-            if self.accounts[k].id() != account_id:
-                continue
-            return self.accounts[k].add_entry(is_debit, entry)
-        return Error("account not found")
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Error("account not found")
+        err = account.add_entry(is_debit, entry)
+        if self._rollups and err.is_ok():
+            self._invalidate(account_id, entry.time())
+        return err
+
+    def add_entries(self, account_id: str, debit_entries: Sequence[AccountEntry],
+                    credit_entries: Sequence[AccountEntry]) -> Error:
+        """Add several entries to an account.
+
+        The account is looked up, and its cached roll-ups dropped, once for
+        all of the entries, see `Account.add_entries`.
+
+        Args:
+            account_id: the id of the account
+            debit_entries: the debit entries
+            credit_entries: the credit entries
+
+        Returns:
+            An error if the entries cannot be added.
+        """
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Error("account not found")
+        err = account.add_entries(debit_entries, credit_entries)
+        if self._rollups and err.is_ok():
+            times = [entry.time() for entries in [debit_entries, credit_entries]
+                     for entry in entries]
+            if times:
+                self._invalidate(account_id, min(times))
+        return err
 
     def balance_as_of_date(self, time: datetime,
                            account_id: str) -> Result[Money]:
@@ -74,11 +345,80 @@ class Ledger:
             The balance of the account at that time, or an error
             if the parameters were invalid.
         """
-        for account in self.accounts:
-            if account.id() != account_id:
-                continue
-            return account.balance_as_of_date(time)
-        return Result(err=Error("account not found"))
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Result(err=Error("account not found"))
+        return account.balance_as_of_date(time)
+
+    def balances_at(self, times: List[datetime],
+                    account_id: str) -> Result[List[Money]]:
+        """Get the balances of an account at several times.
+
+        Args:
+            times: the times of the balances, in ascending order
+            account_id: the account for which to get the balances
+
+        Returns:
+            The balance of the account at each time, or an error if the
+            parameters were invalid.
+        """
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Result(err=Error("account not found"))
+        return account.balances_at(times)
+
+    def balance_array(self, times: List[datetime],
+                      account_id: str) -> Result[MoneyArray]:
+        """Get the balances of an account at several times as a MoneyArray.
+
+        Args:
+            times: the times of the balances, in ascending order
+            account_id: the account for which to get the balances
+
+        Returns:
+            The balance of the account at each time, or an error if the
+            parameters were invalid.
+        """
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Result(err=Error("account not found"))
+        return account.balance_array(times)
+
+    def balance_arrays(self, times: List[datetime],
+                       account_id: str) -> Result[List[MoneyArray]]:
+        """Get the balances of an account in each of its currencies.
+
+        Args:
+            times: the times of the balances, in ascending order
+            account_id: the account for which to get the balances
+
+        Returns:
+            An array of balances per currency, see `Account.balance_arrays`,
+            or an error if the parameters were invalid.
+        """
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Result(err=Error("account not found"))
+        return account.balance_arrays(times)
+
+    def balance_in(self, currency: Currency, fx_rates: FxRateTable,
+                   time: datetime, account_id: str) -> Result[Money]:
+        """Get the balance of an account converted to a single currency.
+
+        Args:
+            currency: the currency of the balance
+            fx_rates: the exchange rates
+            time: the time of the balance and of the rates
+            account_id: the account for which to get the balance
+
+        Returns:
+            The balance of the account, or an error if the parameters were
+            invalid or an exchange rate is not known.
+        """
+        account = self._accounts_by_id.get(account_id)
+        if account is None:
+            return Result(err=Error("account not found"))
+        return account.balance_in(currency, fx_rates, time)
 
     def list_accounts(self, timestamp: datetime) -> List[AccountMetadata]:
         """List the metadata for all the accounts in the ledger.
@@ -89,3 +429,34 @@ class Ledger:
         Returns:
             A list of metadata about the accounts."""
         return [account.metadata(timestamp) for account in self.accounts]
+
+    def close_period(self, cutoff: datetime,
+                     boundaries: List[datetime]) -> None:
+        """Close the period before a time in every account, see `Account.close`.
+
+        The cached subtree balances are dropped.
+
+        Args:
+            cutoff: the end of the period
+            boundaries: the earlier times at which to keep the balances
+        """
+        for account in self.accounts:
+            account.close(cutoff, boundaries)
+        self._rollups.clear()
+
+    def trial_balance(self, time: Optional[datetime] = None) -> TrialBalance:
+        """Get the debit and credit totals of every account.
+
+        Args:
+            time: count the entries strictly before this time, by default
+                every entry
+
+        Returns:
+            A line per account and currency, see `Account.entry_totals`.
+        """
+        lines = []
+        for account in self.accounts:
+            for debit_total, credit_total in account.entry_totals(time):
+                lines.append(TrialBalanceLine(account.id(), account.title,
+                                              debit_total, credit_total))
+        return TrialBalance(time, lines)
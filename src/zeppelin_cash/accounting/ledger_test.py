@@ -76,3 +76,78 @@ def test_list_accounts() -> None:
             continue
         assert my_metadata.name == "debt"
         assert my_metadata.balance == Money(42, usd())
+
+
+def test_get_account() -> None:
+    """Check that accounts can be looked up by id and by side."""
+    start = datetime.now()
+    ledger = basic_ledger(start)
+    result = ledger.get_account("cash-id")
+    assert result.is_ok()
+    assert result.ok().title == "cash"
+    assert not ledger.get_account("nonce-id").is_ok()
+    assert [account.id() for account in ledger.asset_accounts()] == [
+        "cash-id"]
+    assert [account.id() for account in ledger.liability_accounts()] == [
+        "debt-id"]
+    assert ledger.add_account(Account("equipment", True, "equip-id")).is_ok()
+    assert ledger.get_account("equip-id").is_ok()
+    assert [account.id() for account in ledger.asset_accounts()] == [
+        "cash-id", "equip-id"]
+    assert not ledger.add_account(Account("loan", False, "cash-id")).is_ok()
+    assert [account.id() for account in ledger.liability_accounts()] == [
+        "debt-id"]
+    assert len(ledger.accounts) == 3
+
+
+def test_balances_at() -> None:
+    """Check that a series of balances can be read from the ledger."""
+    start = datetime.now()
+    ledger = basic_ledger(start)
+    entry = AccountEntry(start + timedelta(seconds=1), Money(15, usd()))
+    assert ledger.add_entry("cash-id", True, entry).is_ok()
+    times = [start, start + timedelta(seconds=1), start + timedelta(seconds=2)]
+    result = ledger.balances_at(times, "cash-id")
+    assert result.is_ok()
+    assert [money.quantity() for money in result.ok()] == [1337, 1337, 1352]
+    assert not ledger.balances_at(times, "nonce-id").is_ok()
+
+
+def test_chart_of_accounts() -> None:
+    """Check subtree balances and their invalidation along the path."""
+    start = datetime(2020, 1, 1)
+    ledger = basic_ledger(start)
+    bank = Account("bank A", True, "bank-id")
+    bank.set_starting_balance(start, Money(0, usd()))
+    operating = Account("operating", True, "operating-id")
+    operating.set_starting_balance(start, Money(100, usd()))
+    assert ledger.add_account(bank, "cash-id").is_ok()
+    assert ledger.add_account(operating, "bank-id").is_ok()
+    assert not ledger.add_account(Account("x", True, "x-id"),
+                                  "nonce-id").is_ok()
+    assert ledger.parent("operating-id") == "bank-id"
+    assert ledger.children("cash-id") == ["bank-id"]
+    assert not ledger.set_parent("cash-id", "operating-id").is_ok()
+    later = start + timedelta(seconds=10)
+    assert ledger.subtree_balances("cash-id", later).ok() == {
+        "USD": Money(1437, usd())}
+    assert ledger.subtree_balances("cash-id").ok() == {
+        "USD": Money(1437, usd())}
+    # an entry posted to a leaf updates every roll-up above it
+    assert ledger.add_entry("operating-id", True, AccountEntry(
+        start + timedelta(seconds=5), Money(20, usd()))).is_ok()
+    assert ledger.subtree_balances("cash-id", later).ok() == {
+        "USD": Money(1457, usd())}
+    assert ledger.subtree_balances("bank-id").ok() == {
+        "USD": Money(120, usd())}
+    assert ledger.subtree_balances(
+        "cash-id", start + timedelta(seconds=5)).ok() == {
+        "USD": Money(1437, usd())}
+    # moving a subtree updates both the old and the new parent
+    assert ledger.set_parent("bank-id", None).is_ok()
+    assert ledger.subtree_balances("cash-id", later).ok() == {
+        "USD": Money(1337, usd())}
+    assert ledger.subtree_balances("bank-id", later).ok() == {
+        "USD": Money(120, usd())}
+    assert not ledger.subtree_balances(
+        "bank-id", start - timedelta(seconds=1)).is_ok()
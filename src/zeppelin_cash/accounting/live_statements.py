@@ -0,0 +1,207 @@
+"""The module wallet.accounting.live_statements contains the LiveStatements
+implementation."""
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+from zeppelin_cash.accounting.account import Account
+from zeppelin_cash.accounting.account_category import AccountCategory
+from zeppelin_cash.accounting.account_entry import AccountEntry
+from zeppelin_cash.accounting.balance_sheet import BalanceSheet
+from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.income_statement import IncomeStatement
+from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.statement_engine import BALANCE_SHEET_LINES, INCOME_STATEMENT_LINES
+from zeppelin_cash.errors import Error, ok
+
+
+class LiveStatements:
+    """LiveStatements keeps running totals for each statement line.
+
+    The totals are updated as entries are pushed to the ledger, so the
+    balance sheet after the last posting, and the income statement from the
+    start of the current period to after the last posting, can be read
+    without visiting any account or transaction.
+    """
+
+    def __init__(self, currency: Currency, period_start: datetime,
+                 income_taxes_paid: int = 0) -> None:
+        """Create a new LiveStatements instance with no accounts.
+
+        Args:
+            currency: the accounting currency
+            period_start: the start of the current income statement period
+            income_taxes_paid: the income taxes already paid in the period,
+                in fractional units of the currency
+        """
+        self.accounting_currency = currency
+        self.period_start = period_start
+        # The totals are in fractional units of the currency.
+        self._totals: Dict[AccountCategory, int] = {
+            category: 0 for category in AccountCategory}
+        # The totals from before the start of the period, for the income
+        # statement.
+        self._period_start_totals: Dict[AccountCategory, int] = {
+            category: 0 for category in AccountCategory}
+        self._income_taxes_paid = income_taxes_paid
+        self._category_by_id: Dict[str, AccountCategory] = {}
+        self._is_asset_by_id: Dict[str, bool] = {}
+        # The balance sheet cannot be read before the latest account was
+        # created, nor the income statement if any of its accounts were
+        # created after the start of the period.
+        self._first_valid_time: Optional[datetime] = None
+        self._period_start_ok = True
+        self._last_time: Optional[datetime] = None
+        # The totals are not kept for balances in other currencies, which
+        # need translating at the time of each statement.
+        self._has_foreign_balances = False
+
+    def add_account(self, category: AccountCategory, account: Account) -> None:
+        """Start tracking an account.
+
+        The account's current balance is added to the running totals.
+
+        Args:
+            category: the category of the account
+            account: the account
+        """
+        if account.currency().code() != self.accounting_currency.code() or \
+                len(account.currencies()) > 1:
+            self._has_foreign_balances = True
+            return
+        self._category_by_id[account.id()] = category
+        self._is_asset_by_id[account.id()] = account.is_asset
+        self._totals[category] += account.balance().minor_units()
+        if self._first_valid_time is None or account.init_datetime > self._first_valid_time:
+            self._first_valid_time = account.init_datetime
+        result = account.balance_as_of_date(self.period_start)
+        if result.is_ok():
+            self._period_start_totals[category] += result.ok().minor_units()
+        else:
+            self._period_start_ok = False
+        last_time = account.last_time()
+        if last_time is not None:
+            self.record_time(last_time)
+
+    def record_entries(self, account_id: str, is_debit: bool,
+                       entries: Sequence[AccountEntry]) -> None:
+        """Update the totals for entries that were pushed to an account.
+
+        Args:
+            account_id: the id of the account
+            is_debit: True iff the entries are debits
+            entries: the entries
+        """
+        for entry in entries:
+            self._record(entry.time(), account_id, is_debit, entry.amount())
+
+    def _record(self, time: datetime, account_id: str, is_debit: bool,
+                amount: Money) -> None:
+        """Update the totals for an amount posted to an account.
+
+        Args:
+            time: the time of the posting
+            account_id: the id of the account
+            is_debit: True iff the amount is a debit
+            amount: the amount
+        """
+        category = self._category_by_id.get(account_id)
+        if category is None:
+            return
+        if amount.currency() is not self.accounting_currency and \
+                amount.currency().code() != self.accounting_currency.code():
+            self._has_foreign_balances = True
+            return
+        quantity = amount.minor_units()
+        sign = 1 if self._is_asset_by_id[account_id] else -1
+        delta = sign * quantity if is_debit else -sign * quantity
+        self._totals[category] += delta
+        if time < self.period_start:
+            self._period_start_totals[category] += delta
+        elif category == AccountCategory.IncomeTaxesPayable and is_debit:
+            self._income_taxes_paid += quantity
+        self.record_time(time)
+
+    def record_time(self, time: datetime) -> None:
+        """Record that a transaction was pushed at a given time.
+
+        Args:
+            time: the time of the transaction
+        """
+        if self._last_time is None or time > self._last_time:
+            self._last_time = time
+
+    def covers(self, time: datetime) -> bool:
+        """Check if the running totals give the balances at a time.
+
+        Args:
+            time: the time of the balances
+
+        Returns:
+            True iff the time is after every pushed transaction and no
+            earlier than the creation of any account, and every balance is
+            in the accounting currency.
+        """
+        if self._has_foreign_balances:
+            return False
+        if self._first_valid_time is not None and time < self._first_valid_time:
+            return False
+        return self._last_time is None or time > self._last_time
+
+    def covers_period(self, start: datetime, end: datetime) -> bool:
+        """Check if the running totals give the income statement of a period.
+
+        Args:
+            start: the start of the period
+            end: the end of the period
+
+        Returns:
+            True iff the period starts at the start of the current period
+            and ends after every pushed transaction.
+        """
+        return start == self.period_start and self._period_start_ok and \
+            self.covers(end)
+
+    def balance_sheet(self, time: datetime) -> BalanceSheet:
+        """Get the balance sheet from the running totals.
+
+        Only call this if `covers(time)` is True.
+
+        Args:
+            time: the time of the balance sheet
+
+        Returns:
+            The balance sheet.
+        """
+        sheet = BalanceSheet(time)
+        for category, line in BALANCE_SHEET_LINES:
+            setattr(sheet, line, self._money(self._totals[category]))
+        return sheet
+
+    def income_statement(self, end: datetime) -> IncomeStatement:
+        """Get the income statement of the current period from the running totals.
+
+        Only call this if `covers_period(self.period_start, end)` is True.
+
+        Args:
+            end: the end of the period
+
+        Returns:
+            The income statement.
+        """
+        statement = IncomeStatement(self.period_start, end)
+        for category, line in INCOME_STATEMENT_LINES:
+            setattr(statement, line, self._money(
+                self._totals[category] - self._period_start_totals[category]))
+        statement.income_taxes = self._money(self._income_taxes_paid)
+        return statement
+
+    def _money(self, minor_units: int) -> Money:
+        """Wrap a running total as money.
+
+        Args:
+            minor_units: the total, in fractional units
+
+        Returns:
+            The total in the accounting currency.
+        """
+        return Money.from_minor_units(minor_units, self.accounting_currency)
@@ -0,0 +1,54 @@
+"""Test the live statements kept by a Book."""
+from datetime import datetime, timedelta
+
+from zeppelin_cash.accounting.book import Book
+from zeppelin_cash.accounting.sample_book import random_book
+
+
+def check_live_statements(book: Book, period_start: datetime,
+                          time: datetime) -> None:
+    """Check the live statements at a time against a full recomputation."""
+    result = book.financial_statement(period_start, time)
+    assert result.is_ok()
+    expected = result.ok()
+    sheet = book.balance_sheet(time)
+    assert sheet.is_ok()
+    assert vars(sheet.ok()) == vars(expected.balance_sheet)
+    income = book.income_statement(period_start, time)
+    assert income.is_ok()
+    assert vars(income.ok()) == vars(expected.income_statement)
+
+
+def test_live_statements() -> None:
+    """Check that the running totals track every posting."""
+    start = datetime(2020, 1, 1)
+    period_start = start + timedelta(seconds=100)
+    reference = random_book(start, 300, seed=1)
+    book = random_book(start, 0, seed=1)
+    book.enable_live_statements(period_start)
+    check_live_statements(book, period_start, start + timedelta(seconds=1))
+    for transaction in reference.journal.transactions:
+        assert book.add_transaction(transaction).is_ok()
+        check_live_statements(
+            book, period_start, transaction.time() + timedelta(seconds=0.5))
+    new_id = book.add_cash_account("Petty cash")
+    check_live_statements(book, period_start, start + timedelta(days=1))
+    assert book.ledger.get_account(new_id).is_ok()
+
+
+def test_enable_with_history() -> None:
+    """Check enabling live statements on a book with transactions."""
+    start = datetime(2020, 1, 1)
+    book = random_book(start, 300, seed=2)
+    period_start = start + timedelta(seconds=150)
+    book.enable_live_statements(period_start)
+    end = book.journal.transactions[-1].time() + timedelta(seconds=1)
+    check_live_statements(book, period_start, end)
+    # Statements that the running totals do not cover are still computed
+    # from the ledger.
+    check_live_statements(book, period_start, period_start)
+    check_live_statements(book, start + timedelta(seconds=10), end)
+    assert not book.balance_sheet(start - timedelta(seconds=1)).is_ok()
+    # Starting a new period
+    book.enable_live_statements(end)
+    check_live_statements(book, end, end + timedelta(seconds=1))
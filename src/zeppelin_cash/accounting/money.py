@@ -1,9 +1,17 @@
 """The wallet.accounting.money contains the Money implementation."""
-from zeppelin_cash.accounting.currency import Currency
+from typing import Any, Dict
+
+from zeppelin_cash.accounting.currency import Currency, shared_instance
 
 
 class Money:
-    """Money encapsulates some amount of a given currency."""
+    """Money encapsulates some amount of a given currency.
+
+    The amount is kept as an integer number of the currency's fractional
+    units, e.g. cents for US dollars, so adding and subtracting money is
+    exact. Quantities are rounded to the nearest fractional unit.
+    """
+    __slots__ = ("_minor_units", "_currency")
 
     def __init__(self, quantity: float, currency: Currency) -> None:
         """Create a new Money instance.
@@ -12,8 +20,57 @@ class Money:
             quantity: the amount of the currency
             currency: the currency of the money
         """
-        self.__quantity = quantity
-        self.__currency = currency
+        fractions = currency.fractions_per_unit() or 1
+        if isinstance(quantity, int):
+            self._minor_units = quantity * fractions
+        else:
+            self._minor_units = round(quantity * fractions)
+        self._currency = currency
+
+    def __setstate__(self, state: Any) -> None:
+        """Restore pickled money.
+
+        Money pickled before it was kept in fractional units holds its
+        quantity and currency as `_Money__quantity` and `_Money__currency`.
+        The quantity is converted to fractional units, and the currency to
+        the shared instance for its code.
+
+        Args:
+            state: the pickled state, the slot values or a legacy dict
+        """
+        if isinstance(state, tuple):
+            # (None, slots) for money pickled with __slots__
+            state = state[1]
+        slots: Dict[str, Any] = state
+        if "_Money__quantity" not in slots:
+            self._minor_units = slots["_minor_units"]
+            self._currency = slots["_currency"]
+            return
+        currency = shared_instance(slots["_Money__currency"])
+        fractions = currency.fractions_per_unit() or 1
+        quantity = slots["_Money__quantity"]
+        if isinstance(quantity, int):
+            self._minor_units = quantity * fractions
+        else:
+            self._minor_units = round(quantity * fractions)
+        self._currency = currency
+
+    @classmethod
+    def from_minor_units(cls, minor_units: int,
+                         currency: Currency) -> 'Money':
+        """Create a new Money instance from a number of fractional units.
+
+        Args:
+            minor_units: the amount in fractional units, e.g. cents
+            currency: the currency of the money
+
+        Returns:
+            The money.
+        """
+        money = _new(cls)
+        money._minor_units = minor_units
+        money._currency = currency
+        return money
 
     def currency(self) -> Currency:
         """Get the money's currency.
@@ -21,7 +78,7 @@ class Money:
         Returns:
             The money's currency.
         """
-        return self.__currency
+        return self._currency
 
     def quantity(self) -> float:
         """Get the quantity of the money.
@@ -29,7 +86,15 @@ class Money:
         Returns:
             The quantity of the money.
         """
-        return self.__quantity
+        return self._minor_units / (self._currency.fractions_per_unit() or 1)
+
+    def minor_units(self) -> int:
+        """Get the quantity of the money in fractional units, e.g. cents.
+
+        Returns:
+            The number of fractional units.
+        """
+        return self._minor_units
 
     def scale(self, factor: float) -> 'Money':
         """Scale the money by a float.
@@ -38,9 +103,13 @@ class Money:
             f: the float to by which to scale
 
         Returns:
-            A scaled Money instance.
+            A scaled Money instance, rounded to the nearest fractional unit.
         """
-        return Money(factor * self.quantity(), self.currency())
+        if factor == 1.0:
+            return self
+        if factor == -1.0:
+            return _money(-self._minor_units, self._currency)
+        return _money(round(factor * self._minor_units), self._currency)
 
     def __add__(self, other: 'Money') -> 'Money':
         """Add some money together.
@@ -51,9 +120,10 @@ class Money:
         Returns:
             The sum of self and other.
         """
-        if self.currency().code() != other.currency().code():
+        if self._currency is not other._currency and \
+                self._currency.code() != other._currency.code():
             raise NotImplementedError()
-        return Money(self.quantity() + other.quantity(), self.currency())
+        return _money(self._minor_units + other._minor_units, self._currency)
 
     def __sub__(self, other: 'Money') -> 'Money':
         """Subtract some money.
@@ -64,9 +134,10 @@ class Money:
         Returns:
             the difference
         """
-        if self.currency().code() != other.currency().code():
+        if self._currency is not other._currency and \
+                self._currency.code() != other._currency.code():
             raise NotImplementedError()
-        return Money(self.quantity() - other.quantity(), self.currency())
+        return _money(self._minor_units - other._minor_units, self._currency)
 
     def __eq__(self, other: object) -> bool:
         """Check if the object is equivalent to another.
@@ -78,8 +149,9 @@ class Money:
             True iff they are the same, False otherwise.
         """
         if isinstance(other, Money):
-            return self.currency().code() == other.currency(
-            ).code() and self.quantity() == other.quantity()
+            return self._minor_units == other._minor_units and (
+                self._currency is other._currency or
+                self._currency.code() == other._currency.code())
         return False
 
     def __str__(self) -> str:
@@ -88,16 +160,39 @@ class Money:
         Returns:
             The Currency instance as a string.
         """
-        str_quant = str(int(self.quantity() * 100.0))
-        if len(str_quant) <= 2:
-            return "0." + str_quant + " " + self.currency().code()
-        cents = str_quant[-2:]
-        dollars = str_quant[:-2]
-        chars = dollars
-        ret = "." + cents + " " + self.currency().code()
-        for k in range(len(chars)):
-            char = chars[len(chars) - k - 1]
-            ret = char + ret
-            if k % 3 == 2 and k != len(chars) - 1:
-                ret = ',' + ret
-        return ret
+        fractions = self._currency.fractions_per_unit() or 1
+        minor_units = self._minor_units
+        sign = ""
+        if minor_units < 0:
+            sign = "-"
+            minor_units = -minor_units
+        if fractions == 100:
+            return f"{sign}{minor_units // 100:,}.{minor_units % 100:02d} " \
+                f"{self._currency.code()}"
+        units, fraction = divmod(minor_units, fractions)
+        if fractions == 1:
+            return f"{sign}{units:,} {self._currency.code()}"
+        digits = len(str(fractions - 1))
+        return f"{sign}{units:,}.{fraction:0{digits}d} {self._currency.code()}"
+
+
+_new = object.__new__
+
+
+def _money(minor_units: int, currency: Currency) -> Money:
+    """Create a new Money instance without rounding.
+
+    This is `Money.from_minor_units` without the method lookup, for the
+    arithmetic operators.
+
+    Args:
+        minor_units: the amount in fractional units
+        currency: the currency of the money
+
+    Returns:
+        The money.
+    """
+    money = _new(Money)
+    money._minor_units = minor_units  # pylint: disable=W0212
+    money._currency = currency  # pylint: disable=W0212
+    return money
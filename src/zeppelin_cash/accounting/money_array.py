@@ -0,0 +1,250 @@
+"""The module wallet.accounting.money_array contains the MoneyArray
+implementation."""
+from array import array
+from itertools import accumulate, compress
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.currency import Currency
+from zeppelin_cash.accounting.money import Money
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+
+class MoneyArray:
+    """A MoneyArray holds many amounts of one currency in a numeric buffer.
+
+    The amounts are kept as 64 bit integers of the currency's fractional
+    units, see `Money.minor_units`. With NumPy installed the buffer is a
+    NumPy array and the arithmetic is vectorized; without it the buffer is
+    an `array.array` and the arithmetic runs in Python. Both give the same
+    results, except that NumPy sums wrap around rather than fail if they
+    overflow 64 bits.
+
+    A MoneyArray is never modified in place. Creating one from a buffer of
+    the same type, e.g. `ColumnarAccountEntryList.amount_column()`, does not
+    copy the buffer.
+    """
+
+    def __init__(self, currency: Currency,
+                 minor_units: Iterable[int] = ()) -> None:
+        """Create a new MoneyArray instance.
+
+        Args:
+            currency: the currency of every amount
+            minor_units: the amounts, in fractional units
+        """
+        self._currency = currency
+        self._units: Any = _buffer(minor_units)
+
+    @classmethod
+    def from_money(cls, amounts: Iterable[Money],
+                   currency: Optional[Currency] = None) -> 'MoneyArray':
+        """Create a new MoneyArray instance from Money instances.
+
+        Args:
+            amounts: the amounts
+            currency: the currency of the amounts, by default the currency of
+                the first amount or US dollars if there are none
+
+        Returns:
+            The array, or raises NotImplementedError if the amounts are not
+            all in the same currency, like adding them would.
+        """
+        amounts = list(amounts)
+        if currency is None:
+            currency = amounts[0].currency() if amounts else usd()
+        code = currency.code()
+        for amount in amounts:
+            if amount.currency() is not currency and \
+                    amount.currency().code() != code:
+                raise NotImplementedError()
+        return cls(currency, [amount.minor_units() for amount in amounts])
+
+    @classmethod
+    def zeros(cls, currency: Currency, size: int) -> 'MoneyArray':
+        """Create a new MoneyArray instance of zero amounts.
+
+        Args:
+            currency: the currency of the amounts
+            size: the number of amounts
+
+        Returns:
+            The array.
+        """
+        return cls(currency, [0] * size)
+
+    def currency(self) -> Currency:
+        """Get the currency of the amounts.
+
+        Returns:
+            The currency.
+        """
+        return self._currency
+
+    def minor_units(self) -> List[int]:
+        """Get the amounts in fractional units.
+
+        Returns:
+            The amounts, e.g. in cents.
+        """
+        return [int(units) for units in self._units]
+
+    def sum(self) -> Money:
+        """Add up all of the amounts.
+
+        Returns:
+            The total.
+        """
+        return Money.from_minor_units(int(sum(self._units) if numpy is None
+                                          else self._units.sum()),
+                                      self._currency)
+
+    def cumsum(self) -> 'MoneyArray':
+        """Get the running totals of the amounts.
+
+        Returns:
+            An array whose k-th amount is the sum of the first k + 1 amounts.
+        """
+        if numpy is None:
+            return self._with(accumulate(self._units))
+        return self._with(self._units.cumsum())
+
+    def scale(self, factor: float) -> 'MoneyArray':
+        """Scale every amount by a float.
+
+        Args:
+            factor: the float by which to scale
+
+        Returns:
+            The scaled amounts, each rounded to the nearest fractional unit.
+        """
+        if numpy is None:
+            return self._with(round(factor * units) for units in self._units)
+        return self._with(numpy.rint(self._units * factor))
+
+    def mask(self, keep: Sequence[bool]) -> 'MoneyArray':
+        """Select some of the amounts.
+
+        Args:
+            keep: a flag per amount, True to keep it
+
+        Returns:
+            The amounts with a True flag, in order.
+        """
+        assert len(keep) == len(self)
+        if numpy is None:
+            return self._with(compress(self._units, keep))
+        return self._with(self._units[numpy.asarray(keep, dtype=bool)])
+
+    def to_money(self) -> List[Money]:
+        """Convert the amounts back to Money instances.
+
+        Returns:
+            A Money instance per amount.
+        """
+        return [Money.from_minor_units(units, self._currency)
+                for units in self.minor_units()]
+
+    def __add__(self, other: Union['MoneyArray', Money]) -> 'MoneyArray':
+        """Add two arrays amount by amount, or add money to every amount.
+
+        Args:
+            other: an array of the same length and currency, or money of the
+                same currency
+
+        Returns:
+            The sums.
+        """
+        if isinstance(other, Money):
+            self._check_currency(other.currency())
+            units = other.minor_units()
+            if numpy is None:
+                return self._with(a + units for a in self._units)
+            return self._with(self._units + units)
+        self._check(other)
+        if numpy is None:
+            return self._with(a + b for a, b in zip(self._units, other._units))
+        return self._with(self._units + other._units)
+
+    def __sub__(self, other: Union['MoneyArray', Money]) -> 'MoneyArray':
+        """Subtract two arrays amount by amount, or money from every amount.
+
+        Args:
+            other: an array of the same length and currency, or money of the
+                same currency
+
+        Returns:
+            The differences.
+        """
+        if isinstance(other, Money):
+            return self + other.scale(-1.0)
+        self._check(other)
+        if numpy is None:
+            return self._with(a - b for a, b in zip(self._units, other._units))
+        return self._with(self._units - other._units)
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def __getitem__(self, index: int) -> Money:
+        return Money.from_minor_units(int(self._units[index]), self._currency)
+
+    def __iter__(self) -> Iterator[Money]:
+        return iter(self.to_money())
+
+    def _with(self, minor_units: Iterable[int]) -> 'MoneyArray':
+        """Create an array of other amounts in the same currency.
+
+        Args:
+            minor_units: the amounts, in fractional units
+
+        Returns:
+            The array.
+        """
+        return MoneyArray(self._currency, minor_units)
+
+    def _check(self, other: 'MoneyArray') -> None:
+        """Check that another array can be combined with this one.
+
+        Args:
+            other: the other array
+        """
+        self._check_currency(other._currency)
+        assert len(self) == len(other)
+
+    def _check_currency(self, currency: Currency) -> None:
+        """Check that amounts in a currency can be combined with this array.
+
+        Args:
+            currency: the currency of the other amounts
+        """
+        if self._currency is not currency and \
+                self._currency.code() != currency.code():
+            raise NotImplementedError()
+
+
+def _buffer(minor_units: Iterable[int]) -> Any:
+    """Put amounts in a numeric buffer, copying them only if needed.
+
+    Args:
+        minor_units: the amounts, in fractional units
+
+    Returns:
+        A NumPy int64 array if NumPy is installed, otherwise an int64
+        `array.array`.
+    """
+    if numpy is None:
+        if isinstance(minor_units, array) and minor_units.typecode == "q":
+            return minor_units
+        if isinstance(minor_units, memoryview) and minor_units.format == "q":
+            return minor_units
+        return array("q", minor_units)
+    if isinstance(minor_units, numpy.ndarray):
+        return minor_units.astype(numpy.int64, copy=False)
+    if isinstance(minor_units, memoryview) and minor_units.format == "q":
+        return numpy.frombuffer(minor_units, dtype=numpy.int64)
+    return numpy.fromiter(minor_units, dtype=numpy.int64)
@@ -0,0 +1,59 @@
+"""Test the MoneyArray implementation."""
+from array import array
+
+import pytest
+
+from zeppelin_cash.accounting import money_array
+from zeppelin_cash.accounting.america import ars, usd
+from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.money_array import MoneyArray
+
+
+def check_money_array() -> None:
+    """Check the MoneyArray operations with the current backend."""
+    amounts = MoneyArray.from_money(
+        [Money(1.25, usd()), Money(-2, usd()), Money(10, usd())])
+    assert amounts.currency() is usd()
+    assert len(amounts) == 3
+    assert amounts.minor_units() == [125, -200, 1000]
+    assert amounts[1] == Money(-2, usd())
+    assert list(amounts) == amounts.to_money()
+    assert amounts.sum() == Money(9.25, usd())
+    assert amounts.cumsum().minor_units() == [125, -75, 925]
+    assert amounts.scale(0.5).minor_units() == [62, -100, 500]
+    assert amounts.scale(-1).minor_units() == [-125, 200, -1000]
+    assert amounts.mask([True, False, True]).minor_units() == [125, 1000]
+    assert (amounts + amounts).minor_units() == [250, -400, 2000]
+    assert (amounts - amounts.scale(2)).minor_units() == [-125, 200, -1000]
+    assert (amounts + Money(1, usd())).minor_units() == [225, -100, 1100]
+    assert (amounts - Money(1, usd())).minor_units() == [25, -300, 900]
+    assert MoneyArray.zeros(usd(), 2).sum() == Money(0, usd())
+    assert MoneyArray.from_money([]).sum() == Money(0, usd())
+    view = memoryview(array("q", [1, 2, 3])).toreadonly()
+    assert MoneyArray(usd(), view).sum().minor_units() == 6
+    for attempt in [lambda: MoneyArray.from_money([Money(1, usd()),
+                                                   Money(1, ars())]),
+                    lambda: amounts + MoneyArray.zeros(ars(), 3),
+                    lambda: amounts + Money(1, ars())]:
+        try:
+            attempt()
+            assert False
+        except NotImplementedError:
+            pass
+
+
+def test_money_array() -> None:
+    """Check the MoneyArray operations without NumPy."""
+    numpy = money_array.numpy
+    money_array.numpy = None  # type: ignore
+    try:
+        check_money_array()
+    finally:
+        money_array.numpy = numpy
+
+
+def test_money_array_numpy() -> None:
+    """Check the MoneyArray operations with NumPy, skipped without it."""
+    pytest.importorskip("numpy")
+    assert money_array.numpy is not None
+    check_money_array()
@@ -1,5 +1,6 @@
 """Test the money implementation."""
 from zeppelin_cash.accounting.america import ars, usd
+from zeppelin_cash.accounting.currency import Currency
 from zeppelin_cash.accounting.money import Money
 
 
@@ -50,3 +51,24 @@ def test_scale_money() -> None:
     start = Money(10, usd())
     finish = start.scale(10)
     assert finish.quantity() == 100
+
+
+def test_minor_units() -> None:
+    """Check that money is kept exactly in fractional units."""
+    money = Money(0.1, usd())
+    assert money.minor_units() == 10
+    assert money.quantity() == 0.1
+    total = Money(0, usd())
+    for _ in range(10):
+        total += money
+    assert total == Money(1, usd())
+    assert total.minor_units() == 100
+    cents = Money.from_minor_units(-123456789, usd())
+    assert cents.quantity() == -1234567.89
+    assert str(cents) == "-1,234,567.89 USD"
+    assert str(Money(-0.05, usd())) == "-0.05 USD"
+    assert str(Money(12, Currency("", "XTS", fractions_per_unit=1))) == \
+        "12 XTS"
+    assert str(Money(1.5, Currency("", "XTS", fractions_per_unit=1000))) == \
+        "1.500 XTS"
+    assert Money(10, usd()).scale(0.333).minor_units() == 333
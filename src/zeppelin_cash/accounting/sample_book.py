@@ -0,0 +1,65 @@
+"""The module wallet.accounting.sample_book builds books for tests and benchmarks."""
+from datetime import datetime, timedelta
+from random import Random
+
+from zeppelin_cash.accounting import book as book_module
+from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.book import Book
+from zeppelin_cash.accounting.journal_entry import JournalEntry
+from zeppelin_cash.accounting.journal_transaction import JournalTransaction
+from zeppelin_cash.accounting.money import Money
+
+
+def random_book(start: datetime, num_transactions: int,
+                seed: int = 0, columnar: bool = False,
+                spacing: timedelta = timedelta(seconds=1)) -> Book:
+    """Build a book with random, balanced transactions.
+
+    The transactions move whole dollar amounts between the default accounts
+    and a few extra cash and research and development accounts. They are `spacing`
+    apart, starting `spacing` after the book. Some transactions share a
+    timestamp.
+
+    Args:
+        start: the start time of the book
+        num_transactions: the number of transactions to add
+        seed: the seed of the random number generator
+        columnar: passed on to the Book constructor
+        spacing: the time between transactions
+
+    Returns:
+        The book.
+    """
+    rng = Random(seed)
+    book = Book(start, columnar=columnar)
+    account_ids = [
+        book_module.default_cash_id(),
+        book_module.default_accounts_receivable_id(),
+        book_module.default_inventory_id(),
+        book_module.default_prepaid_expenses_id(),
+        book_module.default_other_assets_id(),
+        book_module.default_fixed_assets_at_cost_id(),
+        book_module.default_accumulated_depreciation_id(),
+        book_module.default_accounts_payable_id(),
+        book_module.default_accrued_expenses_id(),
+        book_module.default_current_portion_of_debt_id(),
+        book_module.default_income_taxes_payable_id(),
+        book_module.default_long_term_debt_id(),
+        book_module.default_capital_stock_id(),
+        book_module.default_retained_earnings_id(),
+    ]
+    account_ids.append(book.add_cash_account("Savings"))
+    account_ids.append(book.add_research_and_development_account("Lab"))
+    account_ids.append(book.add_research_and_development_account("Shop"))
+    time = start
+    for k in range(num_transactions):
+        if rng.random() < 0.9:
+            time += spacing
+        debit_id, credit_id = rng.sample(account_ids, 2)
+        amount = Money(rng.randint(1, 100000), usd())
+        err = book.add_transaction(JournalTransaction(
+            time, "transaction {}".format(k),
+            [JournalEntry(debit_id, True, amount),
+             JournalEntry(credit_id, False, amount)]))
+        assert err.is_ok()
+    return book
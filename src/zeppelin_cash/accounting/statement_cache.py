@@ -0,0 +1,119 @@
+"""The module wallet.accounting.statement_cache contains the StatementCache
+implementation."""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+StatementKey = Tuple[str, datetime, datetime]
+
+
+@dataclass
+class StatementCacheStats:
+    """StatementCacheStats counts how a StatementCache has been used."""
+    hits: int
+    misses: int
+    evictions: int
+    # the number of entries dropped because of new postings
+    invalidations: int
+    size: int
+
+
+class StatementCache:
+    """A StatementCache memoizes statements computed from a journal.
+
+    Entries are keyed by the kind of statement and its period, and are
+    evicted in least recently used order once the cache is full. The cache
+    remembers the journal version its entries were computed at. A posting at
+    time t only invalidates the entries whose period ends at or after t;
+    any other change to the journal clears the cache.
+
+    Cached statements are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_size: int, version: int) -> None:
+        """Create a new, empty StatementCache instance.
+
+        Args:
+            max_size: the maximum number of statements to keep
+            version: the current journal version
+        """
+        assert max_size > 0
+        self.max_size = max_size
+        self._version = version
+        self._entries: 'OrderedDict[StatementKey, Any]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: StatementKey, version: int) -> Optional[Any]:
+        """Look up a statement.
+
+        Args:
+            key: the kind, start and end of the statement
+            version: the current journal version
+
+        Returns:
+            The cached statement, or None if it is not cached.
+        """
+        if version != self._version:
+            self.clear(version)
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: StatementKey, version: int, value: Any) -> None:
+        """Store a statement.
+
+        Args:
+            key: the kind, start and end of the statement
+            version: the journal version the statement was computed at
+            value: the statement
+        """
+        if version != self._version:
+            self.clear(version)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate_from(self, time: datetime, version: int) -> None:
+        """Drop the statements affected by a new posting.
+
+        Args:
+            time: the time of the posting
+            version: the journal version after the posting
+        """
+        if version != self._version + 1:
+            self.clear(version)
+            return
+        stale = [key for key in self._entries if key[2] >= time]
+        for key in stale:
+            del self._entries[key]
+        self._invalidations += len(stale)
+        self._version = version
+
+    def clear(self, version: int) -> None:
+        """Drop every statement.
+
+        Args:
+            version: the current journal version
+        """
+        self._invalidations += len(self._entries)
+        self._entries.clear()
+        self._version = version
+
+    def stats(self) -> StatementCacheStats:
+        """Get the usage counters of the cache.
+
+        Returns:
+            The counters.
+        """
+        return StatementCacheStats(self._hits, self._misses, self._evictions,
+                                   self._invalidations, len(self._entries))
@@ -0,0 +1,47 @@
+"""Test the StatementCache implementation."""
+from datetime import datetime, timedelta
+
+from zeppelin_cash.accounting.statement_cache import StatementCache
+
+
+def test_lru_eviction() -> None:
+    """Check that the least recently used statement is evicted."""
+    start = datetime(2020, 1, 1)
+    keys = [("balance_sheet", start, start + timedelta(days=k))
+            for k in range(3)]
+    cache = StatementCache(2, 0)
+    assert cache.get(keys[0], 0) is None
+    cache.put(keys[0], 0, "first")
+    cache.put(keys[1], 0, "second")
+    assert cache.get(keys[0], 0) == "first"
+    cache.put(keys[2], 0, "third")
+    assert cache.get(keys[1], 0) is None
+    assert cache.get(keys[0], 0) == "first"
+    assert cache.get(keys[2], 0) == "third"
+    stats = cache.stats()
+    assert stats.hits == 3
+    assert stats.misses == 2
+    assert stats.evictions == 1
+    assert stats.size == 2
+
+
+def test_invalidation() -> None:
+    """Check that postings only drop statements that end after them."""
+    start = datetime(2020, 1, 1)
+    early = ("income_statement", start, start + timedelta(days=1))
+    late = ("income_statement", start, start + timedelta(days=3))
+    cache = StatementCache(10, 0)
+    cache.put(early, 0, "early")
+    cache.put(late, 0, "late")
+    cache.invalidate_from(start + timedelta(days=2), 1)
+    assert cache.get(early, 1) == "early"
+    assert cache.get(late, 1) is None
+    cache.invalidate_from(start + timedelta(days=1), 2)
+    assert cache.get(early, 2) is None
+    assert cache.stats().invalidations == 2
+    # A version the cache was not told about clears it.
+    cache.put(early, 2, "early")
+    assert cache.get(early, 3) is None
+    cache.put(early, 3, "early")
+    cache.invalidate_from(start + timedelta(days=5), 5)
+    assert cache.get(early, 5) is None
@@ -0,0 +1,70 @@
+"""Test the StatementEngine implementation."""
+from datetime import datetime, timedelta
+
+from zeppelin_cash.accounting.financial_statement import FinancialStatement
+from zeppelin_cash.accounting.sample_book import random_book
+from zeppelin_cash.accounting.statement_period import period_boundaries, StatementPeriod
+
+
+def test_matches_separate_statements() -> None:
+    """Check that the fused statement matches the line by line statements."""
+    start = datetime(2020, 1, 1)
+    book = random_book(start, 500)
+    windows = [(start, start + timedelta(seconds=1)),
+               (start, start + timedelta(seconds=600)),
+               (start + timedelta(seconds=17), start + timedelta(seconds=230)),
+               (start + timedelta(seconds=300), start + timedelta(seconds=300)),
+               (start + timedelta(seconds=400), start + timedelta(seconds=900))]
+    for window_start, window_end in windows:
+        result = book.financial_statement(window_start, window_end)
+        assert result.is_ok()
+        fused = result.ok()
+        separate = FinancialStatement(
+            book.balance_sheet(window_end).ok(),
+            book.cash_flow_statement(window_start, window_end).ok(),
+            book.income_statement(window_start, window_end).ok())
+        assert str(fused) == str(separate)
+        for name, value in vars(separate.balance_sheet).items():
+            assert getattr(fused.balance_sheet, name) == value
+        for name, value in vars(separate.cash_flow_statement).items():
+            assert getattr(fused.cash_flow_statement, name) == value
+        for name, value in vars(separate.income_statement).items():
+            assert getattr(fused.income_statement, name) == value
+
+
+def test_errors() -> None:
+    """Check that periods before the book was started are rejected."""
+    start = datetime(2020, 1, 1)
+    book = random_book(start, 10)
+    result = book.financial_statement(start - timedelta(seconds=2),
+                                      start - timedelta(seconds=1))
+    assert not result.is_ok()
+    assert result.err().message() == "cannot calculate balance sheet"
+    result = book.financial_statement(start - timedelta(seconds=1),
+                                      start + timedelta(seconds=1))
+    assert not result.is_ok()
+    assert result.err().message() == "cannot calculate cash flow statement"
+
+
+def test_statement_series() -> None:
+    """Check that a statement series matches the statements of each period."""
+    start = datetime(2020, 1, 1)
+    # transactions at midnight land on the month boundaries
+    book = random_book(start, 400, spacing=timedelta(days=1))
+    end = start + timedelta(days=420)
+    for period in StatementPeriod:
+        result = book.financial_statement_series(start, end, period, 4)
+        assert result.is_ok()
+        statements = result.ok()
+        boundaries = period_boundaries(start, end, period, 4)
+        assert len(statements) == len(boundaries) - 1
+        for k, statement in enumerate(statements):
+            single = book.financial_statement(boundaries[k],
+                                              boundaries[k + 1]).ok()
+            assert str(statement) == str(single)
+    result = book.financial_statement_series(
+        start - timedelta(days=1), end, StatementPeriod.Month)
+    assert not result.is_ok()
+    assert result.err().message() == "cannot calculate cash flow statement"
+    assert not book.financial_statement_series(
+        end, start, StatementPeriod.Month).is_ok()
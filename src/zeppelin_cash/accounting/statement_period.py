@@ -0,0 +1,61 @@
+"""The module wallet.accounting.statement_period contains the StatementPeriod
+enumeration and the period boundaries of a statement series."""
+from datetime import datetime
+from enum import auto, Enum
+from typing import List
+
+
+class StatementPeriod(Enum):
+    """StatementPeriod is the length of each statement in a series."""
+    Month = auto()
+    Quarter = auto()
+    FiscalYear = auto()
+
+
+# The number of months in each period.
+_PERIOD_MONTHS = {
+    StatementPeriod.Month: 1,
+    StatementPeriod.Quarter: 3,
+    StatementPeriod.FiscalYear: 12,
+}
+
+
+def period_boundaries(start: datetime, end: datetime,
+                      period: StatementPeriod,
+                      fiscal_year_start_month: int = 1) -> List[datetime]:
+    """Get the boundaries of the periods between two times.
+
+    The periods start at midnight on the first day of a month. Quarters and
+    fiscal years are counted from `fiscal_year_start_month`, so with the
+    default quarters start in January, April, July and October. The first
+    and last periods are cut short at `start` and `end`.
+
+    Args:
+        start: the start of the first period
+        end: the end of the last period, not before `start`
+        period: the length of each period
+        fiscal_year_start_month: the month a fiscal year starts, 1 to 12
+
+    Returns:
+        `start`, every period start strictly between `start` and `end`, and
+        `end`, in ascending order.
+    """
+    assert start <= end
+    assert 1 <= fiscal_year_start_month <= 12
+    step = _PERIOD_MONTHS[period]
+    boundaries = [start]
+    # months are numbered from January of year 0; start with the month after
+    # the one containing start
+    month = start.year * 12 + start.month
+    offset = (month - (fiscal_year_start_month - 1)) % step
+    if offset != 0:
+        month += step - offset
+    while True:
+        boundary = start.replace(year=month // 12, month=month % 12 + 1, day=1,
+                                 hour=0, minute=0, second=0, microsecond=0)
+        if boundary >= end:
+            break
+        boundaries.append(boundary)
+        month += step
+    boundaries.append(end)
+    return boundaries
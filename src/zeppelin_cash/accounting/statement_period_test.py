@@ -0,0 +1,30 @@
+"""Test the statement period boundaries."""
+from datetime import datetime, timezone
+
+from zeppelin_cash.accounting.statement_period import period_boundaries, StatementPeriod
+
+
+def test_period_boundaries() -> None:
+    """Check the boundaries of months, quarters and fiscal years."""
+    assert period_boundaries(datetime(2020, 1, 1), datetime(2020, 3, 1),
+                             StatementPeriod.Month) == [
+        datetime(2020, 1, 1), datetime(2020, 2, 1), datetime(2020, 3, 1)]
+    assert period_boundaries(datetime(2020, 2, 15), datetime(2021, 1, 10),
+                             StatementPeriod.Quarter) == [
+        datetime(2020, 2, 15), datetime(2020, 4, 1), datetime(2020, 7, 1),
+        datetime(2020, 10, 1), datetime(2021, 1, 1), datetime(2021, 1, 10)]
+    assert period_boundaries(datetime(2020, 11, 5), datetime(2022, 8, 1),
+                             StatementPeriod.FiscalYear, 7) == [
+        datetime(2020, 11, 5), datetime(2021, 7, 1), datetime(2022, 7, 1),
+        datetime(2022, 8, 1)]
+    assert period_boundaries(datetime(2020, 5, 5), datetime(2020, 5, 5),
+                             StatementPeriod.Month) == [
+        datetime(2020, 5, 5), datetime(2020, 5, 5)]
+
+
+def test_time_zone() -> None:
+    """Check that the boundaries keep the time zone of the start."""
+    start = datetime(2020, 12, 31, 12, tzinfo=timezone.utc)
+    end = datetime(2021, 1, 2, tzinfo=timezone.utc)
+    assert period_boundaries(start, end, StatementPeriod.Month) == [
+        start, datetime(2021, 1, 1, tzinfo=timezone.utc), end]
@@ -0,0 +1,80 @@
+"""The module wallet.accounting.trial_balance contains the TrialBalanceLine
+and TrialBalance implementations."""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from zeppelin_cash.accounting.money import Money
+
+
+@dataclass
+class TrialBalanceLine:
+    """A TrialBalanceLine holds the totals of one account in one currency."""
+    account_id: str
+    name: str
+    debits: Money
+    credits: Money
+
+    def net(self) -> Money:
+        """Get the net of the totals.
+
+        Returns:
+            The debits less the credits, so a debit balance is positive.
+        """
+        return self.debits - self.credits
+
+
+class TrialBalance:
+    """A TrialBalance lists the debit and credit totals of every account.
+
+    Only the entries posted to the accounts are counted, not their starting
+    balances. The entries of closed periods are still counted, although the
+    accounts no longer hold them. The grand totals are kept per currency,
+    and in a book of balanced transactions the debits equal the credits in
+    each currency.
+    """
+
+    def __init__(self, time: Optional[datetime],
+                 lines: List[TrialBalanceLine]) -> None:
+        """Create a new TrialBalance instance.
+
+        Args:
+            time: the time of the totals, None for all entries so far
+            lines: a line per account and currency
+        """
+        self.time = time
+        self.lines = lines
+        self._debit_totals: Dict[str, Money] = {}
+        self._credit_totals: Dict[str, Money] = {}
+        for line in lines:
+            code = line.debits.currency().code()
+            if code in self._debit_totals:
+                self._debit_totals[code] += line.debits
+                self._credit_totals[code] += line.credits
+            else:
+                self._debit_totals[code] = line.debits
+                self._credit_totals[code] = line.credits
+
+    def total_debits(self) -> Dict[str, Money]:
+        """Get the sum of the debits of every account.
+
+        Returns:
+            The total in each currency, by currency code.
+        """
+        return dict(self._debit_totals)
+
+    def total_credits(self) -> Dict[str, Money]:
+        """Get the sum of the credits of every account.
+
+        Returns:
+            The total in each currency, by currency code.
+        """
+        return dict(self._credit_totals)
+
+    def is_balanced(self) -> bool:
+        """Check that the debits equal the credits.
+
+        Returns:
+            True iff the totals are equal in every currency.
+        """
+        return self._debit_totals == self._credit_totals
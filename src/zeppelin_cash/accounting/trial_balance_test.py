@@ -0,0 +1,41 @@
+"""Test the TrialBalance implementation."""
+from datetime import datetime
+
+from zeppelin_cash.accounting.america import cad, usd
+from zeppelin_cash.accounting.money import Money
+from zeppelin_cash.accounting.trial_balance import TrialBalance, TrialBalanceLine
+
+
+def test_trial_balance() -> None:
+    """Check the grand totals of a trial balance."""
+    lines = [
+        TrialBalanceLine(
+            "cash-id",
+            "Cash",
+            Money(
+                30,
+                usd()),
+            Money(
+                10,
+                usd())),
+        TrialBalanceLine("debt-id", "Debt", Money(0, usd()), Money(20, usd())),
+        TrialBalanceLine(
+            "cad-id",
+            "Loonies",
+            Money(
+                5,
+                cad()),
+            Money(
+                5,
+                cad())),
+    ]
+    trial_balance = TrialBalance(datetime(2020, 1, 1), lines)
+    assert lines[0].net() == Money(20, usd())
+    assert lines[1].net() == Money(-20, usd())
+    assert trial_balance.total_debits() == {
+        "USD": Money(30, usd()), "CAD": Money(5, cad())}
+    assert trial_balance.total_credits() == {
+        "USD": Money(30, usd()), "CAD": Money(5, cad())}
+    assert trial_balance.is_balanced()
+    lines[1].credits = Money(25, usd())
+    assert not TrialBalance(None, lines).is_balanced()
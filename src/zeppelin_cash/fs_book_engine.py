@@ -1,43 +1,202 @@
-"""The medici.fs_book_engine allows a book to sync to the file system."""
-from typing import Optional
+"""The medici.fs_book_engine allows a book to sync to the file system.
+
+By default every write pickles the whole book, so its cost grows with the
+book rather than with the change. In write-ahead log mode each transaction
+is instead appended to a log file next to the book, `<fname>.wal`, as a
+record of:
+
+    - the length of the record body, a little-endian 32 bit integer;
+    - the CRC-32 of the body, a little-endian 32 bit integer;
+    - the body: the generation of the snapshot the record follows, a
+      little-endian 64 bit integer, and the pickled JournalTransaction.
+
+A full snapshot of the book is written every `snapshot_every` records, and
+the log is then emptied. Loading the book reads the snapshot and replays the
+records of its generation. Replay stops at the first short or corrupt
+record, as left by a crash in the middle of an append, and the log is cut
+there. Records of an older generation, left by a crash between writing a
+snapshot and emptying the log, are already in the snapshot and are skipped.
+"""
+from os import fsync, replace
+from os.path import exists
+from struct import calcsize, pack, unpack_from
+from typing import List, Optional, Tuple
+from zlib import crc32
 import pickle
 
 from zeppelin_cash.book_engine import BookEngine
 from zeppelin_cash.accounting.book import Book
+from zeppelin_cash.accounting.journal_transaction import JournalTransaction
 from zeppelin_cash.errors import Error, ok, Result
 from zeppelin_cash.user import UserId
 
+_HEADER = "<II"
+_GENERATION = "<Q"
+
 
 class FsBookEngine(BookEngine):
     """The FsBookEngine allow a book to be synced to a file system."""
 
-    def __init__(self, fname: str) -> None:
+    def __init__(self, fname: str, wal: bool = False,
+                 snapshot_every: int = 1000, sync: bool = False) -> None:
         """Create a new FsBookEngine instance.
 
         Args:
             fname: the name of the file with which to sync
+            wal: if True, log each transaction added with `add_transaction`
+                and only write a snapshot of the book now and then
+            snapshot_every: the number of logged transactions after which a
+                snapshot is written, in write-ahead log mode
+            sync: if True, flush each log record to the disk before
+                returning, in write-ahead log mode
         """
         self.fname = fname
+        self.log_fname = fname + ".wal"
+        self.wal = wal
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+        # the generation of the last snapshot, and the number of records
+        # logged since, once the book is loaded or written
+        self._generation: Optional[int] = None
+        self._num_logged = 0
 
     def load_book(self) -> Result[Book]:
         """Load a book from the file system.
 
+        In write-ahead log mode, the transactions logged since the last
+        snapshot are added to the book again.
+
         Returns:
             A Book instance or an error.
         """
         with open(self.fname, "rb") as my_file:
             book = pickle.load(my_file)
+            if not self.wal:
+                return Result(ok=book)
+            try:
+                generation = pickle.load(my_file)
+            except EOFError:
+                # written without a write-ahead log
+                generation = 0
+        transactions, valid_size = _read_log(self.log_fname, generation)
+        for transaction in transactions:
+            err = book.add_transaction(transaction)
+            if not err.is_ok():
+                return Result(err=err)
+        if exists(self.log_fname):
+            with open(self.log_fname, "r+b") as log_file:
+                log_file.truncate(valid_size)
+        self._generation = generation
+        self._num_logged = len(transactions)
         return Result(ok=book)
 
     def write_book(self, book: Book) -> Error:
         """Write a book to the file system.
 
+        In write-ahead log mode this writes a snapshot: the book is written
+        to a temporary file that then replaces the last snapshot, and the
+        log is emptied. Changes other than transactions, e.g. new accounts,
+        are only saved by a snapshot.
+
         Returns:
             An error if the write fails.
         """
-        with open(self.fname, "wb") as my_file:
+        if not self.wal:
+            with open(self.fname, "wb") as my_file:
+                pickle.dump(book, my_file)
+            return ok()
+        generation = (self._generation or 0) + 1
+        tmp_fname = self.fname + ".tmp"
+        with open(tmp_fname, "wb") as my_file:
             pickle.dump(book, my_file)
+            pickle.dump(generation, my_file)
+            if self.sync:
+                my_file.flush()
+                fsync(my_file.fileno())
+        replace(tmp_fname, self.fname)
+        with open(self.log_fname, "wb"):
+            pass
+        self._generation = generation
+        self._num_logged = 0
+        return ok()
+
+    def add_transaction(self, book: Book,
+                        transaction: JournalTransaction) -> Error:
+        """Add a transaction to a book and save it.
+
+        In write-ahead log mode the transaction is appended to the log,
+        unless it is time for a snapshot. Otherwise the whole book is
+        written.
+
+        Args:
+            book: the book, as last loaded or written by this engine
+            transaction: the transaction
+
+        Returns:
+            An error if the book rejects the transaction, or if the book was
+            not loaded or written first in write-ahead log mode.
+        """
+        if self.wal and self._generation is None:
+            return Error("load or write the book before logging to it")
+        err = book.add_transaction(transaction)
+        if not err.is_ok():
+            return err
+        if not self.wal or self._num_logged + 1 >= self.snapshot_every:
+            return self.write_book(book)
+        assert self._generation is not None
+        with open(self.log_fname, "ab") as log_file:
+            log_file.write(_record(self._generation, transaction))
+            if self.sync:
+                log_file.flush()
+                fsync(log_file.fileno())
+        self._num_logged += 1
         return ok()
 
     def book(self, _user_id: UserId) -> Result[Book]:
         return self.load_book()
+
+
+def _record(generation: int, transaction: JournalTransaction) -> bytes:
+    """Encode a transaction as a log record.
+
+    Args:
+        generation: the generation of the last snapshot
+        transaction: the transaction
+
+    Returns:
+        The record, header included.
+    """
+    body = pack(_GENERATION, generation) + pickle.dumps(transaction)
+    return pack(_HEADER, len(body), crc32(body)) + body
+
+
+def _read_log(log_fname: str,
+              generation: int) -> Tuple[List[JournalTransaction], int]:
+    """Read the transactions logged since a snapshot.
+
+    Args:
+        log_fname: the name of the log file, which may not exist
+        generation: the generation of the snapshot
+
+    Returns:
+        The transactions, in the order they were logged, and the size of
+        the log up to the first short or corrupt record.
+    """
+    if not exists(log_fname):
+        return [], 0
+    with open(log_fname, "rb") as log_file:
+        data = log_file.read()
+    header_size = calcsize(_HEADER)
+    transactions = []
+    offset = 0
+    while offset + header_size <= len(data):
+        length, checksum = unpack_from(_HEADER, data, offset)
+        start = offset + header_size
+        body = data[start:start + length]
+        if len(body) < length or crc32(body) != checksum:
+            break
+        offset = start + length
+        if unpack_from(_GENERATION, body)[0] == generation:
+            transactions.append(
+                pickle.loads(body[calcsize(_GENERATION):]))
+    return transactions, offset
@@ -1,13 +1,16 @@
 """The module medici.test_fs_book_engine test the FsBookEngine
 implementation."""
 from datetime import datetime, timedelta
+from pathlib import Path
+from shutil import copyfile
 
 from zeppelin_cash.accounting.book import Book, default_cash_id, default_capital_stock_id
-from zeppelin_cash.fs_book_engine import FsBookEngine
+from zeppelin_cash.fs_book_engine import _record, FsBookEngine
 from zeppelin_cash.accounting.journal_transaction import JournalTransaction
 from zeppelin_cash.accounting.journal_entry import JournalEntry
 from zeppelin_cash.accounting.money import Money
 from zeppelin_cash.accounting.america import usd
+from zeppelin_cash.accounting.sample_book import random_book
 
 
 def test_fs_book_engine() -> None:
@@ -36,3 +39,88 @@ def test_fs_book_engine() -> None:
     balance_sheet = bs_result.ok()
     assert balance_sheet.cash.quantity() == 1000000
     assert balance_sheet.shareholders_equity().quantity() == 1000000
+
+
+def test_write_ahead_log(tmp_path: Path) -> None:
+    """Check that a book is recovered from a snapshot and its log."""
+    start = datetime(2020, 1, 1)
+    source = random_book(start, 30)
+    fname = str(tmp_path / "book.p")
+    engine = FsBookEngine(fname, wal=True, snapshot_every=10)
+    book = random_book(start, 0)
+    transaction = source.journal.transactions[0]
+    assert not engine.add_transaction(book, transaction).is_ok()
+    assert engine.write_book(book).is_ok()
+    for transaction in source.journal.transactions[:25]:
+        assert engine.add_transaction(book, transaction).is_ok()
+    # snapshots were written after the 10th and 20th transactions
+    assert len(FsBookEngine(fname).load_book().ok().journal.transactions) == 20
+    # a crash in the middle of an append leaves a partial record
+    with open(engine.log_fname, "ab") as log_file:
+        log_file.write(b"\x40\x00\x00\x00\x00")
+    recovered = FsBookEngine(fname, wal=True, snapshot_every=100)
+    book = recovered.load_book().ok()
+    assert len(book.journal.transactions) == 25
+    for transaction in source.journal.transactions[25:]:
+        assert recovered.add_transaction(book, transaction).is_ok()
+    book = FsBookEngine(fname, wal=True).load_book().ok()
+    assert len(book.journal.transactions) == 30
+    end = start + timedelta(seconds=40)
+    assert str(book.financial_statement(start, end).ok()) == \
+        str(source.financial_statement(start, end).ok())
+
+
+def test_corrupt_log_record(tmp_path: Path) -> None:
+    """Check that an unbalanced transaction in the log is not replayed."""
+    start = datetime(2020, 1, 1)
+    fname = str(tmp_path / "book.p")
+    engine = FsBookEngine(fname, wal=True)
+    book = Book(start)
+    assert engine.write_book(book).is_ok()
+    entries = [JournalEntry(default_capital_stock_id(), False, Money(10, usd())),
+               JournalEntry(default_cash_id(), True, Money(10, usd()))]
+    transaction = JournalTransaction(start + timedelta(seconds=1),
+                                     "Investing some cash", entries)
+    assert engine.add_transaction(book, transaction).is_ok()
+    # the record of a journaled transaction, edited to be unbalanced
+    entries.pop()
+    with open(engine.log_fname, "ab") as log_file:
+        log_file.write(_record(1, transaction))
+    assert not FsBookEngine(fname, wal=True).load_book().is_ok()
+
+
+def test_baseline_book(tmp_path: Path) -> None:
+    """Check that a book written by the first release can still be loaded.
+
+    testdata/baseline_book.p was pickled by the first release: a book
+    started on 2020-01-01, with a "Bank" cash account and a "Lab" research
+    and development account, and three transactions.
+    """
+    start = datetime(2020, 1, 1)
+    fname = str(tmp_path / "book.p")
+    copyfile(Path(__file__).parent / "testdata" / "baseline_book.p", fname)
+    engine = FsBookEngine(fname, wal=True)
+    book = engine.load_book().ok()
+    assert book.is_valid(audit=True)
+    assert len(book.journal.transactions) == 3
+    assert not book.journal.un_pushed_transactions()
+    end = start + timedelta(seconds=5)
+    sheet = book.balance_sheet(end).ok()
+    assert sheet.cash == Money(1200.5, usd())
+    assert sheet.capital_stock == Money(1250.5, usd())
+    assert book.income_statement(start, end).ok() \
+        .research_and_development == Money(50, usd())
+    # new accounts do not reuse the ids of the loaded ones
+    account_ids = [metadata.account_id
+                   for metadata in book.list_accounts(end)]
+    assert len(account_ids) == 16
+    bank_id = book.add_cash_account("Another bank")
+    assert bank_id not in account_ids
+    assert engine.add_transaction(book, JournalTransaction(
+        start + timedelta(seconds=6), "Investing some cash",
+        [JournalEntry(default_capital_stock_id(), False, Money(10, usd())),
+         JournalEntry(bank_id, True, Money(10, usd()))])).is_ok()
+    assert engine.write_book(book).is_ok()
+    book = FsBookEngine(fname, wal=True).load_book().ok()
+    later = start + timedelta(seconds=7)
+    assert book.balance_sheet(later).ok().cash == Money(1210.5, usd())
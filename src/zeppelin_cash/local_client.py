@@ -3,6 +3,7 @@ from enum import auto, Enum
 from typing import List, Optional, Tuple
 
 from zeppelin_cash.accounting.account import Account, AccountId
+from zeppelin_cash.accounting.account_category import AccountCategory
 from zeppelin_cash.accounting.account_metadata import AccountMetadata
 from zeppelin_cash.accounting.book import Book
 from zeppelin_cash.accounting.financial_statement import FinancialStatement
@@ -52,8 +53,12 @@ class LocalClient(Client):
     def add_account(self, account_name: str,
                     is_asset: bool) -> Result[AccountId]:
         if self.__in_memory_book is not None:
+            # there is no category to pass, so file the account under the
+            # generic asset or liability line
+            category = AccountCategory.OtherAssets if is_asset \
+                else AccountCategory.AccountsPayable
             account_id = self.__in_memory_book.add_account(
-                account_name, is_asset)
+                account_name, category)
             return Result(ok=account_id)
         assert self.__user_id is not None
         assert self.__local_multi_client is not None